@@ -0,0 +1,256 @@
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import celestial_sandbox.constants
+import celestial_sandbox.ephemeris.chebyshev
+import celestial_sandbox.orbit
+import celestial_sandbox.orbital_elements.kepler
+import celestial_sandbox.simulation.barnes_hut
+import celestial_sandbox.simulation.diagnostics
+import celestial_sandbox.simulation.gravity
+import celestial_sandbox.simulation.nbody
+import celestial_sandbox.types.celestial_body
+import celestial_sandbox.types.celestial_body.planet
+import celestial_sandbox.types.celestial_body.star
+import celestial_sandbox.types.orbit
+
+
+def benchmark_cached_rotation(number=20000):
+    """
+    Compares evaluating a position through `position_vector_from_orbital_elements`,
+    which re-derives the rotation trig every call, against the cached rotation on `Orbit`.
+    """
+    orbit = celestial_sandbox.types.orbit.Orbit(149_597_870, 0.0167, 0.00005, -0.196, 1.796, name="Earth")
+    true_anomaly = orbit.true_anomaly(123.0)
+
+    uncached = timeit.timeit(
+        lambda: celestial_sandbox.orbit.position_vector_from_orbital_elements(
+            orbit.semi_major_axis,
+            orbit.eccentricity,
+            orbit.inclination,
+            orbit.longitude_of_ascending_node,
+            orbit.argument_of_periapsis,
+            true_anomaly
+        ),
+        number=number
+    )
+
+    cached = timeit.timeit(lambda: orbit.position_from_true_anomaly(true_anomaly), number=number)
+
+    print(f"Position evaluation (uncached trig): {uncached / number * 1e6:.2f} us")
+    print(f"Position evaluation (cached rotation): {cached / number * 1e6:.2f} us")
+    print(f"Speedup: {uncached / cached:.1f}x")
+
+
+
+def benchmark_kepler_solvers(count=1_000_000):
+    """
+    Compares the Kepler solvers on high eccentricity (comet like) orbits.
+    """
+    rng = np.random.default_rng(0)
+    eccentricity = rng.uniform(0.9, 0.999, count)
+    mean_anomaly = rng.uniform(-np.pi, np.pi, count)
+
+    for method in celestial_sandbox.orbital_elements.kepler.EKeplerSolver:
+        start = time.perf_counter()
+        E, iterations = celestial_sandbox.orbital_elements.kepler.solve(
+            eccentricity, mean_anomaly, method=method, return_iterations=True
+        )
+        elapsed = time.perf_counter() - start
+        residual = np.abs(E - eccentricity * np.sin(E) - mean_anomaly).max()
+        print(
+            f"Kepler solver {method.name}: {elapsed:.3f} s, "
+            f"mean iterations {iterations.mean():.2f}, max iterations {iterations.max()}, max residual {residual:.1e}"
+        )
+
+
+def benchmark_chebyshev_ephemeris(count=1_000_000):
+    """
+    Compares position lookups from a compiled Chebyshev ephemeris against solving Kepler's equation.
+    """
+    orbit = celestial_sandbox.types.orbit.Orbit(149_597_870, 0.5, 0.3, 1.1, 2.2, orbital_period=365)
+    times = np.sort(np.random.default_rng(0).uniform(0, 3650, count))
+
+    start = time.perf_counter()
+    ephemeris = celestial_sandbox.ephemeris.chebyshev.compile_orbit(orbit, 0, 3650, 16, tol=0.1)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    orbit.positions(times)
+    kepler_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ephemeris.positions(times)
+    chebyshev_time = time.perf_counter() - start
+
+    print(
+        f"Chebyshev ephemeris: compiled in {compile_time:.3f} s (degree {ephemeris.degree}, error {ephemeris.error:.1e} km), "
+        f"{count} lookups {chebyshev_time:.3f} s vs Kepler {kepler_time:.3f} s"
+    )
+
+
+def _cluster(count, seed=0):
+    """
+    Returns:
+        tuple: The positions (in kilometers) and masses (in KG) of a gaussian cluster of bodies
+    """
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, 3)) * 1e9, rng.uniform(1e29, 1e31, count)
+
+
+def benchmark_barnes_hut_scaling(
+        counts=(1000, 4000, 16000, 64000, 100_000, 250_000, 1_000_000), direct_limit=16000, theta=0.5
+):
+    """
+    Compares the time of one Barnes-Hut force evaluation against direct summation as the number of bodies grows,
+    up to the million body populations the engine is meant for. The largest sizes take minutes.
+    """
+    gravitational_constant = celestial_sandbox.constants.GRAVITATIONAL_CONSTANT_KM
+    for count in counts:
+        positions, masses = _cluster(count)
+
+        start = time.perf_counter()
+        celestial_sandbox.simulation.barnes_hut.barnes_hut_accelerations(
+            positions, masses, gravitational_constant, theta=theta
+        )
+        tree_time = time.perf_counter() - start
+
+        direct = "skipped"
+        if count <= direct_limit:
+            start = time.perf_counter()
+            celestial_sandbox.simulation.gravity.direct_accelerations(positions, masses, gravitational_constant)
+            direct = f"{time.perf_counter() - start:.3f} s"
+
+        print(f"Gravity with {count} bodies: Barnes-Hut (theta {theta}) {tree_time:.3f} s vs direct {direct}")
+
+
+def benchmark_barnes_hut_accuracy(count=8000, thetas=(0.2, 0.4, 0.6, 0.8, 1.0)):
+    """
+    Reports the relative acceleration error of Barnes-Hut against direct summation for several opening angles.
+    """
+    gravitational_constant = celestial_sandbox.constants.GRAVITATIONAL_CONSTANT_KM
+    positions, masses = _cluster(count)
+    exact = celestial_sandbox.simulation.gravity.direct_accelerations(positions, masses, gravitational_constant)
+    magnitude = np.linalg.norm(exact, axis=1)
+
+    for theta in thetas:
+        start = time.perf_counter()
+        approximate = celestial_sandbox.simulation.barnes_hut.barnes_hut_accelerations(
+            positions, masses, gravitational_constant, theta=theta
+        )
+        elapsed = time.perf_counter() - start
+        error = np.linalg.norm(approximate - exact, axis=1) / magnitude
+        print(
+            f"Barnes-Hut theta {theta}: {elapsed:.3f} s, relative error "
+            f"median {np.median(error):.1e}, 99th percentile {np.percentile(error, 99):.1e}, max {error.max():.1e}"
+        )
+
+
+def benchmark_integrators(years=200, energy_budget=1e-5):
+    """
+    Runs each integrator on the Sun, Jupiter and Saturn, reporting conservation errors against cost,
+    and picks the cheapest one meeting an energy error budget.
+    """
+    def make_system():
+        masses = np.array([1.989e30, 1.898e27, 5.683e26])
+        positions = np.array([[0.0, 0.0, 0.0], [7.785e8, 0.0, 0.0], [0.0, 1.4335e9, 1e7]])
+        velocities = np.array([[0.0, 0.0, 0.0], [0.0, 13.07, 0.0], [-9.68, 0.0, 0.1]])
+        velocities -= np.average(velocities, axis=0, weights=masses)
+        return celestial_sandbox.simulation.nbody.NBodySystem(positions, velocities, masses)
+
+    day = celestial_sandbox.constants.DAY_TO_SECONDS
+    cheapest, reports = celestial_sandbox.simulation.diagnostics.cheapest_integrator(
+        make_system,
+        years * 360 * day,
+        {
+            "leapfrog (10 day)": ("leapfrog", 10 * day),
+            "verlet (10 day)": ("verlet", 10 * day),
+            "rk4 (10 day)": ("rk4", 10 * day),
+            "dopri (adaptive)": ("dopri", 360 * day),
+            "wisdom-holman (100 day)": ("wisdom-holman", 100 * day),
+        },
+        energy_budget
+    )
+    for report in reports.values():
+        print(f"Integrator {report}")
+    print(f"Cheapest integrator within an energy error of {energy_budget}: {cheapest}")
+
+
+# The instance attributes of each body type before they used slots, in the order their `__init__` set them
+_BODY_ATTRIBUTES = ("radius", "rotation_period", "surface_gravity", "_mass")
+_DICT_LAYOUTS = {
+    "CelestialBody": _BODY_ATTRIBUTES,
+    "Planet": _BODY_ATTRIBUTES + ("atmospheric_pressure", "scale_height"),
+    "Star": _BODY_ATTRIBUTES + ("_temperature", "_color", "_type_code", "luminosity", "MASS_CATEGORY", "_stage"),
+}
+
+# The slots now storing attributes which have become properties
+_SLOT_NAMES = {"radius": "_radius", "surface_gravity": "_surface_gravity"}
+
+
+def _dict_backed(make, name):
+    """
+    Args:
+        make (callable): Creates one body
+        name (str): The name of the body type, a key of `_DICT_LAYOUTS`
+    Returns:
+        callable: Creates one object laid out as the body type was before it used slots, with its attributes in an
+            instance dict. Each is filled from the stored values of a freshly made body, so it holds the same
+            per-instance values (i.e a star's mass, computed from its solar masses)
+    """
+    names = _DICT_LAYOUTS[name]
+    # one class per body type, so instances share dict keys as the unslotted classes did
+    cls = type(f"Dict{name}", (object,), {})
+
+    def make_dict_backed():
+        body = make()
+        instance = cls()
+        for x in names:
+            setattr(instance, x, getattr(body, _SLOT_NAMES.get(x, x)))
+        return instance
+    return make_dict_backed
+
+
+def _bytes_per_instance(make, count):
+    """
+    Args:
+        make (callable): Creates one instance
+        count (int): The number of instances to create
+    Returns:
+        float: The average memory allocated per instance (in bytes)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [make() for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # not counting the list holding them
+    return (allocated - len(instances) * 8) / count
+
+
+def benchmark_body_memory(count=100_000):
+    """
+    Compares the memory of the slotted body classes against their layout before slots (see `_DICT_LAYOUTS`).
+    """
+    makers = {
+        "CelestialBody": celestial_sandbox.types.celestial_body.CelestialBody,
+        "Planet": lambda: celestial_sandbox.types.celestial_body.planet.Planet(6371, 101_325),
+        "Star": celestial_sandbox.types.celestial_body.star.Star,
+    }
+    for name, make in makers.items():
+        before = _bytes_per_instance(_dict_backed(make, name), count)
+        after = _bytes_per_instance(make, count)
+        print(f"{name}: {before:.0f} bytes per instance before slots, {after:.0f} after")
+
+
+if __name__ == "__main__":
+    benchmark_cached_rotation()
+    benchmark_kepler_solvers()
+    benchmark_chebyshev_ephemeris()
+    benchmark_barnes_hut_scaling()
+    benchmark_barnes_hut_accuracy()
+    benchmark_integrators()
+    benchmark_body_memory()
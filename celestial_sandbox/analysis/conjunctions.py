@@ -0,0 +1,219 @@
+"""
+Conjunction screening
+
+Finds every pair of orbits in an `OrbitCatalog` which come within a threshold distance over a time window,
+without comparing every pair at every step:
+    1. Shell filter - a body only ever lies between its periapsis and apoapsis distance, so bodies whose shell
+       (widened by the threshold) overlaps no other body's shell can never be involved, and are dropped.
+    2. Spatial index - at each time step the remaining bodies go into a KD-tree, which finds every pair within
+       the threshold plus the distance a pair can close in one step. Pairs whose shells don't overlap are dropped,
+       as are pairs whose straight line relative motion (plus a bound on its error) stays clear of the threshold.
+    3. Refinement - each pair's closest sampled step is refined to the time of closest approach
+       with a golden-section search, run for every candidate at once.
+"""
+import math
+
+import numpy as np
+import scipy.spatial
+
+import celestial_sandbox.orbital_elements.semi_major_axis
+
+
+# The structured type of each conjunction found by `screen`
+CONJUNCTION_DTYPE = np.dtype([
+    ("first", np.intp),
+    ("second", np.intp),
+    ("time", np.float64),
+    ("distance", np.float64),
+])
+
+# The ratio of the golden section
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def shells(catalog):
+    """
+    Args:
+        catalog (OrbitCatalog): The orbits
+    Returns:
+        tuple: The periapsis and apoapsis distance of every orbit (in kilometers)
+    """
+    a = catalog.semi_major_axis.astype(np.float64)
+    e = catalog.eccentricity.astype(np.float64)
+    return (
+        celestial_sandbox.orbital_elements.semi_major_axis.periapsis_from_semi_major_axis(a, e),
+        celestial_sandbox.orbital_elements.semi_major_axis.apoapsis_from_semi_major_axis(a, e),
+    )
+
+
+def overlapping_shells(periapsis, apoapsis, threshold):
+    """
+    Finds the bodies whose shell overlaps the shell of at least one other body.
+    Sorting the shells by their inner edge means each only needs checking against its neighbours in the order.
+
+    Args:
+        periapsis (np.array): The periapsis distance of every body (in kilometers)
+        apoapsis (np.array): The apoapsis distance of every body (in kilometers)
+        threshold (float): The distance the shells are widened by (in kilometers)
+    Returns:
+        np.array: A boolean mask of the bodies with an overlapping shell
+    """
+    order = np.argsort(periapsis)
+    inner = periapsis[order] - threshold
+    outer = apoapsis[order]
+
+    # overlaps an earlier shell if it starts inside the furthest reaching earlier one,
+    # or a later shell if the next one to start does so inside it
+    furthest_earlier = np.maximum.accumulate(np.r_[-np.inf, outer[:-1]])
+    overlaps = (inner <= furthest_earlier) | (outer >= np.r_[inner[1:], np.inf])
+
+    mask = np.empty(len(order), dtype=bool)
+    mask[order] = overlaps
+    return mask
+
+
+def _distances(first, second, t):
+    """
+    Args:
+        first (OrbitCatalog): The first orbit of each pair
+        second (OrbitCatalog): The second orbit of each pair
+        t (np.array): The time to measure each pair at (in days)
+    Returns:
+        np.array: The distance between the bodies of each pair (in kilometers)
+    """
+    return np.linalg.norm(first.propagate(t) - second.propagate(t), axis=-1)
+
+
+def refine(catalog, first, second, lower, upper, tol=1e-6):
+    """
+    Refines the time of closest approach of pairs of bodies within a window each, with a golden-section search
+    run for every pair at once. The distance is assumed to have a single minimum in each window.
+
+    Args:
+        catalog (OrbitCatalog): The orbits
+        first (np.array): The index of the first body of each pair
+        second (np.array): The index of the second body of each pair
+        lower (np.array): The start of each pair's window (in days)
+        upper (np.array): The end of each pair's window (in days)
+        tol (float): The width to narrow each window down to (in days)
+    Returns:
+        tuple: The time (in days) and distance (in kilometers) of the closest approach of each pair
+    """
+    first, second = catalog[first], catalog[second]
+    lower = np.array(lower, dtype=np.float64)
+    upper = np.array(upper, dtype=np.float64)
+    if not len(lower):
+        return lower, lower.copy()
+
+    # two interior points per window, one of which is reused every iteration
+    left = upper - _GOLDEN * (upper - lower)
+    right = lower + _GOLDEN * (upper - lower)
+    left_distance = _distances(first, second, left)
+    right_distance = _distances(first, second, right)
+
+    iterations = int(math.ceil(math.log(tol / max(float((upper - lower).max()), tol)) / math.log(_GOLDEN)))
+    for _ in range(iterations):
+        # the minimum is left of the right point, or right of the left point
+        go_left = left_distance < right_distance
+        upper = np.where(go_left, right, upper)
+        lower = np.where(go_left, lower, left)
+
+        # the surviving interior point is reused, and one new point is measured
+        new_time = np.where(go_left, upper - _GOLDEN * (upper - lower), lower + _GOLDEN * (upper - lower))
+        new_distance = _distances(first, second, new_time)
+        left, right, left_distance, right_distance = (
+            np.where(go_left, new_time, right),
+            np.where(go_left, left, new_time),
+            np.where(go_left, new_distance, right_distance),
+            np.where(go_left, left_distance, new_distance),
+        )
+
+    closest = left_distance < right_distance
+    return np.where(closest, left, right), np.where(closest, left_distance, right_distance)
+
+
+def screen(catalog, start, end, step, threshold):
+    """
+    Finds every pair of bodies which come within a threshold distance of each other over a time window.
+
+    Args:
+        catalog (OrbitCatalog): The orbits to screen
+        start (float): The start of the window (in days)
+        end (float): The end of the window (in days)
+        step (float): The time between samples (in days). This should be small compared to the shortest orbital period,
+            and the search radius grows with it, so for dense populations a step where the fastest body moves
+            a few times the threshold is usually quickest
+        threshold (float): The distance counted as a conjunction (in kilometers)
+    Returns:
+        np.array: The conjunctions as a `CONJUNCTION_DTYPE` structured array sorted by time,
+            one per local minimum of the distance between each pair
+    """
+    periapsis, apoapsis = shells(catalog)
+    candidates = np.flatnonzero(overlapping_shells(periapsis, apoapsis, threshold))
+    subset = catalog[candidates]
+    periapsis, apoapsis = periapsis[candidates], apoapsis[candidates]
+
+    # bounds on the speed, acceleration and jerk of every body, all reached at periapsis (in days)
+    a = subset.semi_major_axis.astype(np.float64)
+    e = subset.eccentricity.astype(np.float64)
+    mu = (2 * np.pi / subset.orbital_period) ** 2 * a ** 3
+    speed = np.sqrt(mu / a * (1 + e) / (1 - e))
+    acceleration = mu / periapsis ** 2
+    jerk = 3 * acceleration * speed / periapsis
+
+    # Each sample covers the half step either side of it. No pair can close faster than twice the fastest speed,
+    # so the distance can't drop below the threshold in that time unless the sampled distance is within this radius
+    radius = threshold + speed.max(initial=0.0) * step
+    # Within the half step the relative motion is close to a straight line, with the velocity from central
+    # differences. This bounds how far the true motion can stray from it (from the curvature and velocity error)
+    margin = 2 * (acceleration.max(initial=0.0) * (step / 2) ** 2 / 2 + jerk.max(initial=0.0) * step ** 3 / 12)
+
+    times = start + step * np.arange(int(math.floor((end - start) / step + 1e-9)) + 1)
+    records = [(np.empty(0, dtype=np.intp),) * 3 + (np.empty(0),)]
+    previous, positions = subset.propagate(start - step), subset.propagate(start)
+    for index, t in enumerate(times):
+        following = subset.propagate(t + step)
+        pairs = scipy.spatial.cKDTree(positions).query_pairs(radius, output_type="ndarray")
+
+        # shells must overlap, after the threshold widening
+        i, j = pairs[:, 0], pairs[:, 1]
+        keep = (periapsis[i] - threshold <= apoapsis[j]) & (periapsis[j] - threshold <= apoapsis[i])
+        i, j = i[keep], j[keep]
+
+        # closest point of the straight line relative motion within the half step
+        relative = positions[j] - positions[i]
+        velocity = ((following[j] - following[i]) - (previous[j] - previous[i])) / (2 * step)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            offset = -np.einsum("ij,ij->i", relative, velocity) / np.einsum("ij,ij->i", velocity, velocity)
+        offset = np.clip(np.nan_to_num(offset), -step / 2, step / 2)
+        distance = np.linalg.norm(relative + velocity * offset[:, None], axis=-1)
+
+        keep = distance <= threshold + margin
+        records.append((i[keep], j[keep], np.full(int(keep.sum()), index, dtype=np.intp), distance[keep]))
+        previous, positions = positions, following
+
+    i, j, index, distance = (np.concatenate(x) for x in zip(*records))
+
+    # keep the samples which are local minima of their pair's distance (a missing neighbour counts as further away),
+    # leaving one candidate per approach
+    order = np.lexsort((index, j, i))
+    i, j, index, distance = i[order], j[order], index[order], distance[order]
+    same_as_previous = np.r_[False, (i[1:] == i[:-1]) & (j[1:] == j[:-1]) & (index[1:] == index[:-1] + 1)]
+    same_as_next = np.r_[same_as_previous[1:], False]
+    minimum = (
+        ~(same_as_previous & (np.r_[np.inf, distance[:-1]] < distance)) &
+        ~(same_as_next & (np.r_[distance[1:], np.inf] <= distance))
+    )
+    i, j, index = i[minimum], j[minimum], index[minimum]
+
+    time, distance = refine(
+        subset, i, j, np.maximum(times[index] - step, start), np.minimum(times[index] + step, end), tol=1e-7 * step
+    )
+
+    close = distance <= threshold
+    conjunctions = np.empty(int(close.sum()), dtype=CONJUNCTION_DTYPE)
+    conjunctions["first"] = candidates[i[close]]
+    conjunctions["second"] = candidates[j[close]]
+    conjunctions["time"] = time[close]
+    conjunctions["distance"] = distance[close]
+    return conjunctions[np.argsort(conjunctions["time"], kind="stable")]
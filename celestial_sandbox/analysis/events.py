@@ -0,0 +1,100 @@
+"""
+Orbital event finder
+
+Finds when orbits pass their periapsis, apoapsis and ascending and descending nodes, in closed form.
+Each event happens at a fixed true anomaly, so converting that to a mean anomaly gives the time of the event
+within one period, and the rest follow by adding whole periods - no sampling is involved.
+
+Times follow `Orbit`, measured in days since a periapsis passage (so the mean anomaly is `2 * pi * t / period`).
+"""
+import enum
+import math
+
+import numpy as np
+
+import celestial_sandbox.orbital_elements.true_anomaly
+import celestial_sandbox.types.orbit_catalog
+
+
+class EOrbitEvent(enum.IntEnum):
+    PERIAPSIS = 0
+    APOAPSIS = 1
+    # where the orbit passes up (south to north) through the reference plane
+    ASCENDING_NODE = 2
+    # where the orbit passes down (north to south) through the reference plane
+    DESCENDING_NODE = 3
+
+
+# The structured type of each event found by `find_events`
+EVENT_DTYPE = np.dtype([
+    ("orbit", np.intp),
+    ("event", np.uint8),
+    ("time", np.float64),
+])
+
+# Orbits with an inclination (or its difference from pi) below this are treated as equatorial, and have no nodes
+EQUATORIAL_TOLERANCE = 1e-9
+
+
+def event_true_anomalies(catalog):
+    """
+    Args:
+        catalog (OrbitCatalog): The orbits
+    Returns:
+        np.array: The (N, 4) true anomaly of each event, in the order of `EOrbitEvent` (in radians)
+    """
+    # the nodes are where the argument of latitude (argument of periapsis + true anomaly) is 0 or pi
+    argument_of_periapsis = catalog.argument_of_periapsis.astype(np.float64)
+    zeros = np.zeros(len(catalog))
+    return np.stack((zeros, zeros + math.pi, -argument_of_periapsis, math.pi - argument_of_periapsis), axis=-1)
+
+
+def find_events(orbits, start, end, events=tuple(EOrbitEvent)):
+    """
+    Finds every event of a collection of orbits within a time window.
+
+    Args:
+        orbits (OrbitCatalog|list[Orbit]): The orbits
+        start (float): The start of the window (in days)
+        end (float): The end of the window (in days), inclusive
+        events (tuple[EOrbitEvent]): The kinds of event to find
+    Returns:
+        np.array: The events as an `EVENT_DTYPE` structured array sorted by time (then orbit and event)
+    """
+    catalog = orbits
+    if not isinstance(catalog, celestial_sandbox.types.orbit_catalog.OrbitCatalog):
+        catalog = celestial_sandbox.types.orbit_catalog.OrbitCatalog.from_orbits(orbits)
+    kinds = np.array([int(x) for x in events], dtype=np.intp)
+
+    eccentricity = catalog.eccentricity.astype(np.float64)[:, None]
+    period = catalog.orbital_period.astype(np.float64)[:, None]
+    mean_anomaly = celestial_sandbox.orbital_elements.true_anomaly.mean_anomaly_from_true_anomaly(
+        eccentricity, event_true_anomalies(catalog)[:, kinds]
+    )
+
+    # the time of the first occurrence of each event after periapsis, then the range of whole periods in the window
+    first = period * (np.mod(mean_anomaly, 2 * math.pi) / (2 * math.pi))
+    lowest = np.ceil((start - first) / period)
+    highest = np.floor((end - first) / period)
+    counts = np.maximum(highest - lowest + 1, 0).astype(np.intp)
+
+    # equatorial orbits never cross the reference plane
+    inclination = catalog.inclination.astype(np.float64)
+    equatorial = np.minimum(inclination, math.pi - inclination) < EQUATORIAL_TOLERANCE
+    is_node = (kinds == EOrbitEvent.ASCENDING_NODE) | (kinds == EOrbitEvent.DESCENDING_NODE)
+    counts[equatorial[:, None] & is_node[None, :]] = 0
+
+    # one row per occurrence, generated in order of orbit then event
+    counts = counts.ravel()
+    repeated = np.repeat(np.arange(len(counts)), counts)
+    periods = lowest.ravel()[repeated] - np.repeat(np.cumsum(counts) - counts, counts) + np.arange(len(repeated))
+    times = first.ravel()[repeated] + periods * np.repeat(period, len(kinds), axis=1).ravel()[repeated]
+
+    # so a stable sort on time alone breaks ties by orbit then event
+    order = np.argsort(times, kind="stable")
+    repeated = repeated[order]
+    table = np.empty(len(repeated), dtype=EVENT_DTYPE)
+    table["orbit"] = repeated // len(kinds)
+    table["event"] = kinds[repeated % len(kinds)]
+    table["time"] = times[order]
+    return table
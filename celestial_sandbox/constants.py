@@ -5,6 +5,10 @@ Common constant values
 # Used to calculate the force of gravity between two objects
 GRAVITATIONAL_CONSTANT = 6.6743e-11
 
+# The gravitational constant (in `km^3/(kg*s^2)`)
+# Used when positions are measured in kilometers, as they are throughout the orbit code
+GRAVITATIONAL_CONSTANT_KM = GRAVITATIONAL_CONSTANT * 1e-9
+
 # One astronomical unit (in Kilometers)
 # An astronomical unit is the average distance between the Earth and the Sun.
 # (approximately 149.6 million Kilometers)
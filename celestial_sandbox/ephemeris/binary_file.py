@@ -0,0 +1,266 @@
+"""
+Binary ephemeris files
+
+Stores positions of many bodies sampled on a shared, evenly spaced time grid, so they can be
+memory mapped back in rather than regenerated. Opening a file only reads the header and name table,
+the position data is paged in by the OS as queries touch it.
+
+File layout (all values little-endian):
+    Header (64 bytes):
+        magic           8 bytes     b"CSEPHEM\\0"
+        version         uint32      Format version (currently 1)
+        item size       uint32      Bytes per stored value, 4 (float32) or 8 (float64)
+        body count      uint64      The number of bodies (B)
+        time count      uint64      The number of samples per body (T)
+        start           float64     The time of the first sample (in days)
+        step            float64     The time between samples (in days)
+        name width      uint32      Bytes per entry in the name table (W)
+        reserved        uint32      Always 0
+        data offset     uint64      Byte offset of the position data from the start of the file
+    Name table:
+        B entries of W bytes, each a UTF-8 body name padded with null bytes
+    Position data (starting at the data offset, aligned to 64 bytes):
+        A C-ordered (B, T, 3) array of xyz positions (in kilometers).
+        Each body is one contiguous block, so a body over any time range is a contiguous run of the file.
+"""
+import collections
+import struct
+
+import numpy as np
+
+
+MAGIC = b"CSEPHEM\0"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQddIIQ")
+_ALIGNMENT = 64
+_DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+
+class EphemerisWriter(object):
+    def __init__(self, path, names, start, step, time_count, dtype=np.float64):
+        """
+        Creates an ephemeris file at full size, positions are then written into it block by block
+        so the whole grid never has to be held in memory.
+
+        Args:
+            path (str): The path of the file to create
+            names (list[str]): The names of the bodies, in the order they are stored - each must be unique
+            start (float): The time of the first sample (in days)
+            step (float): The time between samples (in days)
+            time_count (int): The number of samples per body
+            dtype (np.dtype): The type to store positions with, float32 or float64
+        Raises:
+            ValueError: If two bodies share a name, as lookups by name could only ever find one of them
+        """
+        dtype = np.dtype(dtype)
+        if dtype.itemsize not in _DTYPES or dtype.kind != "f":
+            raise AttributeError(f"Positions must be stored as float32 or float64, got {dtype}.")
+        names = list(names)
+        duplicates = sorted(name for name, count in collections.Counter(names).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Body names must be unique, duplicated: {duplicates}.")
+
+        self.path = path
+        self.names = names
+        self.start = start
+        self.step = step
+        self.time_count = time_count
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+        encoded = [name.encode("utf-8") for name in self.names]
+        name_width = max([len(x) for x in encoded] + [1])
+        data_offset = _HEADER.size + name_width * len(encoded)
+        data_offset += -data_offset % _ALIGNMENT
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(
+                MAGIC, VERSION, dtype.itemsize, len(encoded), time_count, start, step, name_width, 0, data_offset
+            ))
+            f.write(b"".join(x.ljust(name_width, b"\0") for x in encoded))
+
+        self.data = np.memmap(
+            path, dtype=_DTYPES[dtype.itemsize], mode="r+", offset=data_offset, shape=(len(encoded), time_count, 3)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, body, positions, time_index=0):
+        """
+        Writes a block of positions for one body.
+
+        Args:
+            body (str|int): The name or index of the body
+            positions (np.array): The (N, 3) positions to write (in kilometers)
+            time_index (int): The index of the sample the block starts at
+        """
+        index = self._index[body] if isinstance(body, str) else body
+        self.data[index, time_index:time_index + len(positions)] = positions
+
+    def write_chunk(self, positions, time_index=0):
+        """
+        Writes a block of positions for every body at once.
+
+        Args:
+            positions (np.array): The (B, N, 3) positions to write (in kilometers)
+            time_index (int): The index of the sample the block starts at
+        """
+        self.data[:, time_index:time_index + positions.shape[1]] = positions
+
+    def close(self):
+        """
+        Flushes the positions to disk.
+        """
+        if self.data is not None:
+            self.data.flush()
+            self.data = None
+
+
+def write_ephemeris(path, names, start, step, positions, dtype=np.float64):
+    """
+    Writes an ephemeris file from positions already held in memory.
+
+    Args:
+        path (str): The path of the file to write
+        names (list[str]): The names of the bodies
+        start (float): The time of the first sample (in days)
+        step (float): The time between samples (in days)
+        positions (np.array): The (B, T, 3) positions (in kilometers)
+        dtype (np.dtype): The type to store positions with, float32 or float64
+    """
+    with EphemerisWriter(path, names, start, step, positions.shape[1], dtype=dtype) as writer:
+        writer.write_chunk(positions)
+
+
+def write_orbits(path, orbits, start, step, time_count, dtype=np.float64, chunk_size=100_000):
+    """
+    Samples a list of orbits on a time grid and writes them to an ephemeris file,
+    one chunk of samples at a time.
+
+    Args:
+        path (str): The path of the file to write
+        orbits (list[Orbit]): The orbits to sample, each must have a unique name.
+            Unnamed orbits are named by their index, which must not collide with another orbit's name either
+        start (float): The time of the first sample (in days)
+        step (float): The time between samples (in days)
+        time_count (int): The number of samples per body
+        dtype (np.dtype): The type to store positions with, float32 or float64
+        chunk_size (int): The number of samples to generate at once
+    Raises:
+        ValueError: If two orbits end up with the same name
+    """
+    names = [orbit.name or str(i) for i, orbit in enumerate(orbits)]
+    with EphemerisWriter(path, names, start, step, time_count, dtype=dtype) as writer:
+        for time_index in range(0, time_count, chunk_size):
+            times = start + step * np.arange(time_index, min(time_index + chunk_size, time_count))
+            for i, orbit in enumerate(orbits):
+                writer.write(i, orbit.positions(times), time_index=time_index)
+
+
+class EphemerisFile(object):
+    def __init__(self, path):
+        """
+        Opens an ephemeris file for reading. Only the header and name table are read,
+        position data is memory mapped.
+
+        Args:
+            path (str): The path of the file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            (
+                magic, version, item_size, body_count, time_count, self.start, self.step, name_width, _, data_offset
+            ) = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise AttributeError(f"{path} is not an ephemeris file.")
+            if version != VERSION:
+                raise AttributeError(f"Unsupported ephemeris file version {version}, expected {VERSION}.")
+            name_table = f.read(name_width * body_count)
+
+        self.names = [
+            name_table[i * name_width:(i + 1) * name_width].rstrip(b"\0").decode("utf-8") for i in range(body_count)
+        ]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.time_count = time_count
+
+        self.data = np.memmap(
+            path, dtype=_DTYPES[item_size], mode="r", offset=data_offset, shape=(body_count, time_count, 3)
+        )
+
+    @property
+    def end(self):
+        """
+        Returns:
+            float: The time of the last sample (in days)
+        """
+        return self.start + self.step * (self.time_count - 1)
+
+    def _time_slice(self, start=None, end=None):
+        """
+        Args:
+            start (float): The start of the time range (in days), inclusive
+            end (float): The end of the time range (in days), inclusive
+        Returns:
+            slice: The range of samples within [start, end]
+        """
+        # allow for rounding, so a range ending exactly on a sample includes it
+        epsilon = 1e-9
+        first = 0
+        if start is not None:
+            first = max(0, int(np.ceil((start - self.start) / self.step - epsilon)))
+        last = self.time_count
+        if end is not None:
+            last = min(self.time_count, int(np.floor((end - self.start) / self.step + epsilon)) + 1)
+        return slice(first, max(first, last))
+
+    def times(self, start=None, end=None):
+        """
+        Gets the sample times within a time range.
+
+        Args:
+            start (float): The start of the time range (in days), inclusive
+            end (float): The end of the time range (in days), inclusive
+        Returns:
+            np.array: The sample times (in days)
+        """
+        samples = self._time_slice(start, end)
+        return self.start + self.step * np.arange(samples.start, samples.stop)
+
+    def body(self, name, start=None, end=None):
+        """
+        Gets the positions of one body over a time range, as a view onto the file (no data is copied).
+
+        Args:
+            name (str): The name of the body
+            start (float): The start of the time range (in days), inclusive
+            end (float): The end of the time range (in days), inclusive
+        Returns:
+            np.memmap: The (N, 3) positions (in kilometers)
+        """
+        return self.data[self._index[name], self._time_slice(start, end)]
+
+    def bodies(self, names=None, start=None, end=None):
+        """
+        Gets the positions of several bodies over a time range.
+        This is a view onto the file when the bodies are stored next to each other (or `names` is None),
+        otherwise the selected bodies are copied.
+
+        Args:
+            names (list[str]): The names of the bodies, all bodies if None
+            start (float): The start of the time range (in days), inclusive
+            end (float): The end of the time range (in days), inclusive
+        Returns:
+            np.array: The (B, N, 3) positions (in kilometers)
+        """
+        samples = self._time_slice(start, end)
+        if names is None:
+            return self.data[:, samples]
+
+        indices = [self._index[name] for name in names]
+        if indices and indices == list(range(indices[0], indices[0] + len(indices))):
+            return self.data[indices[0]:indices[0] + len(indices), samples]
+        return self.data[indices, samples]
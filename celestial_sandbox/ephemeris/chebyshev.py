@@ -0,0 +1,216 @@
+"""
+Chebyshev ephemerides
+
+An orbit is compiled into a series of fixed length time segments, each storing a Chebyshev polynomial per axis
+which is fitted to the orbit's positions over that segment (the same layout as a SPICE SPK type 2 segment).
+Evaluating a position is then a polynomial evaluation, rather than solving Kepler's equation,
+and velocities come from the analytic derivative of the same polynomials.
+"""
+import math
+
+import numpy as np
+
+
+class ChebyshevEphemeris(object):
+    def __init__(self, coefficients, start, segment_length, name=None):
+        """
+        Args:
+            coefficients (np.array): The (segments, 3, degree + 1) Chebyshev coefficients of each segment
+            start (float): The time at the start of the first segment (in days)
+            segment_length (float): The length of each segment (in days)
+            name (str): Optional name of the body
+        """
+        self.coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+        self.start = start
+        self.segment_length = segment_length
+        self.name = name
+
+        # The maximum position error of the fit (in kilometers), measured by `compile_orbit`
+        self.error = None
+
+        # Derivative of each segment's series, rescaled from [-1, 1] to days
+        self.velocity_coefficients = np.polynomial.chebyshev.chebder(
+            self.coefficients, axis=-1, scl=2.0 / segment_length
+        )
+
+    @property
+    def end(self):
+        """
+        Returns:
+            float: The time at the end of the last segment (in days)
+        """
+        return self.start + len(self.coefficients) * self.segment_length
+
+    @property
+    def degree(self):
+        """
+        Returns:
+            int: The degree of the Chebyshev polynomials
+        """
+        return self.coefficients.shape[-1] - 1
+
+    def _evaluate(self, coefficients, times):
+        """
+        Evaluates the Chebyshev series of the segments covering the given times.
+        Times are grouped by segment, so each segment is a single matrix product against the Chebyshev basis.
+
+        Args:
+            coefficients (np.array): The (segments, 3, n) coefficients to evaluate
+            times (float|np.array): The times to evaluate at (in days)
+        Returns:
+            np.array: The (3,) or (N, 3) values
+        """
+        times = np.asarray(times, dtype=np.float64)
+        shape = times.shape
+        times = times.ravel()
+        if not len(times):
+            return np.empty(shape + (3,))
+        if np.any(times < self.start) or np.any(times > self.end):
+            raise AttributeError(f"Times must be within the compiled span [{self.start}, {self.end}].")
+
+        # sort the times (if they aren't already), so that each segment covers a contiguous run of them
+        order = None
+        if np.any(times[1:] < times[:-1]):
+            order = np.argsort(times)
+            times = times[order]
+
+        segment = np.minimum(((times - self.start) // self.segment_length).astype(np.intp), len(coefficients) - 1)
+        x = 2.0 * (times - self.start - segment * self.segment_length) / self.segment_length - 1.0
+
+        # the Chebyshev polynomials at each time, from the recurrence T(k) = 2x * T(k - 1) - T(k - 2)
+        count = coefficients.shape[-1]
+        basis = np.empty((count, len(times)))
+        basis[0] = 1.0
+        if count > 1:
+            basis[1] = x
+        two_x = 2.0 * x
+        for k in range(2, count):
+            np.multiply(two_x, basis[k - 1], out=basis[k])
+            basis[k] -= basis[k - 2]
+
+        values = np.empty((3, len(times)))
+        boundaries = np.flatnonzero(np.diff(segment)) + 1
+        for first, last in zip(np.r_[0, boundaries], np.r_[boundaries, len(times)]):
+            np.matmul(coefficients[segment[first]], basis[:, first:last], out=values[:, first:last])
+
+        result = np.empty((len(times), 3))
+        if order is None:
+            result[:] = values.T
+        else:
+            result[order] = values.T
+        return result.reshape(shape + (3,))
+
+    def positions(self, times):
+        """
+        Gets the positions at the given times.
+
+        Args:
+            times (float|np.array): The times to get the positions at (in days)
+        Returns:
+            np.array: The (3,) position for a scalar time, or (N, 3) positions for an array of times (in kilometers)
+        """
+        return self._evaluate(self.coefficients, times)
+
+    def velocities(self, times):
+        """
+        Gets the velocities at the given times.
+
+        Args:
+            times (float|np.array): The times to get the velocities at (in days)
+        Returns:
+            np.array: The (3,) velocity for a scalar time, or (N, 3) velocities for an array of times
+                (in kilometers per day)
+        """
+        return self._evaluate(self.velocity_coefficients, times)
+
+    def position_vector(self, time_value):
+        """
+        Gets the position at a given time, matching `Orbit.position_vector` so the two can be swapped.
+
+        Args:
+            time_value (float): The time value to get the position at (in 24 hour days)
+        Returns:
+            np.array: The xyz position at the given time
+        """
+        return self.positions(time_value)
+
+
+def _chebyshev_nodes(count):
+    """
+    Args:
+        count (int): The number of nodes
+    Returns:
+        np.array: The Chebyshev nodes of the first kind on [-1, 1]
+    """
+    return np.cos(math.pi * (np.arange(count) + 0.5) / count)
+
+
+def fit_segments(orbit, start, segment_count, segment_length, degree):
+    """
+    Fits Chebyshev coefficients to an orbit over consecutive segments, by interpolating at the Chebyshev nodes.
+
+    Args:
+        orbit (Orbit): The orbit to fit
+        start (float): The time at the start of the first segment (in days)
+        segment_count (int): The number of segments
+        segment_length (float): The length of each segment (in days)
+        degree (int): The degree of the polynomials
+    Returns:
+        np.array: The (segment_count, 3, degree + 1) coefficients
+    """
+    count = degree + 1
+    nodes = _chebyshev_nodes(count)
+    midpoints = start + (np.arange(segment_count) + 0.5) * segment_length
+    times = midpoints[:, None] + 0.5 * segment_length * nodes[None, :]
+    samples = orbit.positions(times.ravel()).reshape(segment_count, count, 3)
+
+    # discrete orthogonality of the Chebyshev polynomials at the nodes gives the coefficients directly
+    basis = np.cos(math.pi * np.arange(count)[:, None] * (np.arange(count)[None, :] + 0.5) / count)
+    coefficients = (2.0 / count) * np.einsum("snd,jn->sdj", samples, basis)
+    coefficients[..., 0] *= 0.5
+    return coefficients
+
+
+def compile_orbit(orbit, start, end, segment_length, tol=1.0, degree=8, max_degree=32):
+    """
+    Compiles an orbit into a Chebyshev ephemeris covering [start, end].
+    The degree is raised from `degree` until the fit is within `tol` of the orbit everywhere.
+
+    Args:
+        orbit (Orbit): The orbit to compile
+        start (float): The start of the time span (in days)
+        end (float): The end of the time span (in days)
+        segment_length (float): The length of each segment (in days)
+        tol (float): The maximum position error of the fit (in kilometers)
+        degree (int): The initial degree of the polynomials
+        max_degree (int): The maximum degree of the polynomials, before giving up
+    Returns:
+        ChebyshevEphemeris: The compiled ephemeris
+    """
+    segment_count = max(1, math.ceil((end - start) / segment_length))
+
+    # check the fit between the interpolation nodes, at the extrema of the Chebyshev polynomials
+    check_count = 4 * max_degree
+    check_times = (
+        start + segment_length * (np.arange(segment_count)[:, None] + 0.5) +
+        0.5 * segment_length * np.cos(math.pi * np.arange(check_count + 1) / check_count)[None, :]
+    ).ravel()
+    check_times = np.clip(check_times, start, start + segment_count * segment_length)
+    expected = orbit.positions(check_times)
+
+    while True:
+        ephemeris = ChebyshevEphemeris(
+            fit_segments(orbit, start, segment_count, segment_length, degree),
+            start,
+            segment_length,
+            name=getattr(orbit, "name", None)
+        )
+        ephemeris.error = float(np.linalg.norm(ephemeris.positions(check_times) - expected, axis=-1).max())
+        if ephemeris.error <= tol:
+            return ephemeris
+        if degree >= max_degree:
+            raise AttributeError(
+                f"Could not fit within {tol} km at degree {max_degree} (error {ephemeris.error} km), "
+                f"try a shorter segment length."
+            )
+        degree = min(max_degree, degree + 4)
@@ -0,0 +1,122 @@
+"""
+Parallel propagation across processes
+
+Work is split into shards, each propagated by a worker in a process pool. Workers write their results
+straight into one output array in shared memory, so only the (small) inputs are pickled and nothing is sent back.
+
+Every element of the output only depends on its own inputs, so the results are bit-identical to the serial path
+however the work is split.
+"""
+import concurrent.futures
+import multiprocessing.shared_memory
+
+import numpy as np
+
+
+def _attach(name, shape):
+    """
+    Attaches to a shared memory block created by the parent process.
+
+    Args:
+        name (str): The name of the shared memory block
+        shape (tuple): The shape of the float64 array it holds
+    Returns:
+        tuple: The shared memory block, and the array view onto it
+    """
+    # workers share the parent's resource tracker, so the block is still only unlinked once, by the parent
+    memory = multiprocessing.shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+
+def _propagate_catalog_shard(name, shape, catalog, t, start):
+    memory, output = _attach(name, shape)
+    try:
+        output[start:start + len(catalog)] = catalog.propagate(t)
+    finally:
+        del output
+        memory.close()
+
+
+def _propagate_orbit_shard(name, shape, orbit, index, times, start):
+    memory, output = _attach(name, shape)
+    try:
+        output[index, start:start + len(times)] = orbit.positions(times)
+    finally:
+        del output
+        memory.close()
+
+
+def _run(shape, tasks, workers):
+    """
+    Runs tasks writing into a shared output array, across a process pool.
+
+    Args:
+        shape (tuple): The shape of the float64 output array
+        tasks (list[tuple]): The worker function and its arguments (after the shared memory name and shape) per shard
+        workers (int): The number of worker processes, None for one per core, or 1 to run in this process
+    Returns:
+        np.array: The output array, copied out of shared memory
+    """
+    memory = multiprocessing.shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    try:
+        if workers == 1:
+            for function, *arguments in tasks:
+                function(memory.name, shape, *arguments)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(function, memory.name, shape, *arguments) for function, *arguments in tasks]
+                # re-raises the first failure from a worker
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+        return np.ndarray(shape, dtype=np.float64, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def propagate_catalog(catalog, t, workers=None, chunk_size=250_000):
+    """
+    Gets the position of every member of an `OrbitCatalog` at a given time, sharding the members across processes.
+    Matches `OrbitCatalog.propagate` exactly, always returned as float64.
+
+    Args:
+        catalog (OrbitCatalog): The orbits to propagate
+        t (float|np.array): The time since periapsis (in days) - either one time for all members or one per member
+        workers (int): The number of worker processes, None for one per core, or 1 to run in this process
+        chunk_size (int): The number of members per shard
+    Returns:
+        np.array: The (N, 3) positions (in kilometers)
+    """
+    t = np.asarray(t, dtype=np.float64)
+    tasks = [
+        (
+            _propagate_catalog_shard,
+            catalog[start:start + chunk_size],
+            t if t.ndim == 0 else t[start:start + chunk_size],
+            start
+        )
+        for start in range(0, len(catalog), chunk_size)
+    ]
+    return _run((len(catalog), 3), tasks, workers)
+
+
+def propagate_orbits(orbits, times, workers=None, chunk_size=100_000):
+    """
+    Gets the positions of a list of orbits over a grid of times, sharding both the orbits and the time grid
+    across processes. Matches calling `Orbit.positions` for each orbit exactly.
+
+    Args:
+        orbits (list[Orbit]): The orbits to propagate
+        times (np.array): The 1-D array of times (in days)
+        workers (int): The number of worker processes, None for one per core, or 1 to run in this process
+        chunk_size (int): The number of times per shard
+    Returns:
+        np.array: The (B, N, 3) positions (in kilometers)
+    """
+    times = np.asarray(times, dtype=np.float64)
+    tasks = [
+        (_propagate_orbit_shard, orbit, index, times[start:start + chunk_size], start)
+        for index, orbit in enumerate(orbits)
+        for start in range(0, len(times), chunk_size)
+    ]
+    return _run((len(orbits), len(times), 3), tasks, workers)
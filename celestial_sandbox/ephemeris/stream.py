@@ -0,0 +1,203 @@
+"""
+Streaming ephemeris generation
+
+Positions are generated in fixed size chunks of samples, so peak memory is set by the chunk size
+rather than by the length of the time span. Each chunk is a `(times, positions)` tuple,
+where `times` is an (N,) array (in days) and `positions` is a (B, N, 3) array (in kilometers) for B bodies.
+
+Stages are callables taking an iterator of chunks and returning another iterator of chunks,
+so they can be chained together with `pipeline`, i.e:
+    chunks = pipeline(
+        generate(orbits, 0, 36500, 1 / 1440),
+        relative_to(0),
+        write_to_file("ephemeris.bin", names, 0, 1 / 1440, end=36500),
+    )
+    time, distance = closest_approach(chunks, 1, 2)
+"""
+import math
+
+import numpy as np
+
+import celestial_sandbox.ephemeris.binary_file
+
+
+def sample_count(start, end, step):
+    """
+    Args:
+        start (float): The time of the first sample (in days)
+        end (float): The end of the time span (in days), inclusive
+        step (float): The time between samples (in days)
+    Returns:
+        int: The number of samples in [start, end]
+    """
+    return int(math.floor((end - start) / step + 1e-9)) + 1
+
+
+def generate(orbits, start, end, step, chunk_size=10_000):
+    """
+    Generates the positions of a list of orbits over a time span, one chunk of samples at a time.
+
+    Args:
+        orbits (list[Orbit]): The orbits to generate positions for
+        start (float): The time of the first sample (in days)
+        end (float): The end of the time span (in days), inclusive
+        step (float): The time between samples (in days)
+        chunk_size (int): The number of samples per chunk
+    Yields:
+        tuple: The (N,) sample times and (B, N, 3) positions of the chunk
+    """
+    count = sample_count(start, end, step)
+    for first in range(0, count, chunk_size):
+        times = start + step * np.arange(first, min(first + chunk_size, count))
+        positions = np.empty((len(orbits), len(times), 3))
+        for i, orbit in enumerate(orbits):
+            positions[i] = orbit.positions(times)
+        yield times, positions
+
+
+def pipeline(source, *stages):
+    """
+    Chains stages onto a source of chunks. Nothing is generated until the result is iterated.
+
+    Args:
+        source (iterable): The chunks to feed into the first stage, i.e from `generate`
+        stages (callable): The stages, in the order they are applied
+    Returns:
+        iterator: The chunks out of the last stage
+    """
+    chunks = iter(source)
+    for stage in stages:
+        chunks = stage(chunks)
+    return chunks
+
+
+# ------------------------------------------------------------------------
+# Stages
+
+
+def map_chunks(function):
+    """
+    Stage which applies a function to every chunk.
+
+    Args:
+        function (callable): Takes `(times, positions)` and returns a new `(times, positions)`
+    Returns:
+        callable: The stage
+    """
+    def stage(chunks):
+        for times, positions in chunks:
+            yield function(times, positions)
+    return stage
+
+
+def relative_to(body):
+    """
+    Stage which makes all positions relative to one of the bodies.
+
+    Args:
+        body (int): The index of the body to use as the origin
+    Returns:
+        callable: The stage
+    """
+    return map_chunks(lambda times, positions: (times, positions - positions[body]))
+
+
+def decimate(factor):
+    """
+    Stage which keeps every `factor`th sample, consistently across chunk boundaries.
+
+    Args:
+        factor (int): The number of samples to step over per kept sample
+    Returns:
+        callable: The stage
+    """
+    def stage(chunks):
+        offset = 0
+        for times, positions in chunks:
+            keep = slice(-offset % factor, None, factor)
+            offset += len(times)
+            if len(times[keep]):
+                yield times[keep], positions[:, keep]
+    return stage
+
+
+def write_to_file(path, names, start, step, time_count=None, end=None, dtype=np.float64):
+    """
+    Stage which writes every chunk to an ephemeris file as it passes through.
+    Chunks are passed on unchanged, so further stages can follow.
+
+    Args:
+        path (str): The path of the file to write
+        names (list[str]): The names of the bodies
+        start (float): The time of the first sample (in days)
+        step (float): The time between samples (in days)
+        time_count (int): The total number of samples, or None to work it out from `end`
+        end (float): The end of the time span (in days), inclusive
+        dtype (np.dtype): The type to store positions with, float32 or float64
+    Returns:
+        callable: The stage
+    """
+    if time_count is None:
+        time_count = sample_count(start, end, step)
+
+    def stage(chunks):
+        with celestial_sandbox.ephemeris.binary_file.EphemerisWriter(
+                path, names, start, step, time_count, dtype=dtype) as writer:
+            time_index = 0
+            for times, positions in chunks:
+                writer.write_chunk(positions, time_index=time_index)
+                time_index += len(times)
+                yield times, positions
+    return stage
+
+
+# ------------------------------------------------------------------------
+# Consumers
+
+
+def reduce_chunks(chunks, function, initial):
+    """
+    Consumes a stream of chunks, folding them into a single value.
+
+    Args:
+        chunks (iterable): The chunks to consume
+        function (callable): Takes `(value, times, positions)` and returns the new value
+        initial (object): The starting value
+    Returns:
+        object: The final value
+    """
+    value = initial
+    for times, positions in chunks:
+        value = function(value, times, positions)
+    return value
+
+
+def consume(chunks):
+    """
+    Runs a stream of chunks to completion, for pipelines where the stages do all the work (i.e writing a file).
+
+    Args:
+        chunks (iterable): The chunks to consume
+    """
+    for _ in chunks:
+        pass
+
+
+def closest_approach(chunks, body_a, body_b):
+    """
+    Consumes a stream of chunks, finding the sample where two bodies are closest together.
+
+    Args:
+        chunks (iterable): The chunks to consume
+        body_a (int): The index of the first body
+        body_b (int): The index of the second body
+    Returns:
+        tuple: The time (in days) and distance (in kilometers) of the closest sample
+    """
+    def closest(value, times, positions):
+        distances = np.linalg.norm(positions[body_a] - positions[body_b], axis=-1)
+        index = np.argmin(distances)
+        return min(value, (float(distances[index]), float(times[index])))
+
+    distance, time = reduce_chunks(chunks, closest, (math.inf, math.nan))
+    return time, distance
@@ -16,6 +16,21 @@ def get_rotation_matrix(i, Omega, omega):
     return get_rotation_matrix_z(-Omega) @ get_rotation_matrix_x(-i) @ get_rotation_matrix_z(-omega)
 
 
+def get_orbital_plane_rotation_matrix(i, Omega, omega):
+    """
+    Calculates the rotation matrix from the orbital plane (periapsis along +x) into world space.
+    This is the rotation applied by `position_vector_from_orbital_elements`, so it can be cached per orbit.
+
+    Args:
+        i (float): The inclination (in radians)
+        Omega (float): The longitude of the ascending node (in radians)
+        omega (float): The argument of periapsis (in radians)
+    Returns:
+        np.array: The rotation matrix
+    """
+    return get_rotation_matrix_z(Omega) @ get_rotation_matrix_x(i) @ get_rotation_matrix_z(omega)
+
+
 def get_rotation_matrix_x(theta):
     """
     Calculates the rotation matrix about the x-axis given an angle theta.
@@ -96,6 +111,38 @@ def position_vector_from_orbital_elements(
     return np.array([x2, y2, z2])
 
 
+def rotate_from_orbital_plane(x, y, inclination, longitude_of_ascending_node, argument_of_periapsis):
+    """
+    Rotates vector(s) lying in the orbital plane into world space, applying the same rotation as
+    `get_orbital_plane_rotation_matrix` elementwise rather than as a matrix.
+    Any number of orbits can be rotated at once, with one set of angles per vector, and the vectors may be positions
+    or velocities alike. The result takes the precision of the inputs, so float32 stays float32.
+
+    Args:
+        x (float|np.array): The x component(s) in the orbital plane (along the periapsis)
+        y (float|np.array): The y component(s) in the orbital plane (90 degrees ahead of the periapsis)
+        inclination (float|np.array): The inclination(s) (in radians)
+        longitude_of_ascending_node (float|np.array): The longitude(s) of the ascending node (in radians)
+        argument_of_periapsis (float|np.array): The argument(s) of periapsis (in radians)
+    Returns:
+        np.array: The (..., 3) world space vectors, in the units of x and y
+    """
+    cos_w, sin_w = np.cos(argument_of_periapsis), np.sin(argument_of_periapsis)
+    cos_i, sin_i = np.cos(inclination), np.sin(inclination)
+    cos_o, sin_o = np.cos(longitude_of_ascending_node), np.sin(longitude_of_ascending_node)
+
+    # rotate by argument of periapsis
+    x1 = x * cos_w - y * sin_w
+    y1 = x * sin_w + y * cos_w
+
+    # rotate by inclination, then by longitude of ascending node
+    result = np.empty(np.shape(x1) + (3,), dtype=np.result_type(x1, 1.0))
+    result[..., 0] = x1 * cos_o - y1 * cos_i * sin_o
+    result[..., 1] = x1 * sin_o + y1 * cos_i * cos_o
+    result[..., 2] = y1 * sin_i
+    return result
+
+
 '''def position_vector_from_orbital_elements(a, e, i, omega, w, nu):
     """
     Convert orbital elements to an x/y/z position vector using a rotation matrix.
@@ -0,0 +1,142 @@
+"""
+Adaptive orbit paths for drawing
+
+Sampling an orbit uniformly in true anomaly bunches vertices up at apoapsis (where the body is slow)
+and spreads them out at periapsis, where an eccentric orbit bends the most.
+
+Instead, vertices are placed by eccentric anomaly (E), where the ellipse is `(a(cos E - e), b sin E)`.
+The chord between two vertices strays from the curve by its sagitta, roughly `curvature * length^2 / 8`,
+so keeping every sagitta at the tolerance needs a vertex density along E proportional to
+`sqrt(a * b / (8 * tolerance)) / sqrt(g(E))`, where `g(E) = sqrt(a^2 sin^2 E + b^2 cos^2 E)` is the speed of the
+parametrisation. Vertices are spaced evenly in the integral of that density.
+
+Paths for many orbits are returned as one vertex buffer, with an offsets array marking where each path starts
+(or NaN rows separating them, which matplotlib draws as breaks in a single line).
+"""
+import math
+
+import numpy as np
+
+import celestial_sandbox.orbit
+
+
+# The relative chord error (as a fraction of the semi-major axis) of each level of detail, finest first.
+# Each level has roughly half the vertices of the one before it
+LOD_TOLERANCES = (1e-6, 4e-6, 1.6e-5, 6.4e-5, 2.56e-4, 1.024e-3)
+
+# The number of points the vertex density is integrated over
+_DENSITY_SAMPLES = 256
+
+# The sagitta estimate only holds to leading order, so a few extra vertices keep the worst chord inside the tolerance
+_HEADROOM = 1.05
+
+# Paths never have fewer vertices than this, so even very coarse paths look like closed loops
+MIN_VERTICES = 8
+
+
+def _elements(orbits):
+    """
+    Args:
+        orbits (OrbitCatalog|list[Orbit]): The orbits
+    Returns:
+        list[np.array]: The semi-major axis, eccentricity, inclination, longitude of the ascending node
+            and argument of periapsis of every orbit
+    """
+    names = ("semi_major_axis", "eccentricity", "inclination", "longitude_of_ascending_node", "argument_of_periapsis")
+    if isinstance(orbits, (list, tuple)):
+        return [np.fromiter((getattr(x, name) for x in orbits), dtype=np.float64, count=len(orbits)) for name in names]
+    return [np.asarray(getattr(orbits, name), dtype=np.float64) for name in names]
+
+
+def orbit_paths(orbits, tolerance):
+    """
+    Generates closed paths around a set of orbits, with vertices placed so no chord strays further than
+    a tolerance from the true ellipse. For a screen space tolerance, pass the allowed error in pixels times
+    the size of a pixel (in kilometers).
+
+    Args:
+        orbits (OrbitCatalog|list[Orbit]): The orbits
+        tolerance (float|np.array): The maximum chord error, either one for all orbits or one per orbit
+            (in kilometers)
+    Returns:
+        tuple: The (V, 3) vertices of every path one after another (in kilometers), and the (N + 1,) offsets
+            of where each path starts in them - each path repeats its first vertex at the end to close the loop
+    """
+    a, e, inclination, node, periapsis = _elements(orbits)
+    b = a * np.sqrt(1 - e ** 2)
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.float64), a.shape)
+
+    # integral of the vertex density over a grid of eccentric anomalies, per orbit (by the trapezium rule)
+    grid = np.linspace(0, 2 * math.pi, _DENSITY_SAMPLES + 1)
+    speed = np.sqrt((a[:, None] * np.sin(grid)) ** 2 + (b[:, None] * np.cos(grid)) ** 2)
+    density = np.sqrt(a * b / (8 * tolerance))[:, None] / np.sqrt(speed)
+    cumulative = np.zeros_like(density)
+    cumulative[:, 1:] = np.cumsum((density[:, 1:] + density[:, :-1]) * (0.5 * grid[1]), axis=1)
+    counts = np.maximum(np.ceil(cumulative[:, -1] * _HEADROOM).astype(np.intp), MIN_VERTICES)
+
+    # spread each orbit's vertices evenly through its integral. Adding the orbit index to the normalised integrals
+    # makes them one increasing sequence, so every vertex can be inverted with a single interpolation
+    orbit = np.repeat(np.arange(len(a)), counts)
+    starts = np.cumsum(counts) - counts
+    fraction = (np.arange(counts.sum()) - starts[orbit]) / counts[orbit]
+    keys = (cumulative / cumulative[:, -1:] + np.arange(len(a))[:, None]).ravel()
+    eccentric_anomaly = np.interp(orbit + fraction, keys, np.tile(grid, len(a)))
+
+    # close every loop by repeating its first vertex
+    eccentric_anomaly = np.insert(eccentric_anomaly, np.cumsum(counts), eccentric_anomaly[starts])
+    orbit = np.insert(orbit, np.cumsum(counts), np.arange(len(a)))
+
+    vertices = celestial_sandbox.orbit.rotate_from_orbital_plane(
+        a[orbit] * (np.cos(eccentric_anomaly) - e[orbit]),
+        b[orbit] * np.sin(eccentric_anomaly),
+        inclination[orbit],
+        node[orbit],
+        periapsis[orbit]
+    )
+    offsets = np.zeros(len(a) + 1, dtype=np.intp)
+    np.cumsum(counts + 1, out=offsets[1:])
+    return vertices, offsets
+
+
+def concatenate_paths(paths):
+    """
+    Joins separate paths into one vertex buffer.
+
+    Args:
+        paths (list[np.array]): The (Vi, 3) vertices of each path
+    Returns:
+        tuple: The (V, 3) vertices of every path one after another, and the (N + 1,) offsets of where each starts
+    """
+    offsets = np.zeros(len(paths) + 1, dtype=np.intp)
+    np.cumsum([len(x) for x in paths], out=offsets[1:])
+    vertices = np.concatenate(paths) if paths else np.empty((0, 3))
+    return vertices, offsets
+
+
+def nan_separated(vertices, offsets):
+    """
+    Converts a vertex buffer with offsets into one with a row of NaNs between paths,
+    so that all the paths can be drawn with a single plot call.
+
+    Args:
+        vertices (np.array): The (V, 3) vertices
+        offsets (np.array): The (N + 1,) offsets of where each path starts
+    Returns:
+        np.array: The (V + N - 1, 3) vertices with NaN separators
+    """
+    return np.insert(vertices, offsets[1:-1], np.nan, axis=0)
+
+
+def path_buffer(orbits, level=0, separate_with_nan=False):
+    """
+    Joins the cached paths of many `Orbit` objects at one level of detail into one vertex buffer.
+
+    Args:
+        orbits (list[Orbit]): The orbits
+        level (int): The level of detail, an index into `LOD_TOLERANCES` (0 is the finest)
+        separate_with_nan (bool): Separate the paths with NaN rows rather than returning offsets
+    Returns:
+        np.array|tuple: The NaN separated vertices, or the vertices and offsets (see `orbit_paths`)
+    """
+    vertices, offsets = concatenate_paths([x.path(level) for x in orbits])
+    return nan_separated(vertices, offsets) if separate_with_nan else (vertices, offsets)
@@ -5,18 +5,23 @@ Eccentricity:
     The shape of the ellipse, describing how muc it is elongate compared to a circle.
 """
 import math
+import numpy as np
+
+import celestial_sandbox.orbital_elements.kepler
 
 
 def validate_eccentricity(eccentricity: float):
     """
-    Checks that an eccentricity is between 0.0 and 1.0
+    Checks that an eccentricity (or every eccentricity in an array) is between 0.0 and 1.0
     Raises an attribute error if it is not
 
     Args:
-        eccentricity (float): The eccentricity to validate
+        eccentricity (float|np.array): The eccentricity to validate
     """
-    if eccentricity >= 1.0 or eccentricity < 0.0:
-        raise AttributeError(f"Eccentricity must be between 0.0 and 1.0, got {eccentricity}.")
+    values = np.asarray(eccentricity)
+    invalid = (values >= 1.0) | (values < 0.0)
+    if np.any(invalid):
+        raise AttributeError(f"Eccentricity must be between 0.0 and 1.0, got {values[invalid].ravel()[0]}.")
 
 
 def eccentric_anomaly(eccentricity: float, true_anomaly: float) -> float:
@@ -48,27 +53,41 @@ def eccentric_anomaly_from_mean_anomaly(eccentricity: float, mean_anomaly: float
     Returns:
         float: The eccentric anomaly (in Radians)
     """
-    # use Newton's method to solve Kepler's equation iteratively
-    # start with an initial guess equal to M
-    E = mean_anomaly
-    tol = 1e-6  # tolerance for convergence
-
-    max_iter = 100
-    n = 0
-    while n < max_iter:
-        # calculate the function value and its derivative
-        f = E - eccentricity * math.sin(E) - mean_anomaly
-        df = 1 - eccentricity * math.cos(E)
+    return float(eccentric_anomaly_from_mean_anomaly_array(eccentricity, mean_anomaly))
 
-        E = E - f / df  # updare E using Newton's method
 
-        if abs(f) < tol:
-            # convergence achieved
-            break
+def eccentric_anomaly_from_mean_anomaly_array(
+        eccentricity: np.ndarray,
+        mean_anomaly: np.ndarray,
+        tol: float = celestial_sandbox.orbital_elements.kepler.DEFAULT_TOLERANCE,
+        max_iter: int = celestial_sandbox.orbital_elements.kepler.DEFAULT_MAX_ITERATIONS,
+        return_iterations: bool = False,
+        method: celestial_sandbox.orbital_elements.kepler.EKeplerSolver = None
+):
+    """
+    Gets the Eccentric Anomaly for whole arrays of mean anomalies and eccentricities.
+    Kepler's equation is solved for every element at once, eccentricity is broadcast against mean anomaly.
 
-        n += 1
+    Args:
+        eccentricity (np.ndarray): The eccentricity of the orbit(s)
+        mean_anomaly (np.ndarray): The mean anomaly of the orbit(s) (in Radians)
+        tol (float): Tolerance on the residual of Kepler's equation
+        max_iter (int): The maximum number of iterations for any element
+        return_iterations (bool): If True, also return the number of iterations taken by each element
+        method (EKeplerSolver): The solver to use, see `celestial_sandbox.orbital_elements.kepler`
 
-    return E
+    Returns:
+        np.ndarray: The eccentric anomaly (in Radians)
+        np.ndarray: (Optional) The number of iterations taken by each element
+    """
+    return celestial_sandbox.orbital_elements.kepler.solve(
+        eccentricity,
+        mean_anomaly,
+        method=method,
+        tol=tol,
+        max_iter=max_iter,
+        return_iterations=return_iterations
+    )
 
 
 def true_anomaly(eccentricity: float, eccentric_anomaly: float) -> float:
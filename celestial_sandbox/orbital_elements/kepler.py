@@ -0,0 +1,359 @@
+"""
+Solvers for Kepler's equation
+
+Kepler's Equation:
+    M = E - e * sin(E)
+    Relates the mean anomaly (M) to the eccentric anomaly (E) of an elliptical orbit.
+    It has no closed form solution for E, so it is solved numerically.
+
+All solvers work on scalars or NumPy arrays (eccentricity is broadcast against mean anomaly).
+The mean anomaly is reduced into [-pi, pi) before solving, and the whole revolutions are added back afterwards.
+"""
+import enum
+import math
+
+import numpy as np
+
+
+class EKeplerSolver(enum.Enum):
+    # Newton-Raphson, quadratic convergence
+    NEWTON = 0
+    # Halley's method, cubic convergence
+    HALLEY = 1
+    # Danby's starter with the quartic (Danby-Burkardt) correction
+    DANBY = 2
+    # Markley's non-iterative method, a cubic starter with one fifth order correction
+    MARKLEY = 3
+
+
+DEFAULT_SOLVER = EKeplerSolver.DANBY
+DEFAULT_TOLERANCE = 1e-12
+DEFAULT_MAX_ITERATIONS = 50
+
+
+def _starter(eccentricity, mean_anomaly):
+    """
+    Danby's initial guess for the eccentric anomaly, good for all eccentricities.
+
+    Args:
+        eccentricity (np.array): The eccentricity of the orbit
+        mean_anomaly (np.array): The mean anomaly, reduced into [-pi, pi) (in Radians)
+    Returns:
+        np.array: The initial guess of the eccentric anomaly (in Radians)
+    """
+    return mean_anomaly + 0.85 * eccentricity * np.sign(mean_anomaly)
+
+
+def _newton_step(eccentricity, mean_anomaly, E, sin=np.sin, cos=np.cos):
+    """
+    Args:
+        sin (callable): The sine function to use (`math.sin` is much faster for scalars)
+        cos (callable): The cosine function to use
+    Returns:
+        tuple: The residual of Kepler's equation at E, and the corrected eccentric anomaly
+    """
+    f = E - eccentricity * sin(E) - mean_anomaly
+    df = 1 - eccentricity * cos(E)
+    return f, E - f / df
+
+
+def _halley_step(eccentricity, mean_anomaly, E, sin=np.sin, cos=np.cos):
+    """
+    Args:
+        sin (callable): The sine function to use (`math.sin` is much faster for scalars)
+        cos (callable): The cosine function to use
+    Returns:
+        tuple: The residual of Kepler's equation at E, and the corrected eccentric anomaly
+    """
+    e_sin = eccentricity * sin(E)
+    f = E - e_sin - mean_anomaly
+    df = 1 - eccentricity * cos(E)
+    return f, E - f / (df - 0.5 * f * e_sin / df)
+
+
+def _danby_step(eccentricity, mean_anomaly, E, sin=np.sin, cos=np.cos):
+    """
+    Args:
+        sin (callable): The sine function to use (`math.sin` is much faster for scalars)
+        cos (callable): The cosine function to use
+    Returns:
+        tuple: The residual of Kepler's equation at E, and the corrected eccentric anomaly
+    """
+    e_sin = eccentricity * sin(E)
+    e_cos = eccentricity * cos(E)
+    f = E - e_sin - mean_anomaly
+    df = 1 - e_cos
+    d1 = -f / df
+    d2 = -f / (df + 0.5 * d1 * e_sin)
+    d3 = -f / (df + 0.5 * d2 * e_sin + d2 * d2 * e_cos / 6)
+    return f, E + d3
+
+
+_STEPS = {
+    EKeplerSolver.NEWTON: _newton_step,
+    EKeplerSolver.HALLEY: _halley_step,
+    EKeplerSolver.DANBY: _danby_step,
+}
+
+
+def _markley(eccentricity, mean_anomaly, return_sin_cos=False):
+    """
+    Solves Kepler's equation without iterating, using Markley's method (1995).
+    Accurate to around machine precision for all elliptical orbits.
+    Works in the precision of its inputs, so float32 arrays are solved in (much faster) float32.
+
+    Args:
+        eccentricity (np.array): The eccentricity of the orbit
+        mean_anomaly (np.array): The mean anomaly, reduced into [-pi, pi) (in Radians)
+        return_sin_cos (bool): If True, also return the sine and cosine of the eccentric anomaly.
+            These come from those of the starter, rotated by the (small) correction, which saves evaluating them again
+    Returns:
+        np.array: The eccentric anomaly (in Radians)
+        np.array: (Optional) The sine of the eccentric anomaly
+        np.array: (Optional) The cosine of the eccentric anomaly
+    """
+    pi_squared = math.pi ** 2
+
+    # cubic starter
+    # (powers are written out as products, which are much faster than `**` for arrays)
+    alpha = (3 * pi_squared + 1.6 * math.pi * (math.pi - np.abs(mean_anomaly)) / (1 + eccentricity)) / (pi_squared - 6)
+    d = 3 * (1 - eccentricity) + alpha * eccentricity
+    mean_anomaly_squared = mean_anomaly * mean_anomaly
+    q = 2 * alpha * d * (1 - eccentricity) - mean_anomaly_squared
+    r = 3 * alpha * d * (d - 1 + eccentricity) * mean_anomaly + mean_anomaly_squared * mean_anomaly
+    w = np.cbrt(np.abs(r) + np.sqrt(q * q * q + r * r))
+    w = w * w
+    E = (2 * r * w / (w * w + w * q + q * q) + mean_anomaly) / d
+
+    # single fifth order correction
+    sin_E = np.sin(E)
+    cos_E = np.cos(E)
+    f2 = eccentricity * sin_E
+    f3 = eccentricity * cos_E
+    f0 = E - f2 - mean_anomaly
+    f1 = 1 - f3
+    d3 = -f0 / (f1 - 0.5 * f0 * f2 / f1)
+    d4 = -f0 / (f1 + 0.5 * d3 * f2 + d3 * d3 * f3 / 6)
+    d5 = -f0 / (f1 + 0.5 * d4 * f2 + d4 * d4 * f3 / 6 - d4 * d4 * d4 * f2 / 24)
+    if not return_sin_cos:
+        return E + d5
+
+    # the correction is below 1e-3, so a short series for its sine and cosine is exact to double precision
+    d5_squared = d5 * d5
+    cos_d5 = 1 - d5_squared / 2 + d5_squared * d5_squared / 24
+    sin_d5 = d5 * (1 - d5_squared / 6)
+    return E + d5, sin_E * cos_d5 + cos_E * sin_d5, cos_E * cos_d5 - sin_E * sin_d5
+
+
+def _solve_scalar(eccentricity, mean_anomaly, method, tol, max_iter, return_iterations):
+    """
+    Scalar version of `solve`, avoiding the overhead of masking single element arrays.
+    """
+    reduced = (mean_anomaly + math.pi) % (2 * math.pi) - math.pi
+
+    iterations = 0
+    if method is EKeplerSolver.MARKLEY:
+        E = _markley(eccentricity, reduced)
+    else:
+        step = _STEPS[method]
+        E = reduced + math.copysign(0.85 * eccentricity, reduced) if reduced else reduced
+        for _ in range(max_iter):
+            f, E = step(eccentricity, reduced, E, sin=math.sin, cos=math.cos)
+            iterations += 1
+            if abs(f) < tol:
+                break
+
+    E = float(E + (mean_anomaly - reduced))
+    if return_iterations:
+        return E, iterations
+    return E
+
+
+def solve(
+        eccentricity,
+        mean_anomaly,
+        method: EKeplerSolver = None,
+        tol: float = DEFAULT_TOLERANCE,
+        max_iter: int = DEFAULT_MAX_ITERATIONS,
+        return_iterations: bool = False
+):
+    """
+    Solves Kepler's equation for the eccentric anomaly.
+    Iterative methods stop per element once the residual of Kepler's equation is within tolerance,
+    and never take more than `max_iter` iterations.
+
+    Args:
+        eccentricity (float|np.array): The eccentricity of the orbit(s), must be in [0, 1)
+        mean_anomaly (float|np.array): The mean anomaly of the orbit(s) (in Radians)
+        method (EKeplerSolver): The solver to use, defaults to `DEFAULT_SOLVER`
+        tol (float): Tolerance on the residual of Kepler's equation (ignored by `MARKLEY`)
+        max_iter (int): The maximum number of iterations for any element (ignored by `MARKLEY`)
+        return_iterations (bool): If True, also return the number of iterations taken by each element
+
+    Returns:
+        float|np.array: The eccentric anomaly (in Radians)
+        np.array: (Optional) The number of iterations taken by each element
+    """
+    method = method or DEFAULT_SOLVER
+    if np.ndim(eccentricity) == 0 and np.ndim(mean_anomaly) == 0:
+        return _solve_scalar(float(eccentricity), float(mean_anomaly), method, tol, max_iter, return_iterations)
+
+    eccentricity, mean_anomaly = np.broadcast_arrays(
+        np.asarray(eccentricity, dtype=np.float64),
+        np.asarray(mean_anomaly, dtype=np.float64)
+    )
+    shape = mean_anomaly.shape
+    eccentricity = eccentricity.ravel()
+    mean_anomaly = mean_anomaly.ravel()
+
+    # range reduction, keeping the whole revolutions to add back on afterwards
+    reduced = np.remainder(mean_anomaly + math.pi, 2 * math.pi) - math.pi
+    revolutions = mean_anomaly - reduced
+
+    iterations = np.zeros(reduced.shape, dtype=np.int32)
+    if method is EKeplerSolver.MARKLEY:
+        E = _markley(eccentricity, reduced)
+    else:
+        step = _STEPS[method]
+        E = _starter(eccentricity, reduced)
+
+        # indices of the elements which are still iterating
+        active = np.arange(E.size)
+        for _ in range(max_iter):
+            f, E[active] = step(eccentricity[active], reduced[active], E[active])
+            iterations[active] += 1
+
+            # the step is still applied to elements once they converge, it only refines them further
+            active = active[np.abs(f) >= tol]
+            if not active.size:
+                break
+
+    E = (E + revolutions).reshape(shape)
+    if return_iterations:
+        return E, iterations.reshape(shape)
+    return E
+
+
+class KeplerTable(object):
+    def __init__(self, eccentricity: float, max_error: float = 1e-6, max_bytes: int = 1_000_000):
+        """
+        Lookup table of the eccentric anomaly as a function of mean anomaly over [-pi, pi), for one fixed eccentricity.
+        Stored as a cubic Hermite spline (E and dE/ds at evenly spaced nodes), built once and then evaluated
+        with a table lookup plus a single Newton polishing step.
+
+        The nodes are evenly spaced in s = cbrt(M / pi) rather than in M, which packs them around periapsis.
+        Near M = 0 the eccentric anomaly behaves like the cube root of M as the eccentricity approaches 1,
+        so it is smooth in s where it is far too steep to interpolate in M.
+
+        The node count is doubled until the interpolation error is within `max_error`.
+
+        Args:
+            eccentricity (float): The eccentricity of the orbit
+            max_error (float): The maximum interpolation error of the table, before polishing (in Radians)
+            max_bytes (int): The memory budget of the table (in bytes)
+        Raises:
+            AttributeError: If the table can't meet `max_error` within `max_bytes`
+        """
+        self.eccentricity = eccentricity
+        self.max_error = max_error
+        self.max_bytes = max_bytes
+
+        nodes = 64
+        self._build(nodes)
+        while self.error > max_error and self._nbytes(nodes * 2) <= max_bytes:
+            nodes *= 2
+            self._build(nodes)
+
+        if self.error > max_error:
+            raise AttributeError(
+                f"Kepler table for eccentricity {eccentricity} can't reach an error of {max_error} within "
+                f"{max_bytes} bytes (reached {self.error:.3g} with {self.nbytes} bytes)."
+            )
+
+    @staticmethod
+    def _nbytes(nodes):
+        # E and dE/ds per node, both float64
+        return 2 * 8 * (nodes + 1)
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+            int: The memory used by the table (in bytes)
+        """
+        return self.eccentric_anomalies.nbytes + self.derivatives.nbytes
+
+    def _build(self, nodes):
+        """
+        Builds the table with a given number of intervals, and measures its interpolation error.
+
+        Args:
+            nodes (int): The number of intervals over s in [-1, 1]
+        """
+        self.step = 2 / nodes
+        s = np.arange(nodes + 1) * self.step - 1
+        mean_anomalies = math.pi * s ** 3
+        self.eccentric_anomalies = solve(self.eccentricity, mean_anomalies, tol=1e-15)
+        # dE/ds = dE/dM * dM/ds
+        self.derivatives = 3 * math.pi * s ** 2 / (1 - self.eccentricity * np.cos(self.eccentric_anomalies))
+
+        # the error of a cubic Hermite spline peaks inside each interval, so sample a few points per interval
+        samples = math.pi * ((s[:-1, None] + self.step * np.array([0.25, 0.5, 0.75])).ravel()) ** 3
+        exact = solve(self.eccentricity, samples, tol=1e-15)
+        self.error = float(np.abs(self._interpolate(samples) - exact).max())
+
+    def _interpolate(self, mean_anomaly):
+        """
+        Args:
+            mean_anomaly (float|np.array): The mean anomaly, reduced into [-pi, pi) (in Radians)
+        Returns:
+            float|np.array: The interpolated eccentric anomaly (in Radians)
+        """
+        if np.ndim(mean_anomaly) == 0:
+            x = (math.copysign(abs(mean_anomaly / math.pi) ** (1 / 3), mean_anomaly) + 1) / self.step
+            index = min(int(x), len(self.eccentric_anomalies) - 2)
+        else:
+            x = (np.cbrt(mean_anomaly / math.pi) + 1) / self.step
+            index = np.minimum(x.astype(np.intp), len(self.eccentric_anomalies) - 2)
+        t = x - index
+        t2 = t * t
+        t3 = t2 * t
+
+        # cubic Hermite basis functions
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+        return (
+            h00 * self.eccentric_anomalies[index] +
+            h10 * self.step * self.derivatives[index] +
+            h01 * self.eccentric_anomalies[index + 1] +
+            h11 * self.step * self.derivatives[index + 1]
+        )
+
+    def solve(self, mean_anomaly, polish: bool = True):
+        """
+        Looks up the eccentric anomaly for the given mean anomalies.
+
+        Args:
+            mean_anomaly (float|np.array): The mean anomaly (in Radians)
+            polish (bool): If True, apply one Newton step to the looked up value,
+                which roughly squares the (already small) table error
+        Returns:
+            float|np.array: The eccentric anomaly (in Radians)
+        """
+        if np.ndim(mean_anomaly) == 0:
+            # scalar input, avoid the overhead of numpy on single values
+            mean_anomaly = float(mean_anomaly)
+            reduced = (mean_anomaly + math.pi) % (2 * math.pi) - math.pi
+            E = float(self._interpolate(reduced))
+            if polish:
+                E = _newton_step(self.eccentricity, reduced, E, sin=math.sin, cos=math.cos)[1]
+            return E + (mean_anomaly - reduced)
+
+        mean_anomaly = np.asarray(mean_anomaly, dtype=np.float64)
+        reduced = np.remainder(mean_anomaly + math.pi, 2 * math.pi) - math.pi
+        E = self._interpolate(reduced)
+        if polish:
+            E = _newton_step(self.eccentricity, reduced, E)[1]
+        return E + (mean_anomaly - reduced)
@@ -0,0 +1,146 @@
+"""
+Batch conversion between state vectors and orbital elements
+
+State Vectors:
+    The position and velocity of a body relative to the body it orbits, in Cartesian coordinates.
+    Along with the gravitational parameter (mu) of the attracting body they fully define the orbit,
+    as do the six classical orbital elements plus mu.
+
+All functions work on whole arrays of states at once, for any gravitational parameter.
+
+Edge cases follow the usual conventions, so neither direction produces NaNs for any orbit with an orbital plane:
+    Equatorial orbits have no ascending node, so the longitude of the ascending node is 0
+    (the node line is taken along the x axis).
+    Circular orbits have no periapsis, so the argument of periapsis is 0
+    (the periapsis is taken at the ascending node) and the true anomaly is measured from the node instead.
+Radial states (moving straight towards or away from the attracting body, or at rest) have no orbital momentum,
+so no orbital plane. They aren't supported: their semi-major axis and eccentricity (of 1) are still given,
+but their inclination, longitude of the ascending node, argument of periapsis and true anomaly are NaN.
+"""
+import numpy as np
+
+import celestial_sandbox.orbit
+
+
+# Eccentricities and (sines of) inclinations below this are treated as exactly circular or equatorial,
+# and states with an orbital momentum below this fraction of |r||v| as radial
+EDGE_CASE_TOLERANCE = 1e-11
+
+
+def _dot(a, b):
+    return np.einsum("...i,...i->...", a, b)
+
+
+def elements_from_state_vectors(positions, velocities, gravitational_parameter):
+    """
+    Calculates the orbital elements of a batch of state vectors.
+
+    Args:
+        positions (np.array): The (N, 3) positions relative to the attracting body (in kilometers)
+        velocities (np.array): The (N, 3) velocities relative to the attracting body (in km/s)
+        gravitational_parameter (float|np.array): The gravitational parameter of the attracting body (in km^3/s^2)
+    Returns:
+        tuple: The (N,) arrays of semi-major axis (in kilometers, negative for hyperbolic orbits),
+            eccentricity, inclination, longitude of the ascending node, argument of periapsis
+            and true anomaly (all in radians). The angles are NaN for radial states
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    velocities = np.asarray(velocities, dtype=np.float64)
+    mu = np.asarray(gravitational_parameter, dtype=np.float64)
+
+    r = np.linalg.norm(positions, axis=-1)
+    v_squared = _dot(velocities, velocities)
+
+    # orbital momentum vector, normal to the orbital plane
+    h = np.cross(positions, velocities)
+    h_magnitude = np.linalg.norm(h, axis=-1)
+
+    # radial states have no orbital plane, their angles are filled with NaN at the end
+    radial = h_magnitude <= EDGE_CASE_TOLERANCE * r * np.sqrt(v_squared)
+    h_unit = h / np.where(radial, 1.0, h_magnitude)[..., None]
+
+    # eccentricity vector, pointing at the periapsis
+    e_vector = (
+        (v_squared - mu / r)[..., None] * positions - _dot(positions, velocities)[..., None] * velocities
+    ) / mu[..., None]
+    eccentricity = np.linalg.norm(e_vector, axis=-1)
+
+    # vis-viva, infinite for parabolic orbits
+    with np.errstate(divide="ignore"):
+        semi_major_axis = 1.0 / (2.0 / r - v_squared / mu)
+
+    # node vector, z cross h
+    node = np.stack((-h[..., 1], h[..., 0], np.zeros_like(r)), axis=-1)
+    node_magnitude = np.linalg.norm(node, axis=-1)
+
+    inclination = np.arctan2(node_magnitude, h[..., 2])
+
+    # equatorial orbits take the x axis as the node line
+    equatorial = node_magnitude <= EDGE_CASE_TOLERANCE * h_magnitude
+    node_unit = np.where(
+        equatorial[..., None], np.array([1.0, 0.0, 0.0]), node / np.where(equatorial, 1.0, node_magnitude)[..., None]
+    )
+    longitude_of_ascending_node = np.where(equatorial, 0.0, np.arctan2(node[..., 1], node[..., 0]))
+
+    # circular orbits take the node as the periapsis
+    circular = eccentricity <= EDGE_CASE_TOLERANCE
+    periapsis_unit = np.where(
+        circular[..., None], node_unit, e_vector / np.where(circular, 1.0, eccentricity)[..., None]
+    )
+
+    # angles within the orbital plane, measured in the direction of motion
+    argument_of_periapsis = np.arctan2(
+        _dot(np.cross(node_unit, periapsis_unit), h_unit), _dot(node_unit, periapsis_unit)
+    )
+    true_anomaly = np.arctan2(_dot(np.cross(periapsis_unit, positions), h_unit), _dot(periapsis_unit, positions))
+
+    two_pi = 2 * np.pi
+    return (
+        semi_major_axis,
+        np.where(circular, 0.0, eccentricity),
+        np.where(radial, np.nan, inclination),
+        np.where(radial, np.nan, np.mod(longitude_of_ascending_node, two_pi)),
+        np.where(radial, np.nan, np.where(circular, 0.0, np.mod(argument_of_periapsis, two_pi))),
+        np.where(radial, np.nan, np.mod(true_anomaly, two_pi)),
+    )
+
+
+def state_vectors_from_elements(
+        semi_major_axis,
+        eccentricity,
+        inclination,
+        longitude_of_ascending_node,
+        argument_of_periapsis,
+        true_anomaly,
+        gravitational_parameter
+):
+    """
+    Calculates the state vectors of a batch of orbital elements.
+    Parabolic orbits (an eccentricity of exactly 1) can't be described by their semi-major axis, so aren't supported.
+
+    Args:
+        semi_major_axis (np.array): The semi-major axes (in kilometers, negative for hyperbolic orbits)
+        eccentricity (np.array): The eccentricities
+        inclination (np.array): The inclinations (in radians)
+        longitude_of_ascending_node (np.array): The longitudes of the ascending node (in radians)
+        argument_of_periapsis (np.array): The arguments of periapsis (in radians)
+        true_anomaly (np.array): The true anomalies (in radians)
+        gravitational_parameter (float|np.array): The gravitational parameter of the attracting body (in km^3/s^2)
+    Returns:
+        tuple: The (N, 3) positions (in kilometers) and (N, 3) velocities (in km/s)
+    """
+    eccentricity = np.asarray(eccentricity, dtype=np.float64)
+    semi_latus_rectum = np.asarray(semi_major_axis, dtype=np.float64) * (1.0 - eccentricity ** 2)
+
+    cos_v = np.cos(true_anomaly)
+    sin_v = np.sin(true_anomaly)
+    r = semi_latus_rectum / (1.0 + eccentricity * cos_v)
+    speed = np.sqrt(gravitational_parameter / semi_latus_rectum)
+
+    positions = celestial_sandbox.orbit.rotate_from_orbital_plane(
+        r * cos_v, r * sin_v, inclination, longitude_of_ascending_node, argument_of_periapsis
+    )
+    velocities = celestial_sandbox.orbit.rotate_from_orbital_plane(
+        -speed * sin_v, speed * (eccentricity + cos_v), inclination, longitude_of_ascending_node, argument_of_periapsis
+    )
+    return positions, velocities
@@ -7,6 +7,10 @@ True Anomaly:
 """
 import math
 
+import numpy as np
+
+import celestial_sandbox.orbital_elements.kepler
+
 
 def true_anomaly_from_mean_anomaly(eccentricity: float, mean_anomaly: float) -> float:
     """
@@ -19,11 +23,8 @@ def true_anomaly_from_mean_anomaly(eccentricity: float, mean_anomaly: float) ->
     Returns:
         float: The true anomaly of the orbit (in radians).
     """
-    # Uses an iterative method to solve Kepler's equation for eccentric anomaly
-    # Start with initial guess equal to mean anomaly
-    eccentric_anomaly = mean_anomaly
-    for _ in range(10):  # usually converges in 5-6 iterations, 10 should be more than sufficient
-        eccentric_anomaly = mean_anomaly + eccentricity * math.sin(eccentric_anomaly)
+    # Solve Kepler's equation for eccentric anomaly
+    eccentric_anomaly = celestial_sandbox.orbital_elements.kepler.solve(eccentricity, mean_anomaly)
 
     # Convert eccentric anomaly to true anomaly
     true_anomaly = 2 * math.atan2(
@@ -37,21 +38,22 @@ def true_anomaly_from_mean_anomaly(eccentricity: float, mean_anomaly: float) ->
 def mean_anomaly_from_true_anomaly(eccentricity: float, true_anomaly: float) -> float:
     """
     Calculates the mean anomaly from the true anomaly and eccentricity.
+    Works on scalars or NumPy arrays (eccentricity is broadcast against true anomaly).
 
     Args:
-        eccentricity (float): The eccentricity of the orbit.
-        true_anomaly (float): The true anomaly of the orbit (in radians).
+        eccentricity (float|np.array): The eccentricity of the orbit.
+        true_anomaly (float|np.array): The true anomaly of the orbit (in radians).
 
     Returns:
-        float: The mean anomaly of the orbit (in radians).
+        float|np.array: The mean anomaly of the orbit (in radians).
     """
     # Convert true anomaly to eccentric anomaly
-    eccentric_anomaly = 2 * math.atan2(
-        math.sqrt(1-eccentricity) * math.sin(true_anomaly / 2),
-        math.sqrt(1+eccentricity) * math.cos(true_anomaly / 2)
+    eccentric_anomaly = 2 * np.arctan2(
+        np.sqrt(1-eccentricity) * np.sin(true_anomaly / 2),
+        np.sqrt(1+eccentricity) * np.cos(true_anomaly / 2)
     )
 
     # Calculate mean anomaly from eccentric anomaly
-    mean_anomaly = eccentric_anomaly - eccentricity * math.sin(eccentric_anomaly)
+    mean_anomaly = eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly)
 
     return mean_anomaly
@@ -0,0 +1,325 @@
+"""
+Barnes-Hut gravity
+
+Approximates the acceleration from distant groups of bodies by the acceleration from their centre of mass,
+reducing the cost of a force evaluation from O(N^2) to around O(N log N).
+
+The octree is stored as flat arrays rather than node objects. Bodies are sorted along a Morton (Z-order) curve,
+so every node covers a contiguous range of the sorted bodies, and the children of a node are contiguous nodes.
+Both building and walking the tree are vectorized across bodies.
+"""
+import numpy as np
+
+
+def _spread_bits(values):
+    """
+    Spreads the low 21 bits of each value out so there are two zero bits between each of them.
+
+    Args:
+        values (np.array): The uint64 values to spread
+    Returns:
+        np.array: The spread values
+    """
+    values = values & np.uint64(0x1FFFFF)
+    values = (values | (values << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    values = (values | (values << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return values
+
+
+def morton_keys(positions, depth):
+    """
+    Gets the Morton key of each position within the bounding cube of all of them.
+    When every position is the same point (or there is only one) the cube has no size, and every key is 0.
+
+    Args:
+        positions (np.array): The (N, 3) positions
+        depth (int): The number of bits per axis (at most 21)
+    Returns:
+        np.array: The uint64 Morton keys
+    """
+    if not len(positions):
+        return np.zeros(0, dtype=np.uint64)
+    low = positions.min(axis=0)
+    extent = float((positions.max(axis=0) - low).max())
+    if not extent > 0:
+        return np.zeros(len(positions), dtype=np.uint64)
+    cells = (1 << depth) - 1
+    # dividing by the extent first keeps tiny (even subnormal) extents from overflowing
+    grid = np.minimum(((positions - low) / extent * cells).astype(np.uint64), np.uint64(cells))
+    return (
+        (_spread_bits(grid[:, 0]) << np.uint64(2)) |
+        (_spread_bits(grid[:, 1]) << np.uint64(1)) |
+        _spread_bits(grid[:, 2])
+    )
+
+
+class Octree(object):
+    def __init__(self, positions, masses, leaf_size=8, max_depth=16):
+        """
+        Builds an octree over a set of bodies.
+
+        Args:
+            positions (np.array): The (N, 3) positions of the bodies
+            masses (np.array): The (N,) masses of the bodies
+            leaf_size (int): Nodes with at most this many bodies are not split any further
+            max_depth (int): The maximum depth of the tree (at most 21)
+        """
+        keys = morton_keys(positions, max_depth)
+
+        # The order of the bodies along the Morton curve, all node ranges index into this order
+        self.order = np.argsort(keys, kind="stable")
+        keys = keys[self.order]
+        self.masses = masses[self.order]
+
+        starts, counts, child_first, child_count = [], [], [], []
+        node_offset = 0
+
+        # bodies belonging to nodes which are split further, level by level
+        alive = np.arange(len(keys))
+        for level in range(max_depth + 1):
+            prefix = keys[alive] >> np.uint64(3 * (max_depth - level))
+            first = np.r_[0, np.flatnonzero(prefix[1:] != prefix[:-1]) + 1]
+            level_starts = alive[first]
+            level_counts = np.diff(np.r_[first, len(alive)])
+
+            # link the nodes of the level above to their (contiguous) children
+            if level:
+                parent_starts, parent_counts = starts[-1], counts[-1]
+                split = child_count[-1] != 0
+                lower = np.searchsorted(level_starts, parent_starts[split])
+                upper = np.searchsorted(level_starts, parent_starts[split] + parent_counts[split])
+                child_first[-1][split] = node_offset + lower
+                child_count[-1][split] = upper - lower
+
+            node_offset += len(level_starts)
+            starts.append(level_starts)
+            counts.append(level_counts)
+            child_first.append(np.zeros(len(level_starts), dtype=np.intp))
+
+            # nodes still to be split are marked with a placeholder child count, filled in on the next level
+            leaf = (level_counts <= leaf_size) | (level == max_depth)
+            child_count.append(np.where(leaf, 0, -1).astype(np.intp))
+            if leaf.all():
+                break
+            alive = _ranges(level_starts[~leaf], level_counts[~leaf])
+
+        # Flat node arrays, indexed by node
+        self.start = np.concatenate(starts)
+        self.count = np.concatenate(counts)
+        self.child_first = np.concatenate(child_first)
+        self.child_count = np.concatenate(child_count)
+
+        self.refit(positions)
+
+    def __len__(self):
+        return len(self.start)
+
+    def refit(self, positions):
+        """
+        Updates the centre of mass and size of every node for new body positions, keeping the tree's structure.
+        Cheaper than rebuilding, and stays accurate while the bodies haven't moved far.
+
+        Args:
+            positions (np.array): The (N, 3) positions of the bodies, in their original order
+        """
+        self.positions = positions[self.order]
+        end = self.start + self.count
+
+        # sums over each node's range of bodies, from cumulative sums
+        def node_sums(values):
+            cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+            return cumulative[end] - cumulative[self.start]
+
+        self.mass = node_sums(self.masses)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.centre_of_mass = node_sums(self.positions * self.masses[:, None]) / self.mass[:, None]
+        massless = self.mass == 0.0
+        self.centre_of_mass[massless] = self.positions[self.start[massless]]
+
+        # bounding box of the bodies in each node, its size taken as the largest side
+        lower = np.empty((len(self), 3))
+        upper = np.empty((len(self), 3))
+        bounds = np.empty(2 * len(self), dtype=np.intp)
+        bounds[0::2] = self.start
+        bounds[1::2] = end
+        padded = np.concatenate([self.positions, self.positions[-1:]])
+        # reduceat needs increasing indices, which holds within a level (nodes are disjoint and sorted)
+        level_breaks = np.r_[0, np.flatnonzero(self.start[1:] <= self.start[:-1]) + 1, len(self)]
+        for first, last in zip(level_breaks[:-1], level_breaks[1:]):
+            indices = bounds[2 * first:2 * last]
+            lower[first:last] = np.minimum.reduceat(padded, indices, axis=0)[0::2]
+            upper[first:last] = np.maximum.reduceat(padded, indices, axis=0)[0::2]
+        self.lower = lower
+        self.upper = upper
+        self.size = (upper - lower).max(axis=1)
+
+        # how far the centre of mass sits from the middle of the box, widening the opening criterion for lopsided nodes
+        self.offset = np.linalg.norm(self.centre_of_mass - 0.5 * (lower + upper), axis=1)
+
+    def accelerations(self, gravitational_constant, softening=0.0, theta=0.5, chunk_size=256):
+        """
+        Walks the tree once per leaf rather than once per body, since bodies sharing a leaf open mostly the same nodes.
+        A node is accepted for a whole leaf when the closest point of the leaf's box satisfies the opening criterion
+        `distance > size / theta + offset`, otherwise it is opened. Pairs of leaves which can't be accepted
+        are summed body by body.
+
+        Args:
+            gravitational_constant (float): The gravitational constant (in km^3/(kg*s^2))
+            softening (float): Softening length (in kilometers)
+            theta (float): The opening angle, smaller is more accurate and slower (0 is direct summation)
+            chunk_size (int): The number of leaves to walk the tree for at once, bounding temporary memory
+        Returns:
+            np.array: The (N, 3) accelerations, in the original order of the bodies (in km/s^2)
+        """
+        count = len(self.positions)
+        softening_squared = softening ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            open_distance_squared = (self.size / theta + self.offset) ** 2
+        accelerations = np.zeros((3, count))
+
+        # one contiguous array per axis, which gathers far faster than rows of 3
+        body_axes = np.ascontiguousarray(self.positions.T)
+        node_axes = np.ascontiguousarray(self.centre_of_mass.T)
+
+        def accumulate(bodies, sources, source_axes, source_masses):
+            differences = [axis[sources] - body_axis[bodies] for axis, body_axis in zip(source_axes, body_axes)]
+            distance_squared = differences[0] * differences[0]
+            distance_squared += differences[1] * differences[1]
+            distance_squared += differences[2] * differences[2]
+            distance_squared += softening_squared
+            with np.errstate(divide="ignore"):
+                weights = source_masses[sources] / (distance_squared * np.sqrt(distance_squared))
+            weights[distance_squared == 0.0] = 0.0
+            for axis, difference in enumerate(differences):
+                accelerations[axis] += np.bincount(bodies, weights * difference, minlength=count)
+
+        leaves = np.flatnonzero(self.child_count == 0)
+        for first in range(0, len(leaves), chunk_size):
+            targets = leaves[first:first + chunk_size]
+            nodes = np.zeros(len(targets), dtype=np.intp)
+            while len(targets):
+                # distance from each node's centre of mass to the nearest point of the target leaf's box
+                centre_of_mass = self.centre_of_mass[nodes]
+                gap = centre_of_mass - np.clip(centre_of_mass, self.lower[targets], self.upper[targets])
+                distance_squared = np.einsum("ij,ij->i", gap, gap)
+
+                # never accept a node containing the target itself
+                start = self.start[targets]
+                inside = (start >= self.start[nodes]) & (start < self.start[nodes] + self.count[nodes])
+                accept = ~inside & (distance_squared > open_distance_squared[nodes])
+                sources, bodies = _expand(nodes[accept], start[accept], self.count[targets[accept]])
+                accumulate(bodies, sources, node_axes, self.mass)
+
+                opened = ~accept
+                targets, nodes = targets[opened], nodes[opened]
+                leaf = self.child_count[nodes] == 0
+
+                # leaf against leaf, summed body by body (a body contributes nothing to itself)
+                bodies, sources = _pairs(
+                    self.start[targets[leaf]], self.count[targets[leaf]],
+                    self.start[nodes[leaf]], self.count[nodes[leaf]]
+                )
+                accumulate(bodies, sources, body_axes, self.masses)
+
+                # internal nodes are replaced by their children
+                targets, nodes = _expand(
+                    targets[~leaf], self.child_first[nodes[~leaf]], self.child_count[nodes[~leaf]]
+                )
+
+        accelerations *= gravitational_constant
+        result = np.empty((count, 3))
+        result[self.order] = accelerations.T
+        return result
+
+
+def _ranges(starts, counts):
+    """
+    Args:
+        starts (np.array): The start of each range
+        counts (np.array): The length of each range
+    Returns:
+        np.array: The concatenation of `arange(start, start + count)` for every range
+    """
+    offsets = np.repeat(starts - np.r_[0, np.cumsum(counts)[:-1]], counts)
+    return np.arange(counts.sum()) + offsets
+
+
+def _expand(bodies, starts, counts):
+    """
+    Pairs each value with every index in its range.
+
+    Args:
+        bodies (np.array): The values to pair
+        starts (np.array): The start of each value's range
+        counts (np.array): The length of each value's range
+    Returns:
+        tuple: The repeated values, and the index paired with each
+    """
+    return np.repeat(bodies, counts), _ranges(starts, counts)
+
+
+def _pairs(starts_a, counts_a, starts_b, counts_b):
+    """
+    Pairs every index in each range `a` with every index in the matching range `b`.
+
+    Args:
+        starts_a (np.array): The start of each range `a`
+        counts_a (np.array): The length of each range `a`
+        starts_b (np.array): The start of each range `b`
+        counts_b (np.array): The length of each range `b`
+    Returns:
+        tuple: The index from each range `a`, and the index from each range `b` paired with it
+    """
+    sizes = counts_a * counts_b
+    local = _ranges(np.zeros_like(sizes), sizes)
+    width = np.repeat(counts_b, sizes)
+    return np.repeat(starts_a, sizes) + local // width, np.repeat(starts_b, sizes) + local % width
+
+
+def barnes_hut_accelerations(positions, masses, gravitational_constant, softening=0.0, theta=0.5, leaf_size=8):
+    """
+    Acceleration engine using a freshly built Barnes-Hut octree.
+    Has the same signature as `gravity.direct_accelerations`, so can be used as an `NBodySystem` engine
+    (use `functools.partial` to change `theta`).
+
+    Args:
+        positions (np.array): The (N, 3) positions of the bodies (in kilometers)
+        masses (np.array): The (N,) masses of the bodies (in KG)
+        gravitational_constant (float): The gravitational constant (in km^3/(kg*s^2))
+        softening (float): Softening length (in kilometers)
+        theta (float): The opening angle
+        leaf_size (int): Nodes with at most this many bodies are not split any further
+    Returns:
+        np.array: The (N, 3) accelerations (in km/s^2)
+    """
+    tree = Octree(positions, masses, leaf_size=leaf_size)
+    return tree.accelerations(gravitational_constant, softening=softening, theta=theta)
+
+
+class BarnesHutGravity(object):
+    def __init__(self, theta=0.5, leaf_size=8, rebuild_every=1):
+        """
+        Acceleration engine which keeps its octree between steps, rebuilding it every `rebuild_every` calls
+        and only refitting it (updating centres of mass and sizes) in between.
+
+        Args:
+            theta (float): The opening angle
+            leaf_size (int): Nodes with at most this many bodies are not split any further
+            rebuild_every (int): The number of evaluations between full rebuilds of the tree
+        """
+        self.theta = theta
+        self.leaf_size = leaf_size
+        self.rebuild_every = rebuild_every
+        self.tree = None
+        self._evaluations = 0
+
+    def __call__(self, positions, masses, gravitational_constant, softening=0.0):
+        if self.tree is None or len(self.tree.masses) != len(masses) or self._evaluations % self.rebuild_every == 0:
+            self.tree = Octree(positions, masses, leaf_size=self.leaf_size)
+        else:
+            self.tree.refit(positions)
+        self._evaluations += 1
+        return self.tree.accelerations(gravitational_constant, softening=softening, theta=self.theta)
@@ -0,0 +1,116 @@
+"""
+Conservation diagnostics for comparing integrators
+
+The exact motion of an isolated system conserves its total energy and angular momentum,
+so how far an integrator lets them drift is a direct measure of its error.
+"""
+import time
+
+import numpy as np
+
+
+class IntegrationReport(object):
+    def __init__(self, name, times, energy_error, angular_momentum_error, force_evaluations, wall_time):
+        """
+        The conservation errors sampled over a run.
+
+        Args:
+            name (str): The name of the integrator
+            times (np.array): The simulation time of each sample (in seconds)
+            energy_error (np.array): The relative energy error |E - E0| / |E0| at each sample
+            angular_momentum_error (np.array): The relative angular momentum error |L - L0| / |L0| at each sample
+            force_evaluations (int): The number of acceleration evaluations the run needed
+            wall_time (float): The time the run took (in seconds)
+        """
+        self.name = name
+        self.times = times
+        self.energy_error = energy_error
+        self.angular_momentum_error = angular_momentum_error
+        self.force_evaluations = force_evaluations
+        self.wall_time = wall_time
+
+    @property
+    def max_energy_error(self):
+        return float(self.energy_error.max())
+
+    @property
+    def max_angular_momentum_error(self):
+        return float(self.angular_momentum_error.max())
+
+    def __repr__(self):
+        return (
+            f"{self.name}: max energy error {self.max_energy_error:.2e}, "
+            f"max angular momentum error {self.max_angular_momentum_error:.2e}, "
+            f"{self.force_evaluations} force evaluations, {self.wall_time:.3f} s"
+        )
+
+
+def integrate(system, duration, dt, integrator="leapfrog", samples=100, name=None):
+    """
+    Advances a system in fixed steps, sampling its conservation errors along the way.
+
+    Args:
+        system (NBodySystem): The system to advance (in place)
+        duration (float): The span of time to advance by (in seconds)
+        dt (float): The step size (in seconds)
+        integrator (str|Integrator): The integrator, or the name of one in `integrators.INTEGRATORS`
+        samples (int): The number of times to measure the errors
+        name (str): The name to report the integrator under, defaults to its class name
+    Returns:
+        IntegrationReport: The sampled errors
+    """
+    integrator = system.resolve_integrator(integrator)
+    name = name or type(integrator).__name__
+
+    energy = system.energy()
+    angular_momentum = system.angular_momentum()
+    angular_momentum_scale = np.linalg.norm(angular_momentum) or 1.0
+    force_evaluations = system.force_evaluations
+
+    steps = int(round(duration / dt))
+    # the step index at which each sample is taken
+    sample_steps = np.unique(np.linspace(0, steps, samples + 1).round().astype(int)[1:])
+    times = np.empty(len(sample_steps))
+    energy_error = np.empty(len(sample_steps))
+    angular_momentum_error = np.empty(len(sample_steps))
+
+    start = time.perf_counter()
+    step = 0
+    for i, sample_step in enumerate(sample_steps):
+        for _ in range(sample_step - step):
+            integrator.step(system, dt)
+        step = sample_step
+
+        times[i] = system.time
+        energy_error[i] = abs(system.energy() - energy) / abs(energy)
+        angular_momentum_error[i] = np.linalg.norm(system.angular_momentum() - angular_momentum) / angular_momentum_scale
+    wall_time = time.perf_counter() - start
+
+    # the energy measurements themselves aren't counted as force evaluations
+    return IntegrationReport(
+        name, times, energy_error, angular_momentum_error, system.force_evaluations - force_evaluations, wall_time
+    )
+
+
+def cheapest_integrator(make_system, duration, candidates, energy_budget, samples=100):
+    """
+    Runs each candidate integrator on a fresh copy of a system, and picks the one needing the fewest
+    force evaluations whose energy error stays within a budget.
+
+    Args:
+        make_system (callable): Returns a new `NBodySystem` in its initial state
+        duration (float): The span of time to run each candidate for (in seconds)
+        candidates (dict): Maps a name to an `(integrator, dt)` tuple, the integrator a name or `Integrator`
+        energy_budget (float): The largest acceptable relative energy error
+        samples (int): The number of times to measure the errors per run
+    Returns:
+        tuple: The name of the cheapest integrator meeting the budget (or None if none do),
+            and the reports of every candidate
+    """
+    reports = {
+        name: integrate(make_system(), duration, dt, integrator, samples=samples, name=name)
+        for name, (integrator, dt) in candidates.items()
+    }
+    within_budget = [report for report in reports.values() if report.max_energy_error <= energy_budget]
+    cheapest = min(within_budget, key=lambda report: report.force_evaluations, default=None)
+    return (cheapest.name if cheapest else None), reports
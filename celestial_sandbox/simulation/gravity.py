@@ -0,0 +1,90 @@
+"""
+Gravitational acceleration engines
+
+An engine is a function taking `(positions, masses, gravitational_constant, softening)`
+and returning the (N, 3) acceleration of every body due to all of the others.
+"""
+import numpy as np
+
+
+def direct_accelerations(positions, masses, gravitational_constant, softening=0.0, max_pairs=1 << 21):
+    """
+    Calculates accelerations by direct summation over every pair of bodies.
+    Rows of bodies are processed in tiles so the temporary pairwise arrays never exceed `max_pairs` entries.
+
+    Args:
+        positions (np.array): The (N, 3) positions of the bodies (in kilometers)
+        masses (np.array): The (N,) masses of the bodies (in KG)
+        gravitational_constant (float): The gravitational constant (in km^3/(kg*s^2))
+        softening (float): Softening length, avoiding infinite accelerations in close encounters (in kilometers)
+        max_pairs (int): The maximum number of pairs to evaluate at once
+    Returns:
+        np.array: The (N, 3) accelerations (in km/s^2)
+    """
+    count = len(positions)
+    accelerations = np.empty((count, 3))
+    tile = max(1, max_pairs // max(count, 1))
+
+    # one contiguous array per axis, which vectorizes far better than a trailing axis of 3
+    x, y, z = np.ascontiguousarray(positions.T)
+
+    for first in range(0, count, tile):
+        rows = slice(first, first + tile)
+
+        # vectors from each body in the tile to every other body
+        dx = x[None, :] - x[rows, None]
+        dy = y[None, :] - y[rows, None]
+        dz = z[None, :] - z[rows, None]
+        distance_squared = dx * dx
+        distance_squared += dy * dy
+        distance_squared += dz * dz
+        if softening:
+            distance_squared += softening ** 2
+
+        # m/r^3, with no self interaction
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / (distance_squared * np.sqrt(distance_squared))
+        weights[distance_squared == 0.0] = 0.0
+        weights *= masses[None, :]
+
+        accelerations[rows, 0] = np.einsum("ij,ij->i", weights, dx)
+        accelerations[rows, 1] = np.einsum("ij,ij->i", weights, dy)
+        accelerations[rows, 2] = np.einsum("ij,ij->i", weights, dz)
+
+    accelerations *= gravitational_constant
+    return accelerations
+
+
+def potential_energy(positions, masses, gravitational_constant, softening=0.0, max_pairs=1 << 21):
+    """
+    Calculates the total gravitational potential energy by direct summation over every pair of bodies,
+    tiled in the same way as `direct_accelerations`.
+
+    Args:
+        positions (np.array): The (N, 3) positions of the bodies (in kilometers)
+        masses (np.array): The (N,) masses of the bodies (in KG)
+        gravitational_constant (float): The gravitational constant (in km^3/(kg*s^2))
+        softening (float): Softening length (in kilometers)
+        max_pairs (int): The maximum number of pairs to evaluate at once
+    Returns:
+        float: The potential energy (in kg*km^2/s^2)
+    """
+    count = len(positions)
+    tile = max(1, max_pairs // max(count, 1))
+    x, y, z = np.ascontiguousarray(positions.T)
+    energy = 0.0
+
+    for first in range(0, count, tile):
+        rows = slice(first, first + tile)
+        dx = x[None, :] - x[rows, None]
+        dy = y[None, :] - y[rows, None]
+        dz = z[None, :] - z[rows, None]
+        distance_squared = dx * dx + dy * dy + dz * dz + softening ** 2
+
+        # each pair counted once, from the body with the lower index
+        upper = np.arange(count)[None, :] > np.arange(first, min(first + tile, count))[:, None]
+        inverse_distance = np.zeros_like(distance_squared)
+        np.divide(1.0, np.sqrt(distance_squared), out=inverse_distance, where=upper)
+        energy -= masses[rows] @ inverse_distance @ masses
+
+    return energy * gravitational_constant
@@ -0,0 +1,289 @@
+"""
+Integrators for stepping an `NBodySystem` forward in time
+
+Every integrator shares the same interface, `step(system, dt)`, which advances the system's
+positions, velocities and time in place by one step of `dt` seconds.
+"""
+import numpy as np
+
+import celestial_sandbox.orbital_elements.kepler
+
+
+class Integrator(object):
+    def step(self, system, dt):
+        """
+        Advances the system by one step.
+
+        Args:
+            system (NBodySystem): The system to advance (in place)
+            dt (float): The step size (in seconds)
+        """
+        raise NotImplementedError
+
+
+class Euler(Integrator):
+    """
+    Explicit Euler, first order. Cheap, but drifts in energy - mainly useful as a reference.
+    """
+    def step(self, system, dt):
+        accelerations = system.accelerations()
+        system.positions += system.velocities * dt
+        system.velocities += accelerations * dt
+        system.time += dt
+
+
+class Leapfrog(Integrator):
+    """
+    Second order symplectic leapfrog, in drift-kick-drift form so each step only needs one force evaluation.
+    Energy errors stay bounded over long runs rather than drifting.
+    """
+    def step(self, system, dt):
+        system.positions += system.velocities * (0.5 * dt)
+        system.velocities += system.accelerations() * dt
+        system.positions += system.velocities * (0.5 * dt)
+        system.time += dt
+
+
+class VelocityVerlet(Integrator):
+    """
+    Second order symplectic velocity Verlet, in kick-drift-kick form.
+    The acceleration at the end of a step is kept for the start of the next, so each step needs one force evaluation.
+    """
+    def __init__(self):
+        self._accelerations = None
+        self._state = None
+
+    def step(self, system, dt):
+        # only reuse the last acceleration if the system hasn't been touched since
+        if self._state != (id(system), system.time) or self._accelerations is None:
+            self._accelerations = system.accelerations()
+        system.velocities += self._accelerations * (0.5 * dt)
+        system.positions += system.velocities * dt
+        self._accelerations = system.accelerations()
+        system.velocities += self._accelerations * (0.5 * dt)
+        system.time += dt
+        self._state = (id(system), system.time)
+
+
+class RK4(Integrator):
+    """
+    Classic fourth order Runge-Kutta. Accurate per step, but not symplectic.
+    """
+    def step(self, system, dt):
+        x0 = system.positions.copy()
+        v0 = system.velocities.copy()
+
+        a1 = system.accelerations()
+        k1x, k1v = v0, a1
+
+        system.positions[:] = x0 + k1x * (0.5 * dt)
+        k2x, k2v = v0 + k1v * (0.5 * dt), system.accelerations()
+
+        system.positions[:] = x0 + k2x * (0.5 * dt)
+        k3x, k3v = v0 + k2v * (0.5 * dt), system.accelerations()
+
+        system.positions[:] = x0 + k3x * dt
+        k4x, k4v = v0 + k3v * dt, system.accelerations()
+
+        system.positions[:] = x0 + (k1x + 2 * k2x + 2 * k3x + k4x) * (dt / 6)
+        system.velocities[:] = v0 + (k1v + 2 * k2v + 2 * k3v + k4v) * (dt / 6)
+        system.time += dt
+
+
+class DormandPrince(Integrator):
+    # Butcher tableau of the Dormand-Prince 5(4) pair
+    C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+    A = [
+        [],
+        [1 / 5],
+        [3 / 40, 9 / 40],
+        [44 / 45, -56 / 15, 32 / 9],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+        [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+    ]
+    # fifth order weights, and their difference from the embedded fourth order weights
+    B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+    E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+    def __init__(self, tolerance=1e-10, safety=0.9, max_substeps=100_000):
+        """
+        Adaptive fifth order Runge-Kutta with an embedded fourth order error estimate.
+        Each call to `step` advances exactly `dt`, split into as many substeps as the tolerance needs,
+        so quiet stretches are crossed in few substeps and close encounters get many.
+
+        Args:
+            tolerance (float): The allowed error per substep, relative to the size of the state
+            safety (float): Factor applied to the estimated optimal substep size
+            max_substeps (int): The maximum number of substeps per step before giving up
+        """
+        self.tolerance = tolerance
+        self.safety = safety
+        self.max_substeps = max_substeps
+
+        # The substep size the error estimate last asked for (in seconds), carried between steps
+        self.substep = None
+        # The number of substeps accepted and rejected so far
+        self.accepted = 0
+        self.rejected = 0
+
+    def _derivatives(self, system, positions, velocities):
+        system.positions[:] = positions
+        return velocities, system.accelerations()
+
+    def step(self, system, dt):
+        remaining = dt
+        substep = min(self.substep or dt, dt)
+        first_same_as_last = None
+
+        for _ in range(self.max_substeps):
+            h = min(substep, remaining)
+            x0 = system.positions.copy()
+            v0 = system.velocities.copy()
+
+            # the last stage of an accepted substep is the first stage of the next one
+            k = [first_same_as_last or self._derivatives(system, x0, v0)]
+            for weights in self.A[1:]:
+                x = x0 + h * sum(w * kx for w, (kx, _) in zip(weights, k) if w)
+                v = v0 + h * sum(w * kv for w, (_, kv) in zip(weights, k) if w)
+                k.append(self._derivatives(system, x, v))
+
+            # the seventh stage is evaluated at the fifth order solution
+            error_x = h * sum(e * kx for e, (kx, _) in zip(self.E, k) if e)
+            error_v = h * sum(e * kv for e, (_, kv) in zip(self.E, k) if e)
+            scale_x = self.tolerance * np.maximum(np.abs(x0), np.abs(x)) + self.tolerance
+            scale_v = self.tolerance * np.maximum(np.abs(v0), np.abs(v)) + self.tolerance
+            error = max(np.abs(error_x / scale_x).max(), np.abs(error_v / scale_v).max())
+
+            # grow or shrink the substep towards the size the error estimate asks for
+            factor = self.safety * error ** -0.2 if error > 0 else 5.0
+            if error <= 1.0:
+                system.velocities[:] = v
+                system.positions[:] = x
+                system.time += h
+                remaining -= h
+                self.accepted += 1
+                first_same_as_last = k[-1]
+                if h == substep:
+                    substep *= min(5.0, factor)
+                if remaining <= 1e-12 * dt:
+                    self.substep = substep
+                    return
+            else:
+                system.positions[:] = x0
+                substep = h * max(0.1, factor)
+                self.rejected += 1
+
+        raise AttributeError(f"Dormand-Prince step needed more than {self.max_substeps} substeps.")
+
+
+class WisdomHolman(Integrator):
+    def __init__(self, central_body=0):
+        """
+        Second order Wisdom-Holman mixed variable symplectic integrator, in democratic heliocentric coordinates.
+        The motion of each body around the central body is solved exactly with Kepler's equation (the drift),
+        and only the much smaller interactions between the other bodies are integrated (the kicks).
+        Energy errors are then set by the ratio of planet to star mass, so far larger steps can be taken than
+        with leapfrog - but every body other than the central body must stay on a bound orbit around it.
+
+        Args:
+            central_body (int): The index of the dominant body (i.e the star)
+        """
+        self.central_body = central_body
+
+    def _split(self, system):
+        """
+        Returns:
+            tuple: Mask of the bodies orbiting the central body, heliocentric positions and barycentric velocities
+        """
+        others = np.arange(len(system)) != self.central_body
+        centre = system.positions[self.central_body]
+        velocity_of_centre_of_mass = np.average(system.velocities, axis=0, weights=system.masses)
+        return (
+            others,
+            system.positions[others] - centre,
+            system.velocities[others] - velocity_of_centre_of_mass,
+            velocity_of_centre_of_mass,
+        )
+
+    def _kick(self, system, others, positions, velocities, dt):
+        """
+        Applies the accelerations between the bodies orbiting the central body, which ignore the central body.
+        """
+        accelerations = system.gravity(
+            positions, system.masses[others], system.gravitational_constant, system.softening
+        )
+        system.force_evaluations += 1
+        velocities += accelerations * dt
+
+    def _jump(self, system, others, positions, velocities, dt):
+        """
+        Moves every body by the momentum of the bodies orbiting the central body, divided by its mass.
+        """
+        momentum = np.einsum("i,ij->j", system.masses[others], velocities)
+        positions += momentum * (dt / system.masses[self.central_body])
+
+    def _drift(self, system, positions, velocities, dt):
+        """
+        Moves each body along its two body orbit around the central body, using f and g functions.
+        """
+        mu = system.gravitational_constant * system.masses[self.central_body]
+        r0 = np.linalg.norm(positions, axis=1)
+        radial_velocity = np.einsum("ij,ij->i", positions, velocities)
+        semi_major_axis = 1.0 / (2.0 / r0 - np.einsum("ij,ij->i", velocities, velocities) / mu)
+        if np.any(semi_major_axis <= 0.0):
+            raise AttributeError("Wisdom-Holman requires every body to be on a bound orbit around the central body.")
+
+        mean_motion = np.sqrt(mu / semi_major_axis ** 3)
+        e_cos_E0 = 1.0 - r0 / semi_major_axis
+        e_sin_E0 = radial_velocity / np.sqrt(mu * semi_major_axis)
+        eccentricity = np.hypot(e_cos_E0, e_sin_E0)
+        E0 = np.arctan2(e_sin_E0, e_cos_E0)
+
+        mean_anomaly = E0 - e_sin_E0 + mean_motion * dt
+        delta = celestial_sandbox.orbital_elements.kepler.solve(eccentricity, mean_anomaly) - E0
+        sin_delta = np.sin(delta)
+        one_minus_cos = 1.0 - np.cos(delta)
+
+        f = 1.0 - semi_major_axis / r0 * one_minus_cos
+        g = dt - (delta - sin_delta) / mean_motion
+        new_positions = f[:, None] * positions + g[:, None] * velocities
+
+        r = np.linalg.norm(new_positions, axis=1)
+        f_dot = -np.sqrt(mu * semi_major_axis) / (r * r0) * sin_delta
+        g_dot = 1.0 - semi_major_axis / r * one_minus_cos
+        velocities[:] = f_dot[:, None] * positions + g_dot[:, None] * velocities
+        positions[:] = new_positions
+
+    def step(self, system, dt):
+        others, positions, velocities, velocity_of_centre_of_mass = self._split(system)
+        centre_of_mass = np.average(system.positions, axis=0, weights=system.masses)
+
+        self._kick(system, others, positions, velocities, 0.5 * dt)
+        self._jump(system, others, positions, velocities, 0.5 * dt)
+        self._drift(system, positions, velocities, dt)
+        self._jump(system, others, positions, velocities, 0.5 * dt)
+        self._kick(system, others, positions, velocities, 0.5 * dt)
+
+        # back to the inertial frame, the centre of mass moving in a straight line
+        centre_of_mass += velocity_of_centre_of_mass * dt
+        masses = system.masses[others]
+        centre = centre_of_mass - np.einsum("i,ij->j", masses, positions) / system.masses.sum()
+        system.positions[others] = positions + centre
+        system.positions[self.central_body] = centre
+        system.velocities[others] = velocities + velocity_of_centre_of_mass
+        system.velocities[self.central_body] = (
+            velocity_of_centre_of_mass - np.einsum("i,ij->j", masses, velocities) / system.masses[self.central_body]
+        )
+        system.time += dt
+
+
+# Integrators which can be selected by name
+INTEGRATORS = {
+    "euler": Euler,
+    "leapfrog": Leapfrog,
+    "verlet": VelocityVerlet,
+    "rk4": RK4,
+    "dopri": DormandPrince,
+    "wisdom-holman": WisdomHolman,
+}
@@ -0,0 +1,143 @@
+import numpy as np
+
+import celestial_sandbox.constants
+import celestial_sandbox.simulation.gravity
+import celestial_sandbox.simulation.integrators
+
+
+class NBodySystem(object):
+    def __init__(
+            self,
+            positions,
+            velocities,
+            masses,
+            names=None,
+            softening=0.0,
+            gravity=celestial_sandbox.simulation.gravity.direct_accelerations,
+            gravitational_constant=celestial_sandbox.constants.GRAVITATIONAL_CONSTANT_KM
+    ):
+        """
+        A set of bodies moving under their mutual gravity.
+        State is held in contiguous arrays, so forces and steps are computed for every body at once.
+
+        Args:
+            positions (np.array): The (N, 3) positions of the bodies (in kilometers)
+            velocities (np.array): The (N, 3) velocities of the bodies (in km/s)
+            masses (np.array): The (N,) masses of the bodies (in KG)
+            names (list[str]): Optional names of the bodies
+            softening (float): Softening length, avoiding infinite accelerations in close encounters (in kilometers)
+            gravity (callable): The acceleration engine, see `celestial_sandbox.simulation.gravity`
+            gravitational_constant (float): The gravitational constant (in km^3/(kg*s^2))
+        """
+        self.positions = np.array(positions, dtype=np.float64, order="C")
+        self.velocities = np.array(velocities, dtype=np.float64, order="C")
+        self.masses = np.array(masses, dtype=np.float64)
+        self.names = names
+        self.softening = softening
+        self.gravity = gravity
+        self.gravitational_constant = gravitational_constant
+
+        # The time elapsed in the simulation (in seconds)
+        self.time = 0.0
+        # The number of times the acceleration engine has been run, the main cost of every integrator
+        self.force_evaluations = 0
+        # Integrators created from their names, kept so state carried between steps (i.e the accelerations
+        # `VelocityVerlet` reuses, or the substep `DormandPrince` adapts) survives across calls
+        self._integrators = {}
+
+        count = len(self.masses)
+        if self.positions.shape != (count, 3) or self.velocities.shape != (count, 3):
+            raise AttributeError(f"Positions and velocities must both be ({count}, 3) arrays.")
+
+    @classmethod
+    def from_bodies(cls, bodies, positions, velocities, **kwargs):
+        """
+        Builds a system from celestial bodies, taking the mass of each.
+
+        Args:
+            bodies (list[CelestialBody]): The bodies in the system
+            positions (np.array): The (N, 3) initial positions of the bodies (in kilometers)
+            velocities (np.array): The (N, 3) initial velocities of the bodies (in km/s)
+            kwargs: Passed on to `NBodySystem`
+        Returns:
+            NBodySystem: The new system
+        """
+        masses = np.fromiter((body.mass for body in bodies), dtype=np.float64, count=len(bodies))
+        return cls(positions, velocities, masses, **kwargs)
+
+    def __len__(self):
+        return len(self.masses)
+
+    def accelerations(self):
+        """
+        Returns:
+            np.array: The (N, 3) gravitational acceleration of every body (in km/s^2)
+        """
+        self.force_evaluations += 1
+        return self.gravity(self.positions, self.masses, self.gravitational_constant, self.softening)
+
+    def kinetic_energy(self):
+        """
+        Returns:
+            float: The total kinetic energy (in kg*km^2/s^2)
+        """
+        return 0.5 * float(np.einsum("i,ij,ij->", self.masses, self.velocities, self.velocities))
+
+    def potential_energy(self):
+        """
+        Returns:
+            float: The total gravitational potential energy, by direct summation (in kg*km^2/s^2)
+        """
+        return celestial_sandbox.simulation.gravity.potential_energy(
+            self.positions, self.masses, self.gravitational_constant, self.softening
+        )
+
+    def energy(self):
+        """
+        Returns:
+            float: The total energy (in kg*km^2/s^2), conserved by the exact motion
+        """
+        return self.kinetic_energy() + self.potential_energy()
+
+    def angular_momentum(self):
+        """
+        Returns:
+            np.array: The total angular momentum vector about the origin (in kg*km^2/s), conserved by the exact motion
+        """
+        return np.einsum("i,ij->j", self.masses, np.cross(self.positions, self.velocities))
+
+    def resolve_integrator(self, integrator):
+        """
+        Args:
+            integrator (str|Integrator): The integrator, or the name of one in `integrators.INTEGRATORS`
+        Returns:
+            Integrator: The integrator, the same instance each time for a given name
+        """
+        if not isinstance(integrator, str):
+            return integrator
+        if integrator not in self._integrators:
+            self._integrators[integrator] = celestial_sandbox.simulation.integrators.INTEGRATORS[integrator]()
+        return self._integrators[integrator]
+
+    def step(self, dt, integrator="leapfrog"):
+        """
+        Advances the system by one step.
+
+        Args:
+            dt (float): The step size (in seconds)
+            integrator (str|Integrator): The integrator, or the name of one in `integrators.INTEGRATORS`
+        """
+        self.resolve_integrator(integrator).step(self, dt)
+
+    def evolve(self, duration, dt, integrator="leapfrog"):
+        """
+        Advances the system by a span of time, in fixed steps.
+
+        Args:
+            duration (float): The span of time to advance by (in seconds)
+            dt (float): The step size (in seconds)
+            integrator (str|Integrator): The integrator, or the name of one in `integrators.INTEGRATORS`
+        """
+        integrator = self.resolve_integrator(integrator)
+        for _ in range(int(round(duration / dt))):
+            integrator.step(self, dt)
@@ -4,14 +4,32 @@ Kelvin to RGB: https://tannerhelland.com/2012/09/18/convert-temperature-rgb-algo
 Rayleigh Scattering: https://www.alanzucconi.com/2017/10/10/atmospheric-scattering-3/#:~:text=Most%20optical%20effects%20that%20planets%20exhibit%20can%20be,how%20light%20scatters%20on%20objects%20of%20different%20size.
     - Optical phenomenon that causes the sky to look a certain colour (Blue no Earth)
 """
+import math
+
+import celestial_sandbox.constants
+
+
+# The mass of the Sun, the Earth and the Moon (in KG)
+SOLAR_MASS = 1.98847e30
+EARTH_MASS = 5.97e24
+MOON_MASS = 7.342e22
 
 
 class CelestialBody(object):
+    # Bodies are held in the hundreds of thousands (i.e in scene graphs), so they use slots rather than
+    # an instance dict. Subclasses declare their own attributes in `__slots__` the same way
+    __slots__ = (
+        "rotation_period",
+        "_radius",
+        "_mass",
+        "_surface_gravity",
+    )
+
     def __init__(
             self,
             radius=6378,
             rotation_period=24,
-            surface_gravity=9.8,
+            surface_gravity=None,
             mass=5972000000000000327155712
     ):
         """
@@ -20,9 +38,13 @@ class CelestialBody(object):
         Args:
             radius (float): The radius of the celestial body (in kilometers)
             rotation_period (float): The time it takes the body to rotate 360 degrees (in hours)
-            surface_gravity (float): The surface gravity of the celestial body - measured in m/s^2
+            surface_gravity (float): The surface gravity of the celestial body - measured in m/s^2.
+                Derived from the mass and radius when not given
             mass (int): The mass of the celestial body (in KG)
         """
+        # The mass of the body (in KG)
+        self._mass = mass
+
         # Radius notes:
         # Sun: 696340 km
         # Earth: 6378.1 km
@@ -43,14 +65,92 @@ class CelestialBody(object):
         # Earth: 9.807 m/s^2
         self.surface_gravity = surface_gravity
 
+    # ------------------------------------------------------------------------
+    # Mass and radius
+    # Reassigning either invalidates any values subclasses cache from them
+
     @property
     def mass(self):
-        return self.mass
+        """
+        Returns:
+            float: The mass of the body (in KG)
+        """
+        return self._mass
+
+    @mass.setter
+    def mass(self, value):
+        self._mass = value
+        self._invalidate_cache()
+
+    @property
+    def radius(self):
+        """
+        Returns:
+            float: The radius of the body (in kilometers)
+        """
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = value
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        """
+        Called whenever the mass or radius is reassigned, subclasses override it to clear values they cache from them.
+        The values derived here are cheap enough to compute on every read, so nothing is cached.
+        """
+
+    # ------------------------------------------------------------------------
 
     @property
     def solar_masses(self):
-        return self.mass / 1.98847e30
+        """
+        Returns:
+            float: The mass of the body in solar masses
+        """
+        return self.mass / SOLAR_MASS
 
     @property
     def earth_masses(self):
-        return self.mass / 5.97e24
+        """
+        Returns:
+            float: The mass of the body in earth masses
+        """
+        return self.mass / EARTH_MASS
+
+    @property
+    def surface_gravity(self):
+        """
+        Gets the surface gravity, either as set or derived from the mass and radius (G * M / r^2).
+        Returns:
+            float: The surface gravity (in m/s^2)
+        """
+        if self._surface_gravity is not None:
+            return self._surface_gravity
+        radius = self.radius * 1e3
+        return celestial_sandbox.constants.GRAVITATIONAL_CONSTANT * self.mass / radius ** 2
+
+    @surface_gravity.setter
+    def surface_gravity(self, value):
+        """
+        Args:
+            value (float): The surface gravity (in m/s^2), None to derive it from the mass and radius
+        """
+        self._surface_gravity = value
+
+    @property
+    def escape_velocity(self):
+        """
+        Returns:
+            float: The speed needed to escape the body from its surface (in km/s)
+        """
+        return math.sqrt(2 * celestial_sandbox.constants.GRAVITATIONAL_CONSTANT_KM * self.mass / self.radius)
+
+    @property
+    def density(self):
+        """
+        Returns:
+            float: The mean density of the body (in kg/m^3)
+        """
+        return self.mass / (4 / 3 * math.pi * (self.radius * 1e3) ** 3)
@@ -1,15 +1,59 @@
 import celestial_sandbox.types.celestial_body
+from . import atmosphere
 
 
 class Planet(celestial_sandbox.types.celestial_body.CelestialBody):
-    def __init__(self, radius, atmospheric_pressure):
+    __slots__ = ("atmospheric_pressure", "scale_height")
+
+    def __init__(
+            self,
+            radius,
+            atmospheric_pressure,
+            scale_height=8.5,
+            mass=celestial_sandbox.types.celestial_body.EARTH_MASS,
+            surface_gravity=None
+    ):
         """
         Args:
             atmospheric_pressure (float): The pressure of the atmosphere at sea level - measured in Pascals
+            scale_height (float): The height over which the atmosphere's density falls by a factor of e (in kilometers)
+            mass (float): The mass of the planet (in KG), defaults to that of Earth
+            surface_gravity (float): The surface gravity of the planet - measured in m/s^2.
+                Derived from the mass and radius when not given
         """
-        super().__init__(radius, ...)
+        super().__init__(radius, surface_gravity=surface_gravity, mass=mass)
 
         # Atmospheric pressure on various planets:
         # Mars: 610 Pascals
         # Earth: 101,235 Pascals
         self.atmospheric_pressure = atmospheric_pressure
+
+        # Scale height on various planets:
+        # Mars: 11.1 km
+        # Earth: 8.5 km
+        self.scale_height = scale_height
+
+    @property
+    def atmosphere(self):
+        """
+        Gets the scattering tables of the planet's atmosphere.
+        These are cached per set of atmospheric parameters, so they are only rebuilt when the radius,
+        pressure or scale height change (and are shared between planets with the same ones).
+        Returns:
+            atmosphere.Atmosphere: The atmosphere
+        """
+        return atmosphere.get_atmosphere(self.radius, self.atmospheric_pressure, self.scale_height)
+
+    def sky_color(self, altitudes, view_zeniths, sun_zeniths, relative_azimuths=0.0):
+        """
+        Looks up the colour of the sky seen from the planet, see `atmosphere.Atmosphere.sky_color`.
+
+        Args:
+            altitudes (float|np.array): The altitude of the viewer (in kilometers)
+            view_zeniths (float|np.array): The angle of the view direction from straight up (in radians)
+            sun_zeniths (float|np.array): The angle of the sun from straight up (in radians)
+            relative_azimuths (float|np.array): The azimuth between the view direction and the sun (in radians)
+        Returns:
+            np.array: The linear RGB radiance of the sky per unit of sunlight, with a last axis of 3
+        """
+        return self.atmosphere.sky_color(altitudes, view_zeniths, sun_zeniths, relative_azimuths)
@@ -0,0 +1,375 @@
+"""
+Atmospheric scattering lookup tables
+
+A Rayleigh scattering model of a planet's atmosphere (see the model in `blackbody.ipynb`), precomputed into tables
+so sky colours are table lookups rather than integrating along every view ray:
+    - Optical depth: the column of air (relative to sea level density) from an altitude to space along a direction,
+      parameterised by (altitude, cos zenith). The cos zenith axis starts at the horizon (which drops with altitude),
+      rays below it hit the ground and have an infinite depth, so the table never interpolates across it.
+    - Single scattering: the sunlight scattered towards a viewer along their view ray, attenuated on the way in
+      and out, parameterised by (altitude, cos view zenith, cos sun zenith). The phase function is applied at lookup.
+
+The single scattering table assumes the sun lies in the same vertical plane as the view ray when tracking how the
+sun's zenith changes along the ray (the common 3D simplification), the true view/sun angle is still used for the
+phase function.
+
+Air density falls off exponentially with the scale height, and the sea level density is taken in proportion to
+the surface pressure (assuming an Earth-like temperature and composition).
+Altitudes and distances are in kilometers, angles in radians.
+"""
+import functools
+import itertools
+import math
+
+import numpy as np
+
+
+# Wavelengths sampled for the red, green and blue channels (in nanometers)
+RGB_WAVELENGTHS = np.array([680.0, 550.0, 440.0])
+
+# Earth's sea level pressure (in Pascals), and number density of air molecules there (per m^3)
+EARTH_SURFACE_PRESSURE = 101_325
+EARTH_SURFACE_NUMBER_DENSITY = 2.545e25
+
+# Refractive index and depolarization factor of air
+REFRACTIVE_INDEX = 1.0003
+DEPOLARIZATION_FACTOR = 0.035
+
+# The top of the atmosphere (in scale heights), above which the density is negligible
+ATMOSPHERE_HEIGHT = 12
+
+
+def rayleigh_scattering(wavelengths, number_density=EARTH_SURFACE_NUMBER_DENSITY):
+    """
+    Args:
+        wavelengths (float|np.array): The wavelengths of light (in nanometers)
+        number_density (float): The number density of air molecules (per m^3)
+    Returns:
+        float|np.array: The Rayleigh scattering coefficient (per kilometer)
+    """
+    wavelengths = np.asarray(wavelengths, dtype=np.float64) * 1e-9
+    # (n^2 - 1) scales with the number density, so with the refractive index known at Earth's surface density
+    # the coefficient is proportional to the number density
+    sigma = (
+        (8 * math.pi ** 3 * (REFRACTIVE_INDEX ** 2 - 1) ** 2 * number_density * (6 + 3 * DEPOLARIZATION_FACTOR)) /
+        (3 * EARTH_SURFACE_NUMBER_DENSITY ** 2 * wavelengths ** 4 * (6 - 7 * DEPOLARIZATION_FACTOR))
+    )
+    return sigma * 1e3
+
+
+def rayleigh_phase(cos_angle):
+    """
+    Args:
+        cos_angle (float|np.array): The cosine of the angle between the view and sun directions
+    Returns:
+        float|np.array: The fraction of scattered light sent along the view direction (per steradian)
+    """
+    return 3 / (16 * math.pi) * (1 + np.asarray(cos_angle) ** 2)
+
+
+def _trapezoid(values, distances, axis=-1):
+    """
+    Args:
+        values (np.array): The samples of a function
+        distances (np.array): The positions of the samples, broadcastable against the values
+        axis (int): The axis to integrate along
+    Returns:
+        np.array: The integral of the function by the trapezium rule
+    """
+    values, distances = np.moveaxis(values, axis, -1), np.moveaxis(distances, axis, -1)
+    return np.sum((values[..., 1:] + values[..., :-1]) * np.diff(distances, axis=-1), axis=-1) * 0.5
+
+
+def _interpolate(table, positions):
+    """
+    Multilinear interpolation into a table at fractional indices, clamped to its edges.
+
+    Args:
+        table (np.array): The table, any axes beyond the interpolated ones are carried through (i.e channels)
+        positions (list[np.array]): The fractional index along each leading axis
+    Returns:
+        np.array: The interpolated values
+    """
+    lower, fractions = [], []
+    for axis, position in enumerate(positions):
+        position = np.clip(position, 0, table.shape[axis] - 1)
+        index = np.minimum(position.astype(np.intp), table.shape[axis] - 2)
+        lower.append(index)
+        fractions.append(position - index)
+
+    channels = (Ellipsis,) + (None,) * (table.ndim - len(positions))
+    result = 0
+    for corner in itertools.product((0, 1), repeat=len(positions)):
+        weight = 1
+        for offset, fraction in zip(corner, fractions):
+            weight = weight * (fraction if offset else 1 - fraction)
+        index = tuple(x + offset for x, offset in zip(lower, corner))
+        result = result + table[index] * np.asarray(weight)[channels]
+    return result
+
+
+class Atmosphere(object):
+    def __init__(
+            self,
+            radius,
+            surface_pressure,
+            scale_height,
+            altitude_samples=32,
+            view_samples=64,
+            sun_samples=32,
+            ray_samples=64
+    ):
+        """
+        The scattering tables of a planet's atmosphere, built on first use.
+        Usually created through `Planet.atmosphere` (or `get_atmosphere`), which share tables between
+        planets with the same parameters and rebuild them when those parameters change.
+
+        Args:
+            radius (float): The radius of the planet (in kilometers)
+            surface_pressure (float): The pressure of the atmosphere at the surface (in Pascals)
+            scale_height (float): The height over which the air density falls by a factor of e (in kilometers)
+            altitude_samples (int): The resolution of the tables in altitude
+            view_samples (int): The resolution of the tables in the cos zenith of the view ray
+            sun_samples (int): The resolution of the single scattering table in the cos zenith of the sun
+            ray_samples (int): The number of points each ray is integrated over
+        """
+        if radius <= 0 or scale_height <= 0:
+            raise AttributeError("Radius and scale height must be greater than 0.")
+        if surface_pressure < 0:
+            raise AttributeError("Surface pressure must not be negative.")
+        self.radius = radius
+        self.surface_pressure = surface_pressure
+        self.scale_height = scale_height
+        self.top = ATMOSPHERE_HEIGHT * scale_height
+
+        self.altitude_samples = altitude_samples
+        self.view_samples = view_samples
+        self.sun_samples = sun_samples
+        self.ray_samples = ray_samples
+
+        # The scattering coefficient of each channel at the surface (per kilometer)
+        self.scattering = rayleigh_scattering(
+            RGB_WAVELENGTHS, EARTH_SURFACE_NUMBER_DENSITY * surface_pressure / EARTH_SURFACE_PRESSURE
+        )
+
+        self._optical_depth = None
+        self._single_scattering = None
+
+    # ------------------------------------------------------------------------
+    # Table parameterisation
+    # Altitudes are spaced quadratically, to resolve the dense air near the surface
+
+    def _altitudes(self, count):
+        return self.top * np.linspace(0, 1, count) ** 2
+
+    def _altitude_position(self, altitudes, count):
+        return np.sqrt(np.clip(altitudes, 0, self.top) / self.top) * (count - 1)
+
+    @staticmethod
+    def _cos_zeniths(count):
+        return np.linspace(-1, 1, count)
+
+    @staticmethod
+    def _cos_zenith_position(cos_zeniths, count):
+        return (np.asarray(cos_zeniths) + 1) * (0.5 * (count - 1))
+
+    def _horizon(self, radii):
+        """
+        Args:
+            radii (np.array): Distances from the planet's centre (in kilometers)
+        Returns:
+            np.array: The cos zenith of the horizon, rays below it hit the ground
+        """
+        return -np.sqrt(np.maximum(1 - (self.radius / radii) ** 2, 0))
+
+    def _depth_position(self, radii, cos_zeniths, count):
+        # spaced quadratically from the horizon, where the optical depth changes fastest
+        horizon = self._horizon(radii)
+        return np.sqrt(np.clip((cos_zeniths - horizon) / (1 - horizon), 0, 1)) * (count - 1)
+
+    # ------------------------------------------------------------------------
+
+    def _distance_to_top(self, radii, cos_zeniths):
+        """
+        Args:
+            radii (np.array): The distance of each ray's origin from the planet's centre (in kilometers)
+            cos_zeniths (np.array): The cos zenith of each ray's direction
+        Returns:
+            np.array: The length of each ray until it leaves the atmosphere, ignoring the ground (in kilometers)
+        """
+        top_radius = self.radius + self.top
+        return -radii * cos_zeniths + np.sqrt(np.maximum(top_radius ** 2 - radii ** 2 * (1 - cos_zeniths ** 2), 0))
+
+    def _ray_lengths(self, radii, cos_zeniths):
+        """
+        Args:
+            radii (np.array): The distance of each ray's origin from the planet's centre (in kilometers)
+            cos_zeniths (np.array): The cos zenith of each ray's direction
+        Returns:
+            np.array: The length of each ray until it leaves the atmosphere or hits the ground (in kilometers)
+        """
+        ground = cos_zeniths < self._horizon(radii)
+        sin_squared = 1 - cos_zeniths ** 2
+        to_ground = -radii * cos_zeniths - np.sqrt(np.maximum(self.radius ** 2 - radii ** 2 * sin_squared, 0))
+        return np.maximum(np.where(ground, to_ground, self._distance_to_top(radii, cos_zeniths)), 0)
+
+    def _density(self, radii):
+        """
+        Args:
+            radii (np.array): Distances from the planet's centre (in kilometers)
+        Returns:
+            np.array: The air density there, relative to the surface
+        """
+        return np.exp(-np.maximum(radii - self.radius, 0) / self.scale_height)
+
+    def _march(self, radii, cos_zeniths, lengths):
+        """
+        Samples points along rays, spaced quadratically so the dense air at the start of a ray is well resolved.
+
+        Args:
+            radii (np.array): The distance of each ray's origin from the planet's centre (in kilometers)
+            cos_zeniths (np.array): The cos zenith of each ray's direction
+            lengths (np.array): The length of each ray (in kilometers)
+        Returns:
+            tuple: The distance along the ray (in kilometers) and distance from the planet's centre
+                of each sample, with an extra last axis of samples
+        """
+        distances = lengths[..., None] * np.linspace(0, 1, self.ray_samples) ** 2
+        radii, cos_zeniths = radii[..., None], cos_zeniths[..., None]
+        sample_radii = np.sqrt(radii ** 2 + distances ** 2 + 2 * radii * distances * cos_zeniths)
+        return distances, sample_radii
+
+    @property
+    def optical_depth_table(self):
+        """
+        Gets the (cached) optical depth from each altitude to space along each direction.
+        Returns:
+            np.array: The (altitude, cos zenith from the horizon up) optical depths,
+                as a column of surface density air (in kilometers)
+        """
+        if self._optical_depth is None:
+            radii = self.radius + self._altitudes(self.altitude_samples)[:, None]
+            horizon = self._horizon(radii)
+            cos_zeniths = horizon + (1 - horizon) * np.linspace(0, 1, self.view_samples) ** 2
+            distances, sample_radii = self._march(radii, cos_zeniths, self._distance_to_top(radii, cos_zeniths))
+            self._optical_depth = _trapezoid(self._density(sample_radii), distances)
+        return self._optical_depth
+
+    def optical_depth(self, altitudes, zeniths):
+        """
+        Args:
+            altitudes (float|np.array): The altitudes above the surface (in kilometers)
+            zeniths (float|np.array): The angles of the rays from straight up (in radians)
+        Returns:
+            np.array: The optical depth to space along each ray, as a column of surface density air (in kilometers)
+                - infinite for rays which hit the ground
+        """
+        return self._optical_depth_at(self.radius + np.asarray(altitudes, dtype=np.float64), np.cos(zeniths))
+
+    def _optical_depth_at(self, radii, cos_zeniths):
+        radii = np.maximum(radii, self.radius)
+        depth = _interpolate(self.optical_depth_table, [
+            self._altitude_position(radii - self.radius, self.altitude_samples),
+            self._depth_position(radii, cos_zeniths, self.view_samples),
+        ])
+        return np.where(cos_zeniths < self._horizon(radii), np.inf, depth)
+
+    def transmittance(self, altitudes, zeniths):
+        """
+        Gets the fraction of light which passes through the atmosphere, i.e the colour of the sun
+        seen from an altitude with the sun at a zenith angle.
+
+        Args:
+            altitudes (float|np.array): The altitudes above the surface (in kilometers)
+            zeniths (float|np.array): The angles of the rays from straight up (in radians)
+        Returns:
+            np.array: The linear RGB transmittance, with a last axis of 3
+        """
+        return self._extinction(self.optical_depth(altitudes, zeniths))
+
+    def _extinction(self, depth):
+        """
+        Args:
+            depth (np.array): Optical depths, as a column of surface density air (in kilometers)
+        Returns:
+            np.array: The fraction of light of each channel passing through, with a last axis of 3
+        """
+        # rays blocked by the ground pass nothing, even with no atmosphere to scatter them
+        with np.errstate(invalid="ignore"):
+            transmitted = np.exp(-self.scattering * depth[..., None])
+        return np.where(np.isinf(depth)[..., None], 0.0, transmitted)
+
+    @property
+    def single_scattering_table(self):
+        """
+        Gets the (cached) single scattering table.
+        Returns:
+            np.array: The (altitude, cos view zenith, cos sun zenith, 3) light scattered towards the viewer
+                per unit of sunlight, before the phase function
+        """
+        if self._single_scattering is None:
+            altitudes = self._altitudes(self.altitude_samples)
+            cos_views = self._cos_zeniths(self.view_samples)
+            cos_suns = self._cos_zeniths(self.sun_samples)[:, None]
+            sin_views, sin_suns = np.sqrt(1 - cos_views ** 2), np.sqrt(1 - cos_suns ** 2)
+
+            table = np.empty((self.altitude_samples, self.view_samples, self.sun_samples, 3))
+            for index, altitude in enumerate(altitudes):
+                radius = np.full_like(cos_views, self.radius + altitude)
+                distances, sample_radii = self._march(radius, cos_views, self._ray_lengths(radius, cos_views))
+
+                # optical depth from the viewer to each sample: (V, K)
+                density = self._density(sample_radii)
+                view_depth = np.zeros_like(density)
+                view_depth[:, 1:] = np.cumsum(
+                    (density[:, 1:] + density[:, :-1]) * 0.5 * np.diff(distances, axis=-1), axis=-1
+                )
+
+                # the sun's cos zenith at each sample, from the local up direction there: (V, S, K)
+                up_horizontal = (distances * sin_views[:, None])[:, None, :]
+                up_vertical = (radius[:, None] + distances * cos_views[:, None])[:, None, :]
+                cos_sun_at_sample = (up_horizontal * sin_suns + up_vertical * cos_suns) / sample_radii[:, None, :]
+                sun_depth = self._optical_depth_at(sample_radii[:, None, :], cos_sun_at_sample)
+
+                extinction = self._extinction(view_depth)[:, None] * self._extinction(sun_depth)
+                integrand = density[:, None, :, None] * extinction
+                table[index] = self.scattering * _trapezoid(integrand, distances[:, None, :, None], axis=2)
+            self._single_scattering = table
+        return self._single_scattering
+
+    def sky_color(self, altitudes, view_zeniths, sun_zeniths, relative_azimuths=0.0, sun_intensity=1.0):
+        """
+        Looks up the colour of the sky in any number of directions at once.
+
+        Args:
+            altitudes (float|np.array): The altitude of the viewer (in kilometers)
+            view_zeniths (float|np.array): The angle of the view direction from straight up (in radians)
+            sun_zeniths (float|np.array): The angle of the sun from straight up (in radians)
+            relative_azimuths (float|np.array): The azimuth between the view direction and the sun (in radians)
+            sun_intensity (float|np.array): The brightness of the sunlight, per channel or overall
+        Returns:
+            np.array: The linear RGB radiance of the sky, with a last axis of 3 (in units of `sun_intensity` per steradian)
+        """
+        cos_views, cos_suns = np.cos(view_zeniths), np.cos(sun_zeniths)
+        cos_angle = cos_views * cos_suns + np.sin(view_zeniths) * np.sin(sun_zeniths) * np.cos(relative_azimuths)
+        scattered = _interpolate(self.single_scattering_table, [
+            self._altitude_position(np.asarray(altitudes, dtype=np.float64), self.altitude_samples),
+            self._cos_zenith_position(cos_views, self.view_samples),
+            self._cos_zenith_position(cos_suns, self.sun_samples),
+        ])
+        return scattered * rayleigh_phase(cos_angle)[..., None] * sun_intensity
+
+
+@functools.lru_cache(maxsize=16)
+def get_atmosphere(radius, surface_pressure, scale_height):
+    """
+    Gets the atmosphere for a set of parameters, shared with every planet which has the same ones.
+
+    Args:
+        radius (float): The radius of the planet (in kilometers)
+        surface_pressure (float): The pressure of the atmosphere at the surface (in Pascals)
+        scale_height (float): The scale height of the atmosphere (in kilometers)
+    Returns:
+        Atmosphere: The atmosphere, its tables are built on first use
+    """
+    return Atmosphere(radius, surface_pressure, scale_height)
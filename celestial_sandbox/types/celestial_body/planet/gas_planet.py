@@ -1,5 +1,5 @@
-import celestial_sandbox.types.planet
+import celestial_sandbox.types.celestial_body.planet
 
 
-class GasPlanet(celestial_sandbox.types.planet.Planet):
-    pass
+class GasPlanet(celestial_sandbox.types.celestial_body.planet.Planet):
+    __slots__ = ()
@@ -1,18 +1,32 @@
 import enum
 
 import celestial_sandbox.types.celestial_body
+from . import classification
+from . import color
+from . import spectrum
 from . import type_mapping_table
 
 
 class Star(celestial_sandbox.types.celestial_body.CelestialBody):
+    __slots__ = (
+        "luminosity",
+        "MASS_CATEGORY",
+        "_temperature",
+        "_stage",
+        # cached values, see `color` and `type_code`
+        "_color",
+        "_type_code",
+    )
+
     def __init__(
             self,
             temperature=5772,
             luminosity=1,
             radius=696_340,
             rotation_period=(27.0 * 24.0),  # roughly 27 days for our sun (varies depending on longitude)
-            surface_gravity=274.0,
-            solar_masses=1
+            surface_gravity=None,
+            solar_masses=1,
+            stage=None
     ):
         """
         Note: All default values default to that of our Sun
@@ -29,9 +43,12 @@ class Star(celestial_sandbox.types.celestial_body.CelestialBody):
             - surface_gravity (float):
                 The surface gravity of the star (measured in m/s^2)
                 This is the speed at which an object at the surface will accelerate downward each second.
+                Derived from the mass and radius when not given (274 m/s^2 for the Sun)
             - solar_masses (float)
                 The mass of the star in solar masses
                 I.e, Sun = 1 solar mass
+            - stage (EStarLifecycleStage)
+                The lifecycle stage of the star, defaults to the main sequence
         """
 
         """
@@ -51,7 +68,7 @@ class Star(celestial_sandbox.types.celestial_body.CelestialBody):
             radius=radius,
             rotation_period=rotation_period,
             surface_gravity=surface_gravity,
-            mass=(solar_masses * 1.98847e30)
+            mass=(solar_masses * celestial_sandbox.types.celestial_body.SOLAR_MASS)
         )
 
         # The temperature of the star (in Kelvin)
@@ -59,10 +76,6 @@ class Star(celestial_sandbox.types.celestial_body.CelestialBody):
         #       Sirius B: 25200 Kelvin
         self.temperature = temperature
 
-        # The type of star
-        # I.e,  `TTauri`
-        self.type = type_mapping_table.YellowDwarf
-
         # The luminosity of the star (in Watts)
         self.luminosity = luminosity
 
@@ -71,13 +84,113 @@ class Star(celestial_sandbox.types.celestial_body.CelestialBody):
 
         #
         self.MASS_CATEGORY = None
-        self.STAGE = None
+        self.stage = EStarLifecycleStage.MAIN_SEQUENCE if stage is None else stage
 
         # Other Notes:
         # Photosphere: The lowest layer oft he solar atmosphere (the solar surface - seen when we look at the sun in white light)
         # Chromosphere: Thin layer of plasma that lies between a star's visible surface (photosphere), and the corona (uper atmosphere)
         # Corona: The outer layer of a star's atmosphere. Consists of plasma.
 
+    def _invalidate_cache(self):
+        """
+        Clears all values derived from the mass and radius, including the classification.
+        """
+        super()._invalidate_cache()
+        self._type_code = None
+
+    @property
+    def temperature(self):
+        """
+        Returns:
+            float: The temperature of the star (in Kelvin)
+        """
+        return self._temperature
+
+    @temperature.setter
+    def temperature(self, value):
+        self._temperature = value
+        self._color = None
+        self._type_code = None
+
+    @property
+    def stage(self):
+        """
+        Returns:
+            EStarLifecycleStage: The lifecycle stage of the star
+        """
+        return self._stage
+
+    @stage.setter
+    def stage(self, value):
+        self._stage = value
+        self._type_code = None
+
+    @property
+    def STAGE(self):
+        """
+        Alias of `stage`, kept for code written against the old attribute name.
+        Returns:
+            EStarLifecycleStage: The lifecycle stage of the star
+        """
+        return self.stage
+
+    @STAGE.setter
+    def STAGE(self, value):
+        self.stage = value
+
+    @property
+    def type_code(self):
+        """
+        Gets the (cached) classification of the star, from its mass, temperature, radius and stage.
+        Returns:
+            classification.EStarType: The type of star
+        """
+        if self._type_code is None:
+            self._type_code = classification.EStarType(
+                int(classification.classify(self.solar_masses, self.temperature, self.stage, self.radius))
+            )
+        return self._type_code
+
+    @property
+    def type(self):
+        """
+        Returns:
+            type: The `type_mapping_table` entry for the type of star, i.e `type_mapping_table.YellowDwarf`
+        """
+        return classification.TYPE_DATA[self.type_code]
+
+    @property
+    def color(self):
+        """
+        Gets the (cached) colour of the star from its temperature, see `color.ColorTable`.
+        Returns:
+            np.array: The gamma encoded sRGB colour, in the range [0, 1] - read only, as it is cached
+        """
+        if self._color is None:
+            self._color = color.TABLE.srgb(self.temperature)
+            self._color.flags.writeable = False
+        return self._color
+
+    def spectrum(self, wavelengths):
+        """
+        Gets the blackbody spectrum of the star, memoized per temperature and wavelength grid.
+
+        Args:
+            wavelengths (np.array): The 1D wavelength grid (in nanometers)
+        Returns:
+            np.array: The spectral radiance at each wavelength (in W / (sr * m^2 * m)) - a copy of the cached spectrum,
+                so it is safe to modify
+        """
+        return spectrum.CACHE.radiance(self.temperature, wavelengths)
+
+    @property
+    def peak_wavelength(self):
+        """
+        Returns:
+            float: The wavelength the star's spectrum peaks at (in nanometers)
+        """
+        return float(spectrum.peak_wavelength(self.temperature))
+
 
 class EMassCategory(enum.Enum):
     LOW_MASS = 0
@@ -0,0 +1,164 @@
+"""
+Star classification
+
+Classifies stars from their mass, temperature, radius and lifecycle stage, for any number of stars at once.
+The rules are an ordered list of masks, where the first rule a star matches gives its type (as the original
+if/elif chain did), evaluated for the whole population with `np.select`.
+"""
+import enum
+
+import numpy as np
+
+import celestial_sandbox.types.celestial_body.star
+from . import type_mapping_table
+
+
+# The radius of the Sun (in kilometers)
+SOLAR_RADIUS = 696_340
+
+# The stage value used for stars with no lifecycle stage set
+_NO_STAGE = -128
+
+
+class EStarType(enum.IntEnum):
+    UNKNOWN = 0
+    T_TAURI = 1
+    HERBIG_AE_BE = 2
+    SUBDWARF = 3
+    RED_DWARF = 4
+    ORANGE_DWARF = 5
+    YELLOW_DWARF = 6
+    O_TYPE = 7
+    SUBGIANT = 8
+    RED_GIANT = 9
+    RED_SUPERGIANT = 10
+    BLUE_SUPERGIANT = 11
+    HYPERGIANT = 12
+    WHITE_DWARF = 13
+    NEUTRON_STAR = 14
+    STELLAR_BLACK_HOLE = 15
+    BROWN_DWARF = 16
+
+
+# The display name of each type, indexed by type code
+NAMES = (
+    "Unknown Star Type",
+    "T_Tauri_Star",
+    "Herbig_AE_BE_Star",
+    "Subdwarf",
+    "Red_Dwarf",
+    "Orange_Dwarf",
+    "Yellow_Dwarf",
+    "O_Type_Star",
+    "Subgiant",
+    "Red_Giant",
+    "Red_Supergiant",
+    "Blue_Supergiant",
+    "Hypergiant",
+    "White_Dwarf",
+    "Neutron_Star",
+    "Stellar_Black_Hole",
+    "Brown_Dwarf",
+)
+
+# The `type_mapping_table` entry of each type, indexed by type code
+TYPE_DATA = (
+    type_mapping_table.StarData,
+    type_mapping_table.TTauri,
+    type_mapping_table.Herbig_Ae_Be,
+    type_mapping_table.Subdwarf,
+    type_mapping_table.RedDwarf,
+    type_mapping_table.OrangeDwarf,
+    type_mapping_table.YellowDwarf,
+    type_mapping_table.OType,
+    type_mapping_table.Subgiant,
+    type_mapping_table.RedGiant,
+    type_mapping_table.RedSupergiant,
+    type_mapping_table.BlueSupergiant,
+    type_mapping_table.Hyperhiant,
+    type_mapping_table.WhiteDwarf,
+    type_mapping_table.NeutronStar,
+    type_mapping_table.BlackHole,
+    type_mapping_table.BrownDwarf,
+)
+
+
+def stage_values(stages):
+    """
+    Args:
+        stages (EStarLifecycleStage|list|np.array): Lifecycle stages, as enum members or their values (None for unset)
+    Returns:
+        np.array: The integer value of each stage
+    """
+    if isinstance(stages, np.ndarray) and stages.dtype != object:
+        return stages
+    if stages is None or isinstance(stages, enum.Enum) or np.isscalar(stages):
+        return np.asarray(_NO_STAGE if stages is None else getattr(stages, "value", stages))
+    stages = list(stages)
+    return np.fromiter(
+        (_NO_STAGE if x is None else getattr(x, "value", x) for x in stages), dtype=np.int64, count=len(stages)
+    )
+
+
+def classify(masses, temperatures, stages, radii):
+    """
+    Classifies stars in one vectorized pass.
+
+    Args:
+        masses (float|np.array): The mass of each star (in solar masses)
+        temperatures (float|np.array): The temperature of each star (in Kelvin)
+        stages (EStarLifecycleStage|list|np.array): The lifecycle stage of each star, as enum members or their values
+        radii (float|np.array): The radius of each star (in kilometers)
+    Returns:
+        np.array: The `EStarType` code of each star, as uint8 (0 for stars matching no type)
+    """
+    EStage = celestial_sandbox.types.celestial_body.star.EStarLifecycleStage
+
+    m = np.asarray(masses)
+    t = np.asarray(temperatures)
+    r = np.asarray(radii) / SOLAR_RADIUS
+    stage = stage_values(stages)
+
+    pre_main_sequence = stage == EStage.PRE_MAIN_SEQUENCE.value
+    main_sequence = stage == EStage.MAIN_SEQUENCE.value
+    post_main_sequence = stage == EStage.POST_MAIN_SEQUENCE.value
+    supergiant = stage == EStage.SUPERGIANT.value
+    final_stage = stage == EStage.FINAL_STAGE.value
+
+    # (mask, type) in priority order
+    rules = (
+        (pre_main_sequence & (m <= 2) & (r >= 0.5) & (r <= 2), EStarType.T_TAURI),
+        (pre_main_sequence & (m > 2) & (r > 2) & (r <= 5), EStarType.HERBIG_AE_BE),
+        (main_sequence & (m <= 0.08) & (t <= 3000), EStarType.SUBDWARF),
+        (main_sequence & (m <= 0.5) & (t <= 3700), EStarType.RED_DWARF),
+        (main_sequence & (m > 0.5) & (m <= 0.8) & (t > 3700) & (t <= 5200), EStarType.ORANGE_DWARF),
+        (main_sequence & (m > 0.8) & (m <= 1.4) & (t > 5200) & (t <= 6000), EStarType.YELLOW_DWARF),
+        (main_sequence & (m > 15) & (t > 30000), EStarType.O_TYPE),
+        (post_main_sequence & (r > 1.5) & (r <= 5), EStarType.SUBGIANT),
+        (post_main_sequence & (r > 5) & (r <= 100), EStarType.RED_GIANT),
+        (post_main_sequence & (r > 100), EStarType.RED_SUPERGIANT),
+        (supergiant & (m > 15) & (m <= 25) & (r > 600), EStarType.BLUE_SUPERGIANT),
+        (supergiant & (m > 25) & (t > 30000), EStarType.HYPERGIANT),
+        (final_stage & (m <= 1.4), EStarType.WHITE_DWARF),
+        (final_stage & (m > 1.4) & (m <= 3), EStarType.NEUTRON_STAR),
+        (final_stage & (m > 3), EStarType.STELLAR_BLACK_HOLE),
+        (stage == EStage.FAILED_STAR.value, EStarType.BROWN_DWARF),
+    )
+    return np.select(
+        [mask for mask, _ in rules], [np.uint8(code) for _, code in rules], default=np.uint8(EStarType.UNKNOWN)
+    ).astype(np.uint8)
+
+
+def classify_stars(stars):
+    """
+    Args:
+        stars (list[Star]): The stars
+    Returns:
+        np.array: The `EStarType` code of each star, as uint8
+    """
+    return classify(
+        np.fromiter((x.solar_masses for x in stars), dtype=np.float64, count=len(stars)),
+        np.fromiter((x.temperature for x in stars), dtype=np.float64, count=len(stars)),
+        [x.stage for x in stars],
+        np.fromiter((x.radius for x in stars), dtype=np.float64, count=len(stars)),
+    )
@@ -0,0 +1,133 @@
+"""
+Colours of stars from their temperature
+
+The colour of a blackbody follows the Planckian locus, approximated here in CIE 1960 (u, v) coordinates
+(Krystek, 1985 - fitted from 1000K to 15000K), converted to CIE XYZ and then to linear sRGB primaries.
+Above 15000K the fit is extrapolated. It keeps getting steadily bluer towards its limit, so hot stars still
+grade in colour, but those colours are approximate.
+Colours are normalised so their brightest channel is 1, brightness comes from the star's luminosity instead.
+
+Evaluating this per star is slow for large star fields, so it is tabulated once over a dense temperature grid
+and looked up with linear interpolation, for any number of stars at once.
+"""
+import numpy as np
+
+
+# CIE XYZ to linear sRGB (D65 white point)
+XYZ_TO_LINEAR_RGB = np.array([
+    [3.2404542, -1.5371385, -0.4985314],
+    [-0.9692660, 1.8760108, 0.0415560],
+    [0.0556434, -0.2040259, 1.0572252]
+])
+
+
+def planckian_rgb(temperatures):
+    """
+    Evaluates the colour of blackbodies directly, without the table.
+    Temperatures above 15000K are extrapolated from the locus approximation.
+
+    Args:
+        temperatures (float|np.array): The temperatures (in Kelvin)
+    Returns:
+        np.array: The linear RGB colour of each temperature, with a last axis of 3 - the brightest channel is 1
+    """
+    k = np.asarray(temperatures, dtype=np.float64)
+    u = (0.860117757 + 1.54118254e-4 * k + 1.28641212e-7 * k * k) / (1.0 + 8.42420235e-4 * k + 7.08145163e-7 * k * k)
+    v = (0.317398726 + 4.22806245e-5 * k + 4.20481691e-8 * k * k) / (1.0 - 2.89741816e-5 * k + 1.61456053e-7 * k * k)
+
+    # (u, v) to (x, y) chromaticity, then to XYZ with a luminance (Y) of 1
+    denominator = 2 * u - 8 * v + 4
+    x = 3 * u / denominator
+    y = 2 * v / denominator
+    xyz = np.stack([x / y, np.ones_like(x), (1 - x - y) / y], axis=-1)
+
+    # colours outside the sRGB gamut are clipped to it
+    rgb = np.clip(xyz @ XYZ_TO_LINEAR_RGB.T, 0, None)
+    return rgb / rgb.max(axis=-1, keepdims=True)
+
+
+def linear_to_srgb(rgb):
+    """
+    Args:
+        rgb (np.array): Linear RGB values, in the range [0, 1]
+    Returns:
+        np.array: The gamma encoded sRGB values, in the range [0, 1]
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.0031308, 12.92 * rgb, 1.055 * np.power(rgb, 1 / 2.4) - 0.055)
+
+
+class ColorTable(object):
+    def __init__(self, min_temperature=1000, max_temperature=40000, step=10):
+        """
+        A dense temperature -> colour lookup table.
+        Temperatures outside of the table are clamped to its ends.
+        The default range reaches past the 15000K the locus approximation is fitted to, so the colours of the
+        hottest stars are extrapolated.
+
+        Args:
+            min_temperature (float): The coolest temperature in the table (in Kelvin)
+            max_temperature (float): The hottest temperature in the table (in Kelvin)
+            step (float): The spacing of the table (in Kelvin)
+        """
+        if not 0 < min_temperature < max_temperature:
+            raise AttributeError("Temperature range must be positive and increasing.")
+        self.min_temperature = min_temperature
+        self.step = step
+        self.temperatures = np.arange(min_temperature, max_temperature + step / 2, step, dtype=np.float64)
+        self.max_temperature = float(self.temperatures[-1])
+
+        # (T, 3) tables, with a repeated last row so interpolation at the top end doesn't need a bounds check
+        self._linear = planckian_rgb(self.temperatures)
+        self._linear = np.vstack([self._linear, self._linear[-1:]])
+        self._srgb = linear_to_srgb(self._linear)
+
+    def _lookup(self, table, temperatures):
+        """
+        Args:
+            table (np.array): The (T + 1, 3) table to interpolate
+            temperatures (float|np.array): The temperatures (in Kelvin)
+        Returns:
+            np.array: The interpolated colours, with a last axis of 3
+        """
+        position = (np.clip(temperatures, self.min_temperature, self.max_temperature) - self.min_temperature) / self.step
+        index = position.astype(np.intp)
+        weight = (position - index)[..., None]
+        return table[index] * (1 - weight) + table[index + 1] * weight
+
+    def linear(self, temperatures):
+        """
+        Args:
+            temperatures (float|np.array): The temperatures (in Kelvin)
+        Returns:
+            np.array: The linear RGB colour of each temperature, with a last axis of 3
+        """
+        return self._lookup(self._linear, np.asarray(temperatures, dtype=np.float64))
+
+    def srgb(self, temperatures):
+        """
+        Args:
+            temperatures (float|np.array): The temperatures (in Kelvin)
+        Returns:
+            np.array: The gamma encoded sRGB colour of each temperature, with a last axis of 3
+        """
+        return self._lookup(self._srgb, np.asarray(temperatures, dtype=np.float64))
+
+
+# The table shared by every star
+TABLE = ColorTable()
+
+
+def star_colors(stars, srgb=True):
+    """
+    Gets the colour of a collection of stars from the shared table.
+
+    Args:
+        stars (list[Star]|np.array): The stars, or their temperatures (in Kelvin)
+        srgb (bool): Return gamma encoded sRGB colours rather than linear RGB
+    Returns:
+        np.array: The (N, 3) colour of each star
+    """
+    if not isinstance(stars, np.ndarray):
+        stars = np.fromiter((x.temperature for x in stars), dtype=np.float64, count=len(stars))
+    return TABLE.srgb(stars) if srgb else TABLE.linear(stars)
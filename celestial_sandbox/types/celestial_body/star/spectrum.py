@@ -0,0 +1,157 @@
+"""
+Blackbody spectra of stars
+
+Planck's law gives the spectral radiance of a black body at temperature T:
+    B(λ, T) = (2hc^2 / λ^5) / (exp(hc / λkT) - 1)
+
+Written directly, `exp` overflows for short wavelengths and cool temperatures (hc / λkT is over 700 at 1nm and 20K).
+Instead the ratio is evaluated as `exp(-x) / -expm1(-x)`, which smoothly underflows to zero where the radiance does,
+and stays accurate where x is small (long wavelengths / hot stars) where `exp(x) - 1` would lose precision.
+
+Wavelengths are in nanometers throughout (as in the rest of the rendering code),
+radiance is in SI units of W / (sr * m^2 * m) - per meter of wavelength.
+"""
+import collections
+
+import numpy as np
+
+import celestial_sandbox.constants
+
+
+# 2hc^2 (in W * m^2 / sr)
+_FIRST_RADIATION_CONSTANT = (
+    2 * celestial_sandbox.constants.PLANCK_CONSTANT * (celestial_sandbox.constants.SPEED_OF_LIGHT * 1e3) ** 2
+)
+
+# hc / k (in m * K)
+_SECOND_RADIATION_CONSTANT = (
+    celestial_sandbox.constants.PLANCK_CONSTANT * (celestial_sandbox.constants.SPEED_OF_LIGHT * 1e3) /
+    celestial_sandbox.constants.BOLTZMANN_CONSTANT
+)
+
+# Wien's displacement constant (in nm * K)
+WIEN_CONSTANT = 2.897771955e6
+
+
+def planck_radiance(temperatures, wavelengths):
+    """
+    Evaluates Planck's law for every temperature against every wavelength, in one broadcast.
+
+    Args:
+        temperatures (float|np.array): The temperature of each body (in Kelvin)
+        wavelengths (float|np.array): The wavelengths to evaluate (in nanometers)
+    Returns:
+        np.array: The spectral radiance, with the shape of the temperatures followed by the shape of the wavelengths
+            (in W / (sr * m^2 * m))
+    """
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    wavelengths = np.asarray(wavelengths, dtype=np.float64) * 1e-9
+    temperatures = temperatures.reshape(temperatures.shape + (1,) * wavelengths.ndim)
+
+    # a temperature of zero gives an x of infinity, and so (correctly) no radiance
+    with np.errstate(divide="ignore", over="ignore"):
+        x = _SECOND_RADIATION_CONSTANT / (wavelengths * temperatures)
+    return (_FIRST_RADIATION_CONSTANT / wavelengths ** 5) * (np.exp(-x) / -np.expm1(-x))
+
+
+def peak_wavelength(temperatures):
+    """
+    Args:
+        temperatures (float|np.array): The temperature of each body (in Kelvin)
+    Returns:
+        float|np.array: The wavelength each body's spectrum peaks at, from Wien's displacement law (in nanometers)
+    """
+    return WIEN_CONSTANT / np.asarray(temperatures, dtype=np.float64)
+
+
+class SpectrumCache(object):
+    def __init__(self, max_entries=4096):
+        """
+        Memoizes blackbody spectra per temperature and wavelength grid.
+        Stars tend to share a small set of temperatures (i.e generated from the type mapping table),
+        so each distinct temperature is only evaluated once per grid, and repeat queries are a dictionary lookup.
+
+        Args:
+            max_entries (int): The maximum number of spectra to keep, the least recently used are dropped first
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # (grid key, temperature) -> read only spectrum, in least to most recently used order
+        self._spectra = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._spectra)
+
+    def clear(self):
+        """
+        Drops every cached spectrum.
+        """
+        self._spectra.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def radiance(self, temperatures, wavelengths):
+        """
+        Gets the spectrum of every temperature against a wavelength grid, through the cache.
+
+        Args:
+            temperatures (float|np.array): The temperature of each body (in Kelvin)
+            wavelengths (np.array): The 1D wavelength grid (in nanometers)
+        Returns:
+            np.array: The spectral radiance, with the shape of the temperatures plus one axis for the wavelengths
+                (in W / (sr * m^2 * m))
+        """
+        wavelengths = np.ascontiguousarray(wavelengths, dtype=np.float64)
+        if wavelengths.ndim != 1:
+            raise AttributeError("Wavelengths must be a 1D grid.")
+        temperatures = np.asarray(temperatures, dtype=np.float64)
+        if temperatures.size == 0:
+            return np.empty(temperatures.shape + wavelengths.shape)
+        grid = wavelengths.tobytes()
+
+        unique, inverse = np.unique(temperatures, return_inverse=True)
+        if len(unique) > self.max_entries:
+            # more distinct temperatures than could be kept, so caching would only churn
+            self.misses += len(unique)
+            return planck_radiance(temperatures, wavelengths)
+
+        rows = [self._spectra.get((grid, x)) for x in unique.tolist()]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+
+        # every missing temperature is evaluated together
+        if missing:
+            computed = planck_radiance(unique[missing], wavelengths)
+            computed.flags.writeable = False
+            for i, row in zip(missing, computed):
+                rows[i] = row
+                self._spectra[(grid, float(unique[i]))] = row
+
+        for x in unique.tolist():
+            self._spectra.move_to_end((grid, x))
+        while len(self._spectra) > self.max_entries:
+            self._spectra.popitem(last=False)
+
+        return np.stack(rows)[inverse.reshape(temperatures.shape)]
+
+
+# The cache shared by every star
+CACHE = SpectrumCache()
+
+
+def star_spectra(stars, wavelengths):
+    """
+    Gets the blackbody spectrum of a collection of stars, through the shared cache.
+
+    Args:
+        stars (list[Star]|np.array): The stars, or their temperatures (in Kelvin)
+        wavelengths (np.array): The 1D wavelength grid (in nanometers)
+    Returns:
+        np.array: The (N, W) spectral radiance of each star (in W / (sr * m^2 * m))
+    """
+    if not isinstance(stars, np.ndarray):
+        stars = np.fromiter((x.temperature for x in stars), dtype=np.float64, count=len(stars))
+    return CACHE.radiance(stars, wavelengths)
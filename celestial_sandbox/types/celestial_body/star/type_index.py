@@ -0,0 +1,168 @@
+"""
+Interval index over the star type ranges
+
+Compiles the MIN/MAX ranges of every `type_mapping_table.StarData` subclass into sorted boundary arrays,
+one per property, so the types consistent with a set of properties can be found for any number of stars at once.
+
+For each property the sorted boundaries split the number line into slots (each boundary itself, and the open
+segments between them), and every slot stores a bitset of the types whose closed range covers it. A lookup is then a
+binary search for the slot, and the answer across properties is the AND of their bitsets.
+
+A range is unspecified (and so a wildcard, matching any value) when a type doesn't declare it itself, only inheriting
+the `StarData` placeholders, or declares it as 0 to 0. Query values of NaN (or None) match every type.
+"""
+import inspect
+
+import numpy as np
+
+from . import type_mapping_table
+
+
+# Each indexed property, as (name, attribute prefix) - in solar radii, solar masses, Kelvin and millions of years
+PROPERTIES = (
+    ("radius", "RADIUS"),
+    ("mass", "MASS"),
+    ("temperature", "TEMP"),
+    ("age", "AGE"),
+)
+
+
+def star_types():
+    """
+    Returns:
+        tuple: Every `StarData` subclass in the type mapping table, in the order they're declared
+    """
+    return tuple(
+        x for x in vars(type_mapping_table).values()
+        if inspect.isclass(x) and issubclass(x, type_mapping_table.StarData) and x is not type_mapping_table.StarData
+    )
+
+
+def _declared_range(star_type, prefix):
+    """
+    Args:
+        star_type (type): The `StarData` subclass
+        prefix (str): The property's attribute prefix, i.e "MASS"
+    Returns:
+        tuple: The (min, max) the type declares, or None if it leaves the range unspecified
+    """
+    declared = any(
+        f"{bound}_{prefix}" in vars(x) for x in star_type.__mro__ if x is not type_mapping_table.StarData
+        for bound in ("MIN", "MAX")
+    )
+    lower, upper = getattr(star_type, f"MIN_{prefix}"), getattr(star_type, f"MAX_{prefix}")
+    if not declared or lower == upper == 0:
+        return None
+    return lower, upper
+
+
+class _PropertyIndex(object):
+    def __init__(self, ranges):
+        """
+        The slots of one property.
+
+        Args:
+            ranges (list[tuple]): The (min, max) of each type, None for unspecified
+        """
+        specified = [(bit, x) for bit, x in enumerate(ranges) if x is not None]
+        wildcards = np.uint64(sum(1 << bit for bit, x in enumerate(ranges) if x is None))
+
+        # sorted unique boundaries, and a representative value for every slot:
+        # [below the first, first, between the first and second, second, ..., above the last]
+        self.boundaries = np.unique([bound for _, x in specified for bound in x]).astype(np.float64)
+        between = (self.boundaries[1:] + self.boundaries[:-1]) / 2
+        representatives = np.empty(2 * len(self.boundaries) + 1)
+        representatives[1::2] = self.boundaries
+        representatives[2:-1:2] = between
+        representatives[[0, -1]] = -np.inf, np.inf
+
+        self.slots = np.full(len(representatives), wildcards, dtype=np.uint64)
+        for bit, (lower, upper) in specified:
+            self.slots[(representatives >= lower) & (representatives <= upper)] |= np.uint64(1 << bit)
+
+        # every type matches an unknown value
+        self.everything = np.uint64((1 << len(ranges)) - 1)
+
+    def lookup(self, values):
+        """
+        Args:
+            values (np.array): The values of the property
+        Returns:
+            np.array: The bitset of types whose range covers each value
+        """
+        if not len(self.boundaries):
+            # no type specifies the property
+            return np.full(np.shape(values), self.slots[0])
+        index = np.searchsorted(self.boundaries, values)
+        on_boundary = self.boundaries[np.minimum(index, len(self.boundaries) - 1)] == values
+        return np.where(np.isnan(values), self.everything, self.slots[2 * index + on_boundary])
+
+
+class TypeIndex(object):
+    def __init__(self, types=None):
+        """
+        An index answering which star types are consistent with a set of properties.
+
+        Args:
+            types (tuple): The `StarData` subclasses to index, defaults to every type in the type mapping table.
+                At most 64, as each gets a bit in a uint64 mask
+        """
+        self.types = star_types() if types is None else tuple(types)
+        if len(self.types) > 64:
+            raise AttributeError("At most 64 star types can be indexed.")
+        self._properties = {
+            name: _PropertyIndex([_declared_range(x, prefix) for x in self.types]) for name, prefix in PROPERTIES
+        }
+
+    def bit(self, star_type):
+        """
+        Args:
+            star_type (type): A `StarData` subclass in the index
+        Returns:
+            np.uint64: The mask with only the type's bit set
+        """
+        return np.uint64(1 << self.types.index(star_type))
+
+    def candidates(self, radius=None, mass=None, temperature=None, age=None):
+        """
+        Finds the types consistent with the given properties of any number of stars.
+        Properties left as None (or NaN for single stars) don't narrow the search.
+
+        Args:
+            radius (float|np.array): The radius of each star (in solar radii)
+            mass (float|np.array): The mass of each star (in solar masses)
+            temperature (float|np.array): The temperature of each star (in Kelvin)
+            age (float|np.array): The age of each star (in millions of years)
+        Returns:
+            np.array: A uint64 bitset of candidate types for each star, bit n set for `types[n]`
+        """
+        values = {"radius": radius, "mass": mass, "temperature": temperature, "age": age}
+        result = np.uint64((1 << len(self.types)) - 1)
+        for name, value in values.items():
+            if value is not None:
+                result = result & self._properties[name].lookup(np.asarray(value, dtype=np.float64))
+        return result
+
+    def types_from_mask(self, mask):
+        """
+        Args:
+            mask (np.uint64): A bitset of types, i.e one star's result from `candidates`
+        Returns:
+            list[type]: The `StarData` subclasses in the set
+        """
+        mask = int(mask)
+        return [x for bit, x in enumerate(self.types) if mask >> bit & 1]
+
+
+_INDEX = None
+
+
+def get_index():
+    """
+    Returns:
+        TypeIndex: The index over every type in the type mapping table, built on first use
+    """
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = TypeIndex()
+    return _INDEX
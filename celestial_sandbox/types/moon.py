@@ -2,5 +2,14 @@ import celestial_sandbox.types.celestial_body
 
 
 class Moon(celestial_sandbox.types.celestial_body.CelestialBody):
-    def __init__(self, radius):
-        super().__init__(radius, ...)
+    __slots__ = ()
+
+    def __init__(self, radius, mass=celestial_sandbox.types.celestial_body.MOON_MASS, surface_gravity=None):
+        """
+        Args:
+            radius (float): The radius of the moon (in kilometers)
+            mass (float): The mass of the moon (in KG), defaults to that of our Moon
+            surface_gravity (float): The surface gravity of the moon - measured in m/s^2.
+                Derived from the mass and radius when not given
+        """
+        super().__init__(radius, surface_gravity=surface_gravity, mass=mass)
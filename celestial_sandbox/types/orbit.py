@@ -1,6 +1,10 @@
 import math
 
+import numpy as np
+
 import celestial_sandbox.orbit
+import celestial_sandbox.orbit_paths
+import celestial_sandbox.orbital_elements.kepler
 
 
 class Orbit(object):
@@ -15,6 +19,9 @@ class Orbit(object):
             longitude_of_ascending_node (float): The longitude of the ascending node (in radians)
             argument_of_periapsis (float): The argument of periapsis (in radians)
         """
+        # Incremented whenever an element changes, so dependents (i.e a scene graph) can spot stale values
+        self.revision = 0
+
         self.semi_major_axis = semi_major_axis
         self.eccentricity = eccentricity
         self.inclination = inclination
@@ -22,8 +29,185 @@ class Orbit(object):
         self.argument_of_periapsis = argument_of_periapsis
         self.name = name
 
+        # Settings for the opt-in kepler lookup table, see `enable_kepler_table`
+        self._kepler_table_settings = None
+
         self.orbital_period = orbital_period or 365
 
+    # ------------------------------------------------------------------------
+    # Orbital elements
+    # Reassigning any element invalidates the values cached from it
+
+    @property
+    def semi_major_axis(self):
+        """
+        Returns:
+            float: The semi-major axis (in kilometers)
+        """
+        return self._semi_major_axis
+
+    @semi_major_axis.setter
+    def semi_major_axis(self, value):
+        self._semi_major_axis = value
+        self._invalidate_cache()
+
+    @property
+    def eccentricity(self):
+        """
+        Returns:
+            float: The eccentricity
+        """
+        return self._eccentricity
+
+    @eccentricity.setter
+    def eccentricity(self, value):
+        self._eccentricity = value
+        self._invalidate_cache()
+
+        # the kepler table only depends on the eccentricity, so it is only rebuilt when that changes
+        self._kepler_table = None
+
+    @property
+    def inclination(self):
+        """
+        Returns:
+            float: The inclination (in radians)
+        """
+        return self._inclination
+
+    @inclination.setter
+    def inclination(self, value):
+        self._inclination = value
+        self._invalidate_cache()
+
+    @property
+    def longitude_of_ascending_node(self):
+        """
+        Returns:
+            float: The longitude of the ascending node (in radians)
+        """
+        return self._longitude_of_ascending_node
+
+    @longitude_of_ascending_node.setter
+    def longitude_of_ascending_node(self, value):
+        self._longitude_of_ascending_node = value
+        self._invalidate_cache()
+
+    @property
+    def argument_of_periapsis(self):
+        """
+        Returns:
+            float: The argument of periapsis (in radians)
+        """
+        return self._argument_of_periapsis
+
+    @argument_of_periapsis.setter
+    def argument_of_periapsis(self, value):
+        self._argument_of_periapsis = value
+        self._invalidate_cache()
+
+    @property
+    def orbital_period(self):
+        """
+        Returns:
+            float: The orbital period (in days)
+        """
+        return self._orbital_period
+
+    @orbital_period.setter
+    def orbital_period(self, value):
+        self._orbital_period = value
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        """
+        Clears all values derived from the orbital elements, they are rebuilt on next access.
+        """
+        self.revision += 1
+        self._rotation_matrix = None
+        self._semi_latus_rectum = None
+        self._paths = {}
+
+    @property
+    def rotation_matrix(self):
+        """
+        Gets the (cached) rotation from the orbital plane into world space.
+        Returns:
+            np.array: The 3x3 rotation matrix
+        """
+        if self._rotation_matrix is None:
+            self._rotation_matrix = celestial_sandbox.orbit.get_orbital_plane_rotation_matrix(
+                self.inclination,
+                self.longitude_of_ascending_node,
+                self.argument_of_periapsis
+            )
+        return self._rotation_matrix
+
+    @property
+    def semi_latus_rectum(self):
+        """
+        Gets the (cached) semi-latus rectum of the orbit.
+        Returns:
+            float: The semi-latus rectum (in kilometers)
+        """
+        if self._semi_latus_rectum is None:
+            self._semi_latus_rectum = self.semi_major_axis * (1 - self.eccentricity ** 2)
+        return self._semi_latus_rectum
+
+    def path(self, level=0):
+        """
+        Gets the (cached) closed path around the orbit for drawing, at a level of detail.
+        Vertices are placed adaptively so no chord strays further than `LOD_TOLERANCES[level]` times the
+        semi-major axis from the ellipse, see `celestial_sandbox.orbit_paths`.
+        Args:
+            level (int): The level of detail, 0 is the finest
+        Returns:
+            np.array: The (V, 3) vertices of the path, with the first repeated at the end (in kilometers)
+        """
+        if level not in self._paths:
+            levels = len(celestial_sandbox.orbit_paths.LOD_TOLERANCES)
+            if not 0 <= level < levels:
+                raise AttributeError(f"Level of detail must be in the range [0, {levels}).")
+            vertices, _ = celestial_sandbox.orbit_paths.orbit_paths(
+                [self], celestial_sandbox.orbit_paths.LOD_TOLERANCES[level] * self.semi_major_axis
+            )
+            self._paths[level] = vertices
+        return self._paths[level]
+
+    def enable_kepler_table(self, max_error=1e-6, max_bytes=1_000_000):
+        """
+        Opts in to solving Kepler's equation through a lookup table built for this orbit's eccentricity.
+        Useful when the same orbit is evaluated many times (i.e, animation). The table is built on first use,
+        which raises an AttributeError if it can't reach `max_error` within `max_bytes`.
+        Args:
+            max_error (float): The maximum interpolation error of the table, before polishing (in radians)
+            max_bytes (int): The memory budget of the table (in bytes)
+        """
+        self._kepler_table_settings = {"max_error": max_error, "max_bytes": max_bytes}
+        self._kepler_table = None
+
+    def disable_kepler_table(self):
+        """
+        Goes back to solving Kepler's equation from scratch on every call, freeing the lookup table.
+        """
+        self._kepler_table_settings = None
+        self._kepler_table = None
+
+    @property
+    def kepler_table(self):
+        """
+        Gets the (cached) kepler lookup table for this orbit.
+        Returns:
+            KeplerTable: The lookup table, or None if it hasn't been enabled
+        """
+        if self._kepler_table is None and self._kepler_table_settings is not None:
+            self._kepler_table = celestial_sandbox.orbital_elements.kepler.KeplerTable(
+                self.eccentricity, **self._kepler_table_settings
+            )
+        return self._kepler_table
+
+    # ------------------------------------------------------------------------
+
     def true_anomaly(self, t):
         """
         Calculates the true anomaly at a given time.
@@ -61,26 +245,21 @@ class Orbit(object):
         M = n * t
         return M
 
-    def eccentric_anomaly(self, time, tol=1e-8):
+    def eccentric_anomaly(self, time, tol=1e-8, method=None):
         """
         Calculates the eccentric anomaly at a given time using an iterative solver method.
         Args:
             time (float): The current time (in seconds)
             tol (float): Tolerance
+            method (EKeplerSolver): The Kepler solver to use (defaults to `kepler.DEFAULT_SOLVER`)
         Returns:
             float: Eccentric anomaly (in radians)
         """
-        mean_anomaly = self.mean_anomaly(time)
-
-        E = mean_anomaly
-        num = 0
-        while True:
-            num += 1
-            E_next = E - (E - self.eccentricity * math.sin(E) - mean_anomaly) / (1 - self.eccentricity * math.cos(E))
-            if abs(E_next - E) < tol:
-                break
-            E = E_next
-        return E
+        if method is None and self.kepler_table is not None:
+            return self.kepler_table.solve(self.mean_anomaly(time))
+        return celestial_sandbox.orbital_elements.kepler.solve(
+            self.eccentricity, self.mean_anomaly(time), method=method, tol=tol
+        )
 
     def position_vector(self, time_value, semi_major_axis=None):
         """
@@ -91,12 +270,82 @@ class Orbit(object):
         Returns:
             np.array: The xyz position at the given time
         """
-        pos = celestial_sandbox.orbit.position_vector_from_orbital_elements(
-            semi_major_axis or self.semi_major_axis,
-            self.eccentricity,
-            self.inclination,
-            self.longitude_of_ascending_node,
-            self.argument_of_periapsis,
-            self.true_anomaly(time_value)
+        return self.position_from_true_anomaly(self.true_anomaly(time_value), semi_major_axis=semi_major_axis)
+
+    def position_from_true_anomaly(self, true_anomaly, semi_major_axis=None):
+        """
+        Gets the position of the orbit at a given true anomaly
+        Uses the cached semi-latus rectum and rotation, so this is a 2D ellipse point and one matrix product.
+        Args:
+            true_anomaly (float): The true anomaly (in radians)
+            semi_major_axis (float): Override value for the semi-major axis (in Kilometers)
+        Returns:
+            np.array: The xyz position at the given true anomaly
+        """
+        p = self.semi_latus_rectum
+        if semi_major_axis:
+            p = semi_major_axis * (1 - self.eccentricity ** 2)
+
+        cos_v = math.cos(true_anomaly)
+        sin_v = math.sin(true_anomaly)
+        r = p / (1.0 + self.eccentricity * cos_v)
+        return self.rotation_matrix[:, :2] @ np.array([r * cos_v, r * sin_v])
+
+    def true_anomalies(self, times):
+        """
+        Calculates the true anomalies for an array of times in one vectorized pass.
+        Args:
+            times (np.array): The times since periapsis (in days)
+        Returns:
+            np.array: The true anomalies (in radians)
+        """
+        mean_anomalies = (2 * math.pi / self.orbital_period) * np.asarray(times, dtype=np.float64)
+        if self.kepler_table is not None:
+            eccentric_anomalies = self.kepler_table.solve(mean_anomalies)
+        else:
+            eccentric_anomalies = celestial_sandbox.orbital_elements.kepler.solve(
+                self.eccentricity, mean_anomalies, tol=1e-8
+            )
+        return 2 * np.arctan2(
+            math.sqrt(1 + self.eccentricity) * np.sin(eccentric_anomalies / 2),
+            math.sqrt(1 - self.eccentricity) * np.cos(eccentric_anomalies / 2)
         )
-        return pos
+
+    def positions(self, times, semi_major_axis=None):
+        """
+        Gets the positions of the orbit for an array of time values
+        Args:
+            times (np.array): The 1-D array of time values to get the positions at (in 24 hour days)
+            semi_major_axis (float): Override value for the semi-major axis (in Kilometers)
+        Returns:
+            np.array: The contiguous (N, 3) array of xyz positions
+        """
+        true_anomalies = self.true_anomalies(times)
+        p = self.semi_latus_rectum
+        if semi_major_axis:
+            p = semi_major_axis * (1 - self.eccentricity ** 2)
+
+        cos_v = np.cos(true_anomalies)
+        sin_v = np.sin(true_anomalies)
+        r = p / (1.0 + self.eccentricity * cos_v)
+        return np.stack((r * cos_v, r * sin_v), axis=-1) @ self.rotation_matrix[:, :2].T
+
+    def velocities(self, times, semi_major_axis=None):
+        """
+        Gets the velocities of the orbit for an array of time values
+        Args:
+            times (np.array): The 1-D array of time values to get the velocities at (in 24 hour days)
+            semi_major_axis (float): Override value for the semi-major axis (in Kilometers)
+        Returns:
+            np.array: The contiguous (N, 3) array of xyz velocities (in kilometers per day)
+        """
+        true_anomalies = self.true_anomalies(times)
+
+        # sqrt(mu / p), written in terms of the mean motion as mu = n^2 * a^3
+        mean_motion = 2 * math.pi / self.orbital_period
+        speed = mean_motion * (semi_major_axis or self.semi_major_axis) / math.sqrt(1 - self.eccentricity ** 2)
+
+        return np.stack(
+            (-speed * np.sin(true_anomalies), speed * (self.eccentricity + np.cos(true_anomalies))),
+            axis=-1
+        ) @ self.rotation_matrix[:, :2].T
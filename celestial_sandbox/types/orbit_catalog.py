@@ -0,0 +1,229 @@
+import math
+
+import numpy as np
+
+import celestial_sandbox.orbit
+import celestial_sandbox.orbital_elements.kepler
+import celestial_sandbox.types.orbit
+
+
+class OrbitCatalog(object):
+    # The orbital elements stored by the catalog, one array per element
+    ELEMENTS = (
+        "semi_major_axis",
+        "eccentricity",
+        "inclination",
+        "longitude_of_ascending_node",
+        "argument_of_periapsis",
+        "orbital_period"
+    )
+
+    def __init__(
+            self,
+            semi_major_axis,
+            eccentricity,
+            inclination,
+            longitude_of_ascending_node,
+            argument_of_periapsis,
+            orbital_period=None,
+            names=None,
+            dtype=np.float64
+    ):
+        """
+        Structure-of-arrays collection of orbits, storing one array per orbital element
+        rather than one `Orbit` object per member.
+
+        Args:
+            semi_major_axis (np.array): The semi-major axes (in kilometers)
+            eccentricity (np.array): The eccentricities
+            inclination (np.array): The inclinations (in radians)
+            longitude_of_ascending_node (np.array): The longitudes of the ascending node (in radians)
+            argument_of_periapsis (np.array): The arguments of periapsis (in radians)
+            orbital_period (np.array): The orbital periods (in days) - defaults to 365 days, as with `Orbit`
+            names (np.array): Optional names of each orbit
+            dtype (np.dtype): The floating point type to store the elements with (float32 halves the memory)
+        """
+        self.semi_major_axis = np.asarray(semi_major_axis, dtype=dtype)
+        count = len(self.semi_major_axis)
+
+        self.eccentricity = np.asarray(eccentricity, dtype=dtype)
+        self.inclination = np.asarray(inclination, dtype=dtype)
+        self.longitude_of_ascending_node = np.asarray(longitude_of_ascending_node, dtype=dtype)
+        self.argument_of_periapsis = np.asarray(argument_of_periapsis, dtype=dtype)
+        if orbital_period is None:
+            orbital_period = np.full(count, 365, dtype=dtype)
+        self.orbital_period = np.asarray(orbital_period, dtype=dtype)
+        self.names = None if names is None else np.asarray(names)
+
+        for element in self.ELEMENTS:
+            if getattr(self, element).shape != (count,):
+                raise AttributeError(f"Element `{element}` must be a 1-D array of length {count}.")
+        if self.names is not None and self.names.shape != (count,):
+            raise AttributeError(f"Names must be a 1-D array of length {count}.")
+
+    @classmethod
+    def from_orbits(cls, orbits, dtype=np.float64):
+        """
+        Builds a catalog from a list of `Orbit` objects.
+
+        Args:
+            orbits (list[Orbit]): The orbits to add to the catalog
+            dtype (np.dtype): The floating point type to store the elements with
+        Returns:
+            OrbitCatalog: The new catalog
+        """
+        orbits = list(orbits)
+        elements = {
+            element: np.fromiter((getattr(x, element) for x in orbits), dtype=dtype, count=len(orbits))
+            for element in cls.ELEMENTS
+        }
+        names = None
+        if any(x.name is not None for x in orbits):
+            names = np.array([x.name for x in orbits], dtype=object)
+        return cls(names=names, dtype=dtype, **elements)
+
+    def to_orbits(self):
+        """
+        Converts the catalog to a list of `Orbit` objects.
+
+        Returns:
+            list[Orbit]: One orbit per catalog member
+        """
+        return [self.orbit(i) for i in range(len(self))]
+
+    def orbit(self, index):
+        """
+        Gets a single member of the catalog as an `Orbit` object.
+
+        Args:
+            index (int): The index of the member
+        Returns:
+            Orbit: The orbit of the member
+        """
+        return celestial_sandbox.types.orbit.Orbit(
+            float(self.semi_major_axis[index]),
+            float(self.eccentricity[index]),
+            float(self.inclination[index]),
+            float(self.longitude_of_ascending_node[index]),
+            float(self.argument_of_periapsis[index]),
+            name=None if self.names is None else self.names[index],
+            orbital_period=float(self.orbital_period[index])
+        )
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.semi_major_axis)
+
+    def __getitem__(self, key):
+        """
+        Slices the catalog. Slices return views onto the same arrays, index arrays and boolean masks return copies.
+
+        Args:
+            key (slice|np.array): A slice, an array of indices or a boolean mask
+        Returns:
+            OrbitCatalog: The selected members
+        """
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 or None)
+        elements = {element: getattr(self, element)[key] for element in self.ELEMENTS}
+        return OrbitCatalog(
+            names=None if self.names is None else self.names[key],
+            dtype=self.semi_major_axis.dtype,
+            **elements
+        )
+
+    def filter(self, predicate):
+        """
+        Filters the catalog down to the members matching a predicate.
+
+        Args:
+            predicate (np.array|callable): A boolean mask, or a callable taking the catalog and returning one
+        Returns:
+            OrbitCatalog: The matching members
+        """
+        mask = predicate(self) if callable(predicate) else predicate
+        return self[np.asarray(mask, dtype=bool)]
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+            int: The number of bytes held by the element arrays
+        """
+        return sum(getattr(self, element).nbytes for element in self.ELEMENTS)
+
+    # ------------------------------------------------------------------------
+
+    def eccentric_anomalies(self, t):
+        """
+        Calculates the eccentric anomaly of every member at a given time.
+
+        Args:
+            t (float|np.array): The time since periapsis (in days) - either one time for all members or one per member
+        Returns:
+            np.array: The eccentric anomalies (in radians)
+        """
+        mean_anomaly = (2 * math.pi) * (t / self.orbital_period)
+        return celestial_sandbox.orbital_elements.kepler.solve(self.eccentricity, mean_anomaly, tol=1e-8)
+
+    def true_anomalies(self, t):
+        """
+        Calculates the true anomaly of every member at a given time.
+
+        Args:
+            t (float|np.array): The time since periapsis (in days) - either one time for all members or one per member
+        Returns:
+            np.array: The true anomalies (in radians)
+        """
+        eccentric_anomaly = self.eccentric_anomalies(t)
+        return 2 * np.arctan2(
+            np.sqrt(1 + self.eccentricity) * np.sin(eccentric_anomaly / 2),
+            np.sqrt(1 - self.eccentricity) * np.cos(eccentric_anomaly / 2)
+        )
+
+    def propagate(self, t, chunk_size=32_768, dtype=None):
+        """
+        Gets the position of every member of the catalog at a given time.
+        Kepler's equation is solved with Markley's non-iterative method, one chunk of members at a time,
+        so temporary arrays stay small enough to remain in cache.
+
+        Args:
+            t (float|np.array): The time since periapsis (in days) - either one time for all members or one per member
+            chunk_size (int): The number of members to propagate at once
+            dtype (np.dtype): The floating point type to compute and return positions in, defaults to the type the
+                elements are stored in. float32 is several times faster (its trig functions are vectorized),
+                with errors of around a metre per 10,000 km of semi-major axis
+        Returns:
+            np.array: The (N, 3) positions (in kilometers)
+        """
+        dtype = np.dtype(dtype or self.semi_major_axis.dtype)
+        t = np.asarray(t, dtype=np.float64)
+        positions = np.empty((len(self), 3), dtype=dtype)
+        for start in range(0, len(self), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            a = self.semi_major_axis[chunk].astype(dtype, copy=False)
+            e = self.eccentricity[chunk].astype(dtype, copy=False)
+
+            # the fraction of an orbit since periapsis, reduced into [-0.5, 0.5] in float64
+            # so long times don't lose precision before switching to `dtype`
+            orbits = (t if t.ndim == 0 else t[chunk]) / self.orbital_period[chunk]
+            orbits -= np.rint(orbits)
+            mean_anomaly = (2 * math.pi * orbits).astype(dtype, copy=False)
+
+            _, sin_E, cos_E = celestial_sandbox.orbital_elements.kepler._markley(e, mean_anomaly, return_sin_cos=True)
+
+            # the position in the orbital plane follows directly from the eccentric anomaly,
+            # which saves converting to the true anomaly and back
+            cos_E -= e
+            cos_E *= a
+            sin_E *= a
+            sin_E *= np.sqrt(1 - e * e)
+            positions[chunk] = celestial_sandbox.orbit.rotate_from_orbital_plane(
+                cos_E,
+                sin_E,
+                self.inclination[chunk].astype(dtype, copy=False),
+                self.longitude_of_ascending_node[chunk].astype(dtype, copy=False),
+                self.argument_of_periapsis[chunk].astype(dtype, copy=False)
+            )
+        return positions
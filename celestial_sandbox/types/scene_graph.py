@@ -0,0 +1,208 @@
+import math
+
+import numpy as np
+
+import celestial_sandbox.orbit
+import celestial_sandbox.orbital_elements.kepler
+
+
+class SceneNode(object):
+    def __init__(self, graph, index, body, orbit, parent, name):
+        """
+        A body in a `SceneGraph`, orbiting its parent node.
+        Created through `SceneGraph.add` rather than directly.
+
+        Args:
+            graph (SceneGraph): The graph the node belongs to
+            index (int): The index of the node in the graph's arrays
+            body (CelestialBody): The body at the node
+            orbit (Orbit): The orbit of the body around its parent, None for a body fixed at its parent's position
+            parent (SceneNode): The parent node, None for a root
+            name (str): Optional name of the node
+        """
+        self.graph = graph
+        self.index = index
+        self.body = body
+        self.orbit = orbit
+        self.parent = parent
+        self.name = name
+        self.children = []
+
+    @property
+    def depth(self):
+        """
+        Returns:
+            int: The number of ancestors of the node
+        """
+        return 0 if self.parent is None else self.parent.depth + 1
+
+    def world_position(self, t):
+        """
+        Args:
+            t (float): The time (in days)
+        Returns:
+            np.array: The position of the node in world space (in kilometers)
+        """
+        return self.graph.world_positions(t)[self.index]
+
+    def __repr__(self):
+        return f"SceneNode({self.name or self.index})"
+
+
+class SceneGraph(object):
+    def __init__(self):
+        """
+        A hierarchy of bodies where each body orbits its parent, i.e moons orbiting planets orbiting stars.
+
+        World positions are resolved top down, one batched pass per depth of the tree:
+            local positions of every orbit are solved together, then each level adds its parents' world positions.
+        The result is cached against the time it was resolved for. Asking again for the same time only recomputes
+        the branches below orbits whose elements have changed since (tracked through `Orbit.revision`).
+        """
+        self.nodes = []
+
+        # per node arrays, rebuilt when the structure changes
+        self._parents = None
+        self._levels = None
+        self._orbit_nodes = None
+
+        # The cached elements of every orbit, and the revision of the orbit they were read at
+        self._elements = None
+        self._revisions = None
+
+        # The time and (N, 3) local and world positions of the last resolve
+        self._time = None
+        self._local = None
+        self._world = None
+
+    def add(self, body, orbit=None, parent=None, name=None):
+        """
+        Adds a body to the graph.
+
+        Args:
+            body (CelestialBody): The body to add
+            orbit (Orbit): The orbit of the body around its parent, None to fix it at its parent's position
+            parent (SceneNode): The node to orbit, None to add a root at the origin
+            name (str): Optional name of the node
+        Returns:
+            SceneNode: The new node
+        """
+        if parent is not None and parent.graph is not self:
+            raise AttributeError("The parent node belongs to a different scene graph.")
+        node = SceneNode(self, len(self.nodes), body, orbit, parent, name)
+        if parent is not None:
+            parent.children.append(node)
+        self.nodes.append(node)
+        self._parents = None
+        return node
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, name):
+        """
+        Args:
+            name (str): The name of the node
+        Returns:
+            SceneNode: The first node with the name
+        """
+        for node in self.nodes:
+            if node.name == name:
+                return node
+        raise KeyError(name)
+
+    def _rebuild_structure(self):
+        """
+        Rebuilds the per node arrays after nodes are added, and invalidates everything cached.
+        """
+        self._parents = np.array([-1 if x.parent is None else x.parent.index for x in self.nodes], dtype=np.intp)
+        depths = np.array([x.depth for x in self.nodes], dtype=np.intp)
+        self._levels = [np.flatnonzero(depths == depth) for depth in range(depths.max(initial=-1) + 1)]
+        self._orbit_nodes = np.array([x.index for x in self.nodes if x.orbit is not None], dtype=np.intp)
+
+        self._elements = np.empty((6, len(self._orbit_nodes)))
+        self._revisions = np.full(len(self._orbit_nodes), -1, dtype=np.int64)
+        self._time = None
+        self._local = np.zeros((len(self.nodes), 3))
+        # the extra last row stays at the origin, roots (with a parent index of -1) are placed relative to it
+        self._world = np.zeros((len(self.nodes) + 1, 3))
+
+    def _refresh_elements(self):
+        """
+        Re-reads the elements of orbits which have changed since they were cached.
+
+        Returns:
+            np.array: The indices (into the orbit arrays) of the orbits which changed
+        """
+        revisions = np.fromiter(
+            (self.nodes[i].orbit.revision for i in self._orbit_nodes), dtype=np.int64, count=len(self._orbit_nodes)
+        )
+        changed = np.flatnonzero(revisions != self._revisions)
+        for i in changed:
+            orbit = self.nodes[self._orbit_nodes[i]].orbit
+            self._elements[:, i] = (
+                orbit.semi_major_axis,
+                orbit.eccentricity,
+                orbit.inclination,
+                orbit.longitude_of_ascending_node,
+                orbit.argument_of_periapsis,
+                orbit.orbital_period
+            )
+        self._revisions = revisions
+        return changed
+
+    def _solve_local(self, t, orbits):
+        """
+        Solves the positions of a set of orbits relative to their parents, in one batch.
+
+        Args:
+            t (float): The time (in days)
+            orbits (np.array): The indices (into the orbit arrays) of the orbits to solve
+        """
+        a, e, inclination, node, periapsis, period = self._elements[:, orbits]
+        eccentric_anomaly = celestial_sandbox.orbital_elements.kepler.solve(
+            e, (2 * math.pi) * (t / period), tol=1e-8
+        )
+        self._local[self._orbit_nodes[orbits]] = celestial_sandbox.orbit.rotate_from_orbital_plane(
+            a * (np.cos(eccentric_anomaly) - e),
+            a * np.sqrt(1 - e ** 2) * np.sin(eccentric_anomaly),
+            inclination,
+            node,
+            periapsis
+        )
+
+    def world_positions(self, t):
+        """
+        Resolves the world position of every node at a given time.
+
+        Args:
+            t (float): The time (in days)
+        Returns:
+            np.array: The (N, 3) world positions, indexed by `SceneNode.index` (in kilometers) - this is a view
+                onto the graph's cache, so copy it before modifying it
+        """
+        if self._parents is None:
+            self._rebuild_structure()
+        changed = self._refresh_elements()
+
+        if t != self._time:
+            # every orbit has moved, so everything is recomputed
+            self._solve_local(t, np.arange(len(self._orbit_nodes)))
+            dirty = np.ones(len(self.nodes) + 1, dtype=bool)
+        elif len(changed):
+            # only the changed orbits and the branches below them
+            self._solve_local(t, changed)
+            dirty = np.zeros(len(self.nodes) + 1, dtype=bool)
+            dirty[self._orbit_nodes[changed]] = True
+        else:
+            return self._world[:-1]
+
+        # top down, so every parent is resolved before its children
+        dirty[-1] = False
+        for level in self._levels:
+            level = level[dirty[level] | dirty[self._parents[level]]]
+            dirty[level] = True
+            self._world[level] = self._local[level] + self._world[self._parents[level]]
+
+        self._time = t
+        return self._world[:-1]
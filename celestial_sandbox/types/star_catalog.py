@@ -0,0 +1,388 @@
+import itertools
+
+import numpy as np
+
+import celestial_sandbox.types.celestial_body.star
+import celestial_sandbox.types.celestial_body.star.classification
+import celestial_sandbox.types.celestial_body.star.color
+import celestial_sandbox.types.celestial_body.star.spectrum
+
+
+EStarLifecycleStage = celestial_sandbox.types.celestial_body.star.EStarLifecycleStage
+
+# The record stored for each star
+STAR_DTYPE = np.dtype([
+    ("temperature", "<f8"),  # (in Kelvin)
+    ("luminosity", "<f8"),  # (in solar luminosities)
+    ("radius", "<f8"),  # (in kilometers)
+    ("solar_masses", "<f8"),  # (in solar masses)
+    ("rotation_period", "<f8"),  # (in hours)
+    ("stage", "i1"),  # `EStarLifecycleStage` value
+])
+
+# The value of each column for stars which don't specify it - those of our Sun, as with `Star`
+DEFAULTS = {
+    "temperature": 5772,
+    "luminosity": 1,
+    "radius": 696_340,
+    "solar_masses": 1,
+    "rotation_period": 27.0 * 24.0,
+    "stage": EStarLifecycleStage.MAIN_SEQUENCE.value,
+}
+
+# Other accepted names for columns in CSV headers
+COLUMN_ALIASES = {
+    "mass": "solar_masses",
+    "temp": "temperature",
+    "teff": "temperature",
+    "lifecycle_stage": "stage",
+}
+
+
+def _parse_stage(value):
+    """
+    Args:
+        value (str): A stage as written in a CSV, either its `EStarLifecycleStage` name or value
+    Returns:
+        int: The stage value
+    """
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        return EStarLifecycleStage[value.upper()].value
+
+
+class StarView(object):
+    __slots__ = ("catalog", "index")
+
+    def __init__(self, catalog, index):
+        """
+        A lightweight handle onto one star of a `StarCatalog`, reading and writing straight through to its arrays.
+        Created through `StarCatalog.__getitem__` rather than directly.
+
+        Args:
+            catalog (StarCatalog): The catalog holding the star
+            index (int): The index of the star in the catalog
+        """
+        self.catalog = catalog
+        self.index = index
+
+    def _get(self, column):
+        return self.catalog.data[column][self.index].item()
+
+    def _set(self, column, value):
+        self.catalog.data[column][self.index] = value
+
+    temperature = property(lambda self: self._get("temperature"), lambda self, x: self._set("temperature", x))
+    luminosity = property(lambda self: self._get("luminosity"), lambda self, x: self._set("luminosity", x))
+    radius = property(lambda self: self._get("radius"), lambda self, x: self._set("radius", x))
+    solar_masses = property(lambda self: self._get("solar_masses"), lambda self, x: self._set("solar_masses", x))
+    rotation_period = property(
+        lambda self: self._get("rotation_period"), lambda self, x: self._set("rotation_period", x)
+    )
+
+    @property
+    def stage(self):
+        """
+        Returns:
+            EStarLifecycleStage: The lifecycle stage of the star
+        """
+        return EStarLifecycleStage(self._get("stage"))
+
+    @stage.setter
+    def stage(self, value):
+        self._set("stage", getattr(value, "value", value))
+
+    @property
+    def mass(self):
+        """
+        Returns:
+            float: The mass of the star (in KG)
+        """
+        return self.solar_masses * celestial_sandbox.types.celestial_body.SOLAR_MASS
+
+    @property
+    def color(self):
+        """
+        Returns:
+            np.array: The gamma encoded sRGB colour of the star, see `Star.color`
+        """
+        return celestial_sandbox.types.celestial_body.star.color.TABLE.srgb(self.temperature)
+
+    @property
+    def type_code(self):
+        """
+        Returns:
+            EStarType: The classification of the star, see `Star.type_code`
+        """
+        classification = celestial_sandbox.types.celestial_body.star.classification
+        return classification.EStarType(
+            int(classification.classify(self.solar_masses, self.temperature, self._get("stage"), self.radius))
+        )
+
+    def spectrum(self, wavelengths):
+        """
+        Args:
+            wavelengths (np.array): The 1D wavelength grid (in nanometers)
+        Returns:
+            np.array: The blackbody spectrum of the star, see `Star.spectrum`
+        """
+        return celestial_sandbox.types.celestial_body.star.spectrum.CACHE.radiance(self.temperature, wavelengths)
+
+    def to_star(self):
+        """
+        Returns:
+            Star: A standalone copy of the star, no longer linked to the catalog
+        """
+        return celestial_sandbox.types.celestial_body.star.Star(
+            temperature=self.temperature,
+            luminosity=self.luminosity,
+            radius=self.radius,
+            rotation_period=self.rotation_period,
+            solar_masses=self.solar_masses,
+            stage=self.stage
+        )
+
+    def __repr__(self):
+        return f"StarView({self.index}, temperature={self.temperature}, solar_masses={self.solar_masses})"
+
+
+class StarCatalog(object):
+    # The columns stored by the catalog
+    COLUMNS = STAR_DTYPE.names
+
+    def __init__(self, data):
+        """
+        Collection of stars stored as one structured array (see `STAR_DTYPE`),
+        rather than one `Star` object per member. Columns are exposed as array views, i.e `catalog.temperature`.
+
+        Args:
+            data (np.array): The star records, which may be a memory map
+        """
+        if data.dtype != STAR_DTYPE or data.ndim != 1:
+            raise AttributeError(f"Star data must be a 1-D array of `STAR_DTYPE`, got {data.dtype}.")
+        self.data = data
+
+    @classmethod
+    def from_columns(cls, count=None, **columns):
+        """
+        Builds a catalog from column arrays, columns which aren't given take the Sun's values.
+
+        Args:
+            count (int): The number of stars, defaults to the length of the given columns
+            **columns (np.array): Arrays (or single values) for any of `COLUMNS`
+        Returns:
+            StarCatalog: The new catalog
+        """
+        unknown = set(columns) - set(cls.COLUMNS)
+        if unknown:
+            raise AttributeError(f"Unknown star columns: {sorted(unknown)}.")
+        if count is None:
+            count = max([np.size(x) for x in columns.values()] + [0])
+        data = np.empty(count, dtype=STAR_DTYPE)
+        for column in cls.COLUMNS:
+            value = columns.get(column, DEFAULTS[column])
+            if column == "stage":
+                # stages may be given as `EStarLifecycleStage` members
+                value = celestial_sandbox.types.celestial_body.star.classification.stage_values(value)
+            data[column] = value
+        return cls(data)
+
+    @classmethod
+    def from_stars(cls, stars):
+        """
+        Builds a catalog from a list of `Star` objects.
+
+        Args:
+            stars (list[Star]): The stars to add to the catalog
+        Returns:
+            StarCatalog: The new catalog
+        """
+        stars = list(stars)
+        columns = {
+            column: np.fromiter((getattr(x, column) for x in stars), dtype=np.float64, count=len(stars))
+            for column in cls.COLUMNS if column != "stage"
+        }
+        columns["stage"] = [x.stage for x in stars]
+        return cls.from_columns(count=len(stars), **columns)
+
+    # ------------------------------------------------------------------------
+    # Files
+
+    @classmethod
+    def iter_csv(cls, path, chunk_size=100_000, delimiter=","):
+        """
+        Streams a CSV file of stars in chunks, so files larger than memory can be processed.
+        The first line is a header naming the columns (see `COLUMNS` and `COLUMN_ALIASES`), unrecognised columns are
+        skipped and missing ones take the Sun's values. Stages may be written as `EStarLifecycleStage` names or values.
+
+        Args:
+            path (str): The path of the CSV file
+            chunk_size (int): The number of rows to parse at once
+            delimiter (str): The column separator
+        Returns:
+            generator: A `StarCatalog` per chunk
+        """
+        with open(path, "r", newline="") as f:
+            header = [x.strip().lower() for x in f.readline().split(delimiter)]
+            header = [COLUMN_ALIASES.get(x, x) for x in header]
+            used = {i: name for i, name in enumerate(header) if name in cls.COLUMNS}
+            numeric = sorted(i for i, name in used.items() if name != "stage")
+            stage = [i for i, name in used.items() if name == "stage"]
+
+            while True:
+                lines = list(itertools.islice(f, chunk_size))
+                if not lines:
+                    break
+                # blank lines are skipped, a chunk of only blank lines isn't the end of the file
+                lines = [x for x in lines if x.strip()]
+                if not lines:
+                    continue
+                columns = {}
+                if numeric:
+                    table = np.loadtxt(lines, delimiter=delimiter, usecols=numeric, ndmin=2, dtype=np.float64)
+                    columns = {used[x]: table[:, i] for i, x in enumerate(numeric)}
+                if stage:
+                    # stages repeat a lot, so each distinct spelling is only parsed once
+                    text = np.loadtxt(lines, delimiter=delimiter, usecols=stage, ndmin=1, dtype=str)
+                    spellings, inverse = np.unique(text, return_inverse=True)
+                    columns["stage"] = np.array([_parse_stage(x) for x in spellings], dtype=np.int8)[inverse]
+                yield cls.from_columns(count=len(lines), **columns)
+
+    @classmethod
+    def read_csv(cls, path, chunk_size=100_000, delimiter=","):
+        """
+        Reads a whole CSV file of stars, in streamed chunks (see `iter_csv`).
+
+        Args:
+            path (str): The path of the CSV file
+            chunk_size (int): The number of rows to parse at once
+            delimiter (str): The column separator
+        Returns:
+            StarCatalog: The stars in the file
+        """
+        chunks = [x.data for x in cls.iter_csv(path, chunk_size=chunk_size, delimiter=delimiter)]
+        return cls(np.concatenate(chunks) if chunks else np.empty(0, dtype=STAR_DTYPE))
+
+    def save(self, path, compressed=False):
+        """
+        Saves the catalog as a `.npy` file (which can be memory mapped back in), or a `.npz` archive.
+
+        Args:
+            path (str): The path of the file, the extension picks the format
+            compressed (bool): Compress `.npz` archives
+        """
+        if str(path).endswith(".npz"):
+            (np.savez_compressed if compressed else np.savez)(path, stars=self.data)
+        else:
+            np.save(path, self.data)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Loads a catalog saved by `save`. `.npy` files are memory mapped by default, so only the rows touched are read
+        from disk - `.npz` archives can't be mapped, and are read fully.
+
+        Args:
+            path (str): The path of the file
+            mmap_mode (str): The memory map mode for `.npy` files ("r", "r+" or "c"), None to read into memory
+        Returns:
+            StarCatalog: The loaded catalog
+        """
+        if str(path).endswith(".npz"):
+            with np.load(path) as archive:
+                return cls(archive["stars"])
+        return cls(np.load(path, mmap_mode=mmap_mode))
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        """
+        Gets a single star as a `StarView`, or slices the catalog.
+        Slices return views onto the same records, index arrays and boolean masks return copies.
+
+        Args:
+            key (int|slice|np.array): An index, a slice, an array of indices or a boolean mask
+        Returns:
+            StarView|StarCatalog: The selected star or stars
+        """
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError(key)
+            return StarView(self, int(key) % len(self))
+        return StarCatalog(self.data[key])
+
+    def __iter__(self):
+        return (StarView(self, i) for i in range(len(self)))
+
+    def filter(self, predicate):
+        """
+        Filters the catalog down to the members matching a predicate.
+
+        Args:
+            predicate (np.array|callable): A boolean mask, or a callable taking the catalog and returning one
+        Returns:
+            StarCatalog: The matching members
+        """
+        mask = predicate(self) if callable(predicate) else predicate
+        return self[np.asarray(mask, dtype=bool)]
+
+    def to_stars(self):
+        """
+        Returns:
+            list[Star]: A standalone `Star` object per member
+        """
+        return [x.to_star() for x in self]
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+            int: The number of bytes held by the records
+        """
+        return self.data.nbytes
+
+    # ------------------------------------------------------------------------
+    # Columns
+
+    temperature = property(lambda self: self.data["temperature"])
+    luminosity = property(lambda self: self.data["luminosity"])
+    radius = property(lambda self: self.data["radius"])
+    solar_masses = property(lambda self: self.data["solar_masses"])
+    rotation_period = property(lambda self: self.data["rotation_period"])
+    stage = property(lambda self: self.data["stage"])
+
+    # ------------------------------------------------------------------------
+
+    def classify(self):
+        """
+        Returns:
+            np.array: The `EStarType` code of every star, as uint8
+        """
+        return celestial_sandbox.types.celestial_body.star.classification.classify(
+            self.solar_masses, self.temperature, self.stage, self.radius
+        )
+
+    def colors(self, srgb=True):
+        """
+        Args:
+            srgb (bool): Return gamma encoded sRGB colours rather than linear RGB
+        Returns:
+            np.array: The (N, 3) colour of every star
+        """
+        return celestial_sandbox.types.celestial_body.star.color.star_colors(self.temperature, srgb=srgb)
+
+    def spectra(self, wavelengths):
+        """
+        Args:
+            wavelengths (np.array): The 1D wavelength grid (in nanometers)
+        Returns:
+            np.array: The (N, W) blackbody spectrum of every star (in W / (sr * m^2 * m))
+        """
+        return celestial_sandbox.types.celestial_body.star.spectrum.star_spectra(
+            np.ascontiguousarray(self.temperature), wavelengths
+        )
@@ -5,48 +5,17 @@ ELifecycleStage = celestial_sandbox.types.celestial_body.star.EStarLifecycleStag
 
 
 def calculate_star_type(mass, temperature, stage, radius):
-    # Convert radius from km to solar radii
-    radius = radius / 696340
-
-    if stage == ELifecycleStage.PRE_MAIN_SEQUENCE:
-        if mass <= 2 and radius >= 0.5 and radius <= 2:
-            return 'T_Tauri_Star'
-        elif mass > 2 and radius > 2 and radius <= 5:
-            return 'Herbig_AE_BE_Star'
-    elif stage == ELifecycleStage.MAIN_SEQUENCE:
-        if mass <= 0.08 and temperature <= 3000:
-            return 'Subdwarf'
-        elif mass <= 0.5 and temperature <= 3700:
-            return 'Red_Dwarf'
-        elif mass > 0.5 and mass <= 0.8 and temperature > 3700 and temperature <= 5200:
-            return 'Orange_Dwarf'
-        elif mass > 0.8 and mass <= 1.4 and temperature > 5200 and temperature <= 6000:
-            return 'Yellow_Dwarf'
-        elif mass > 15 and temperature > 30000:
-            return 'O_Type_Star'
-    elif stage == ELifecycleStage.POST_MAIN_SEQUENCE:
-        if radius > 1.5 and radius <= 5:
-            return 'Subgiant'
-        elif radius > 5 and radius <= 100:
-            return 'Red_Giant'
-        elif radius > 100:
-            return 'Red_Supergiant'
-    elif stage == ELifecycleStage.SUPERGIANT:
-        if mass > 15 and mass <= 25 and radius > 600:
-            return 'Blue_Supergiant'
-        elif mass > 25 and temperature > 30000:
-            return 'Hypergiant'
-    elif stage == ELifecycleStage.FINAL_STAGE:
-        if mass <= 1.4:
-            return 'White_Dwarf'
-        elif mass > 1.4 and mass <= 3:
-            return 'Neutron_Star'
-        elif mass > 3:
-            return 'Stellar_Black_Hole'
-    elif stage == ELifecycleStage.FAILED_STAR:
-        return 'Brown_Dwarf'
-    
-    return 'Unknown Star Type'
+    """
+    Args:
+        mass (float): The mass of the star (in solar masses)
+        temperature (float): The temperature of the star (in Kelvin)
+        stage (EStarLifecycleStage): The lifecycle stage of the star
+        radius (float): The radius of the star (in kilometers)
+    Returns:
+        str: The name of the type of star
+    """
+    classification = celestial_sandbox.types.celestial_body.star.classification
+    return classification.NAMES[classification.classify(mass, temperature, stage, radius)]
 
 
 
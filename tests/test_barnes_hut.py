@@ -0,0 +1,28 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import celestial_sandbox.constants
+import celestial_sandbox.simulation.barnes_hut
+
+
+@pytest.mark.parametrize("positions", [
+    np.array([[1.0, 2.0, 3.0]]),
+    np.full((5, 3), 7.0),
+    np.array([[0.0, 0.0, 0.0], [1e-310, 0.0, 0.0]]),
+])
+def test_degenerate_extents(positions):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        keys = celestial_sandbox.simulation.barnes_hut.morton_keys(positions, 16)
+        accelerations = celestial_sandbox.simulation.barnes_hut.barnes_hut_accelerations(
+            positions, np.full(len(positions), 1e20), celestial_sandbox.constants.GRAVITATIONAL_CONSTANT_KM
+        )
+    assert keys.dtype == np.uint64 and len(keys) == len(positions)
+    assert np.isfinite(accelerations).all()
+
+
+def test_coincident_bodies_have_zero_keys():
+    keys = celestial_sandbox.simulation.barnes_hut.morton_keys(np.full((4, 3), -3.0), 21)
+    assert not keys.any()
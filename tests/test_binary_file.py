@@ -0,0 +1,23 @@
+import pytest
+
+import celestial_sandbox.ephemeris.binary_file
+import celestial_sandbox.types.orbit
+
+
+def _orbit(name):
+    return celestial_sandbox.types.orbit.Orbit(149_597_870, 0.0167, 0.00005, -0.196, 1.796, name=name)
+
+
+@pytest.mark.parametrize("names", [("Earth", "Earth"), ("1", None)])
+def test_write_orbits_rejects_duplicate_names(tmp_path, names):
+    orbits = [_orbit(x) for x in names]
+    with pytest.raises(ValueError):
+        celestial_sandbox.ephemeris.binary_file.write_orbits(tmp_path / "orbits.ephem", orbits, 0.0, 1.0, 10)
+
+
+def test_write_orbits_round_trip(tmp_path):
+    orbits = [_orbit("Earth"), _orbit(None)]
+    path = tmp_path / "orbits.ephem"
+    celestial_sandbox.ephemeris.binary_file.write_orbits(path, orbits, 0.0, 1.0, 10)
+    ephemeris = celestial_sandbox.ephemeris.binary_file.EphemerisFile(path)
+    assert ephemeris.names == ["Earth", "1"]
@@ -0,0 +1,41 @@
+import pytest
+
+import celestial_sandbox.types.celestial_body
+import celestial_sandbox.types.celestial_body.planet
+import celestial_sandbox.types.celestial_body.star
+import celestial_sandbox.types.moon
+
+
+def test_surface_gravity_derived_from_mass_and_radius():
+    # the defaults are Earth and the Sun, which match the values they used to hard code
+    assert celestial_sandbox.types.celestial_body.CelestialBody().surface_gravity == pytest.approx(9.8, rel=1e-2)
+    assert celestial_sandbox.types.celestial_body.star.Star().surface_gravity == pytest.approx(274.0, rel=1e-2)
+    assert celestial_sandbox.types.moon.Moon(1737.4).surface_gravity == pytest.approx(1.62, rel=1e-2)
+    mars = celestial_sandbox.types.celestial_body.planet.Planet(3389.5, 610, mass=6.417e23)
+    assert mars.surface_gravity == pytest.approx(3.72, rel=1e-2)
+
+
+def test_surface_gravity_follows_mass_and_radius():
+    body = celestial_sandbox.types.celestial_body.CelestialBody()
+    gravity = body.surface_gravity
+    body.mass *= 2
+    assert body.surface_gravity == pytest.approx(2 * gravity)
+    body.radius *= 2
+    assert body.surface_gravity == pytest.approx(gravity / 2)
+    assert body.density == pytest.approx(celestial_sandbox.types.celestial_body.CelestialBody().density / 4)
+
+
+def test_explicit_surface_gravity_overrides_derived():
+    moon = celestial_sandbox.types.moon.Moon(1737.4, surface_gravity=2.0)
+    assert moon.surface_gravity == 2.0
+    moon.mass *= 2
+    assert moon.surface_gravity == 2.0
+    moon.surface_gravity = None
+    assert moon.surface_gravity == pytest.approx(3.24, rel=1e-2)
+
+
+def test_star_stage_alias():
+    star = celestial_sandbox.types.celestial_body.star.Star()
+    assert star.STAGE is star.stage
+    star.STAGE = celestial_sandbox.types.celestial_body.star.EStarLifecycleStage.FINAL_STAGE
+    assert star.stage is celestial_sandbox.types.celestial_body.star.EStarLifecycleStage.FINAL_STAGE
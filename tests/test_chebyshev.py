@@ -0,0 +1,23 @@
+import numpy as np
+
+import celestial_sandbox.ephemeris.chebyshev
+import celestial_sandbox.types.orbit
+
+
+def _earth():
+    return celestial_sandbox.types.orbit.Orbit(149_597_870, 0.0167, 0.00005, -0.196, 1.796, name="Earth")
+
+
+def test_empty_times_match_orbit():
+    orbit = _earth()
+    ephemeris = celestial_sandbox.ephemeris.chebyshev.compile_orbit(orbit, 0.0, 365.0, 8.0)
+    times = np.array([])
+    assert ephemeris.positions(times).shape == orbit.positions(times).shape == (0, 3)
+    assert ephemeris.velocities(times).shape == (0, 3)
+
+
+def test_positions_within_fit_error():
+    orbit = _earth()
+    ephemeris = celestial_sandbox.ephemeris.chebyshev.compile_orbit(orbit, 0.0, 365.0, 8.0, tol=1.0)
+    times = np.linspace(0.0, 365.0, 1001)
+    assert np.abs(ephemeris.positions(times) - orbit.positions(times)).max() <= 1.0
@@ -0,0 +1,30 @@
+import numpy as np
+
+import celestial_sandbox.simulation.nbody
+
+
+def _two_bodies():
+    return celestial_sandbox.simulation.nbody.NBodySystem(
+        [[0.0, 0.0, 0.0], [149_597_870.0, 0.0, 0.0]],
+        [[0.0, 0.0, 0.0], [0.0, 29.78, 0.0]],
+        [1.98847e30, 5.972e24]
+    )
+
+
+def test_named_integrator_is_reused():
+    system = _two_bodies()
+    for _ in range(10):
+        system.step(3600.0, integrator="verlet")
+    # one evaluation per step, plus the first - a new integrator each step would need two per step
+    assert system.force_evaluations == 11
+    assert system.resolve_integrator("verlet") is system.resolve_integrator("verlet")
+
+
+def test_dormand_prince_keeps_its_substep():
+    system = _two_bodies()
+    system.step(3600.0, integrator="dopri")
+    substep = system.resolve_integrator("dopri").substep
+    assert substep is not None
+    system.step(3600.0, integrator="dopri")
+    assert system.resolve_integrator("dopri").substep is not None
+    assert np.isfinite(system.positions).all()
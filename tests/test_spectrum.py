@@ -0,0 +1,20 @@
+import numpy as np
+
+import celestial_sandbox.types.celestial_body.star.spectrum
+
+
+def test_empty_temperatures():
+    cache = celestial_sandbox.types.celestial_body.star.spectrum.SpectrumCache()
+    wavelengths = np.linspace(100.0, 2000.0, 50)
+    assert cache.radiance(np.array([]), wavelengths).shape == (0, 50)
+    assert len(cache) == 0
+
+
+def test_radiance_is_a_writable_copy():
+    cache = celestial_sandbox.types.celestial_body.star.spectrum.SpectrumCache()
+    wavelengths = np.linspace(100.0, 2000.0, 50)
+    expected = celestial_sandbox.types.celestial_body.star.spectrum.planck_radiance(5772.0, wavelengths)
+
+    radiance = cache.radiance(5772.0, wavelengths)
+    radiance[:] = 0.0
+    np.testing.assert_array_equal(cache.radiance(5772.0, wavelengths), expected)